@@ -0,0 +1,247 @@
+"""
+Literature Card Game - Batch Simulator
+Advances thousands of bot-only games in lockstep with NumPy
+
+Each game is a row in a card-owner matrix of shape (N, 52). Every step plays
+one random-bot turn (the same rules as game_logic.Bot.take_turn, including
+set declarations) in all unfinished games at once. Each game has its own
+splitmix64 RNG state so a batch is reproducible from its seed.
+
+Run from the repository root:
+    python batch_simulator.py --games 10000 --players 6
+"""
+import argparse
+import time
+
+import numpy as np
+
+from game_logic import Bot, Card, ORDINAL_CARDS, NO_TEAM, PLAYER_COUNTS
+
+NUM_CARDS = len(ORDINAL_CARDS)
+NUM_FAMILIES = len(Card.FAMILIES)
+# Owner value for cards out of play (undealt or declared)
+NO_OWNER = -1
+# Winner value for games that hit the move cap
+UNFINISHED = -2
+
+# One-hot card -> family matrix, shape (52, 8)
+FAMILY_ONEHOT = np.zeros((NUM_CARDS, NUM_FAMILIES), dtype=np.int16)
+for _card in ORDINAL_CARDS:
+    FAMILY_ONEHOT[_card.ordinal, _card.family_id] = 1
+FAMILY_OF = np.array([card.family_id for card in ORDINAL_CARDS])
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+class BatchSimulator:
+    """N bot-only games stored as NumPy arrays and played in lockstep"""
+    def __init__(self, num_games, num_players=6, seed=0, max_moves=5000):
+        if num_players not in PLAYER_COUNTS:
+            raise ValueError(f"Literature is played by 6 or 8 players, not {num_players}")
+        self.num_games = num_games
+        self.num_players = num_players
+        self.max_moves = max_moves
+        
+        seats = np.arange(num_players)
+        self.seats = seats.astype(np.int8)
+        # Same seating as game_logic.Game: first half is team 0
+        self.team_of_seat = (seats >= num_players // 2).astype(np.int8)
+        
+        # Per-game RNG state (splitmix64). Each game starts from a hashed
+        # value so the streams don't overlap at small offsets.
+        with np.errstate(over='ignore'):
+            self.rng_state = np.uint64(seed) * np.uint64(num_games) + np.arange(num_games, dtype=np.uint64)
+        self.rng_state = self._next_random()
+        
+        self.deal()
+    
+    def _next_random(self):
+        """Advance every game's RNG, returning one uint64 per game"""
+        with np.errstate(over='ignore'):
+            self.rng_state += _GOLDEN
+            z = self.rng_state.copy()
+            z = (z ^ (z >> np.uint64(30))) * _MIX1
+            z = (z ^ (z >> np.uint64(27))) * _MIX2
+            return z ^ (z >> np.uint64(31))
+    
+    def _uniform(self):
+        """One float in [0, 1) per game"""
+        return (self._next_random() >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    
+    def deal(self):
+        """Shuffle a fresh deck for every game and deal it round-robin"""
+        num_games, num_players = self.num_games, self.num_players
+        cards_per_player = 6 if num_players == 8 else 8
+        dealt = cards_per_player * num_players
+        
+        # Random permutation of the deck per game
+        keys = np.stack([self._uniform() for _ in range(NUM_CARDS)], axis=1)
+        order = np.argsort(keys, axis=1)
+        
+        deal_to = np.full(NUM_CARDS, NO_OWNER, dtype=np.int8)
+        deal_to[:dealt] = np.arange(dealt) % num_players
+        self.owners = np.full((num_games, NUM_CARDS), NO_OWNER, dtype=np.int8)
+        np.put_along_axis(self.owners, order, np.broadcast_to(deal_to, order.shape), axis=1)
+        
+        self.current = np.zeros(num_games, dtype=np.int64)
+        self.moves = np.zeros(num_games, dtype=np.int64)
+        self.successes = np.zeros(num_games, dtype=np.int64)
+        self.scores = np.zeros((num_games, 2), dtype=np.int64)
+        self.resolved = np.zeros((num_games, NUM_FAMILIES), dtype=bool)
+    
+    def card_counts(self):
+        """Cards held per game and seat, shape (N, players)"""
+        return (self.owners[:, :, None] == self.seats).sum(axis=1)
+    
+    def _pass_turn(self, passing, current, current_team, counts):
+        """Game.pass_turn for the games in passing: next teammate with cards,
+        else the next player with cards"""
+        games = np.arange(self.num_games)
+        found = np.zeros(self.num_games, dtype=bool)
+        new_current = current.copy()
+        for same_team in (True, False):
+            for step in range(1, self.num_players):
+                seat = (current + step) % self.num_players
+                ok = passing & ~found & (counts[games, seat] > 0)
+                if same_team:
+                    ok &= self.team_of_seat[seat] == current_team
+                new_current[ok] = seat[ok]
+                found |= ok
+        return np.where(passing, new_current, current)
+    
+    def step(self):
+        """Play one turn in every unfinished game; returns False once all are done"""
+        games = np.arange(self.num_games)
+        active = ~self.resolved.all(axis=1) & (self.moves < self.max_moves)
+        if not active.any():
+            return False
+        
+        counts = self.card_counts()
+        current = self.current
+        current_team = self.team_of_seat[current]
+        holding = counts[games, current] > 0
+        
+        # A bot with no cards passes the turn
+        passing = active & ~holding
+        if passing.any():
+            current = self._pass_turn(passing, current, current_team, counts)
+            current_team = self.team_of_seat[current]
+        acting = active & holding
+        
+        mine = self.owners == current[:, None]
+        in_play = self.owners != NO_OWNER
+        live_counts = in_play.astype(np.int16) @ FAMILY_ONEHOT
+        held_counts = mine.astype(np.int16) @ FAMILY_ONEHOT
+        
+        # Declare for certain when holding every in-play card of a family
+        certain = (held_counts == live_counts) & (live_counts > 0)
+        certain_turn = acting & certain.any(axis=1)
+        certain_family = np.argmax(certain, axis=1)
+        
+        # Otherwise declare on a guess now and then, or ask
+        guess_turn = acting & ~certain_turn & (self._uniform() < Bot.DECLARE_CHANCE)
+        ask_turn = acting & ~certain_turn & ~guess_turn
+        
+        # Wanted cards: in-play ones the bot lacks from families it holds
+        wanted = ((((held_counts > 0).astype(np.int16)) @ FAMILY_ONEHOT.T) > 0) & ~mine & in_play
+        num_wanted = wanted.sum(axis=1)
+        
+        # Targets: opponents who still have cards
+        targets = (self.team_of_seat[None, :] != current_team[:, None]) & (counts > 0)
+        num_targets = targets.sum(axis=1)
+        
+        # With nobody left to ask, the bot has to declare on a guess
+        asking = ask_turn & (num_wanted > 0) & (num_targets > 0)
+        guess_turn |= ask_turn & ~asking
+        
+        # Uniform pick of the k-th wanted card and target in each game
+        k = (self._uniform() * num_wanted).astype(np.int64)
+        card = np.argmax(np.cumsum(wanted, axis=1) > k[:, None], axis=1)
+        t = (self._uniform() * num_targets).astype(np.int64)
+        target = np.argmax(np.cumsum(targets, axis=1) > t[:, None], axis=1)
+        
+        success = asking & (self.owners[games, card] == target)
+        self.owners[games[success], card[success]] = current[success]
+        failed = asking & ~success
+        current[failed] = target[failed]
+        
+        # Guessed declarations pick the family with the largest held share
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.where(held_counts > 0, held_counts / live_counts, -1.0)
+        guess_family = np.argmax(share, axis=1)
+        family = np.where(certain_turn, certain_family, guess_family)
+        declaring = certain_turn | guess_turn
+        
+        # A guess is right only if no opponent holds a card of the family and
+        # every card the bot lacks goes to the right one of m teammates
+        card_team = self.team_of_seat[np.where(in_play, self.owners, 0)]
+        opponent_cards = in_play & (card_team != current_team[:, None])
+        opponents_held = ((opponent_cards.astype(np.int16) @ FAMILY_ONEHOT) > 0)[games, family]
+        missing = live_counts[games, family] - held_counts[games, family]
+        teammates = (self.team_of_seat[None, :] == current_team[:, None]) & (counts > 0)
+        teammates[games, current] = False
+        num_teammates = np.maximum(teammates.sum(axis=1), 1)
+        guess_right = self._uniform() < float(1) / num_teammates.astype(np.float64) ** missing
+        correct = certain_turn | (guess_turn & ~opponents_held & guess_right)
+        
+        # Score the set and take its cards out of play
+        winner = np.where(correct, current_team, np.where(opponents_held, 1 - current_team, NO_TEAM))
+        scored = declaring & (winner != NO_TEAM)
+        self.scores[games[scored], winner[scored]] += 1
+        self.resolved[games[declaring], family[declaring]] = True
+        removed = declaring[:, None] & (FAMILY_OF[None, :] == family[:, None])
+        self.owners[removed] = NO_OWNER
+        
+        # A wrong declaration passes the turn to the next seat
+        wrong = declaring & ~correct
+        current[wrong] = (current[wrong] + 1) % self.num_players
+        
+        self.current = current
+        self.successes += success | correct
+        self.moves += active
+        return True
+    
+    def run(self):
+        """Play every game to the end (or the move cap) and return per-game results
+        
+        winners holds the winning team per game, NO_TEAM for a draw or
+        UNFINISHED if the game hit the cap. successes counts the turns that
+        kept the move (successful asks and correct declarations).
+        """
+        while self.step():
+            pass
+        team0, team1 = self.scores[:, 0], self.scores[:, 1]
+        winners = np.full(self.num_games, NO_TEAM, dtype=np.int8)
+        winners[team0 > team1] = 0
+        winners[team1 > team0] = 1
+        winners[~self.resolved.all(axis=1)] = UNFINISHED
+        return {
+            'winners': winners,
+            'moves': self.moves.copy(),
+            'successes': self.successes.copy(),
+            'scores': self.scores.copy(),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run bot-only Literature games in a NumPy batch")
+    parser.add_argument('--games', type=int, default=10000, help="number of games in the batch")
+    parser.add_argument('--players', type=int, default=6, choices=[6, 8], help="players per game")
+    parser.add_argument('--max-moves', type=int, default=5000, help="move cap per game")
+    parser.add_argument('--seed', type=int, default=0, help="batch seed")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    results = BatchSimulator(args.games, args.players, seed=args.seed, max_moves=args.max_moves).run()
+    elapsed = time.perf_counter() - start
+    
+    winners = results['winners']
+    print(f"{args.games} games with {args.players} players in {elapsed:.2f}s "
+          f"({args.games / elapsed:.1f} games/s)")
+    print(f"  Team A wins: {(winners == 0).sum()}, Team B wins: {(winners == 1).sum()}, "
+          f"draws: {(winners == NO_TEAM).sum()}, unfinished (hit move cap): {(winners == UNFINISHED).sum()}")
+    print(f"  average moves per game: {results['moves'].mean():.1f}, "
+          f"turns keeping the move per game: {results['successes'].mean():.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Game clone benchmark
+Compares Game.clone against copy.deepcopy and a to_bytes/from_bytes round trip
+
+Run from the repository root:
+    python -m benchmarks.bench_clone [num_clones]
+"""
+import copy
+import random
+import sys
+import timeit
+
+from game_logic import Game
+
+def make_game(compact_hands):
+    """A bot-only game a few dozen moves in"""
+    game = Game(6, human_player_idx=None, compact_hands=compact_hands, headless=True, seed=3)
+    for _ in range(40):
+        game.handle_bot_turn()
+    return game
+
+def per_call(fn, number):
+    """Best of five runs, in microseconds per call"""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+def main(num_clones=50_000):
+    rng = random.Random(0)
+    for compact_hands in (True, False):
+        game = make_game(compact_hands)
+        print(f"{'bitmask' if compact_hands else 'list'} hands, {num_clones:,} clones")
+        print(f"  clone(rng):          {per_call(lambda: game.clone(rng), num_clones):8.2f}us")
+        print(f"  clone():             {per_call(game.clone, num_clones // 10):8.2f}us")
+        print(f"  to_bytes/from_bytes: {per_call(lambda: Game.from_bytes(game.to_bytes()), num_clones // 10):8.2f}us")
+        print(f"  deepcopy:            {per_call(lambda: copy.deepcopy(game), num_clones // 100):8.2f}us")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
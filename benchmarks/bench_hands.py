@@ -0,0 +1,53 @@
+"""
+Hand backend benchmark
+Compares list hands against BitmaskHand on simulated card requests
+
+Run from the repository root:
+    python -m benchmarks.bench_hands [num_requests]
+"""
+import random
+import sys
+import time
+
+from game_logic import Player, ORDINAL_CARDS
+
+def make_players(compact_hand, seed):
+    """Deal 8 cards each to an asker and a target, like a 6-player game"""
+    rng = random.Random(seed)
+    deck = list(ORDINAL_CARDS)
+    rng.shuffle(deck)
+    asker = Player("Asker", compact_hand=compact_hand)
+    target = Player("Target", team=1, compact_hand=compact_hand)
+    for _ in range(8):
+        asker.add_card(deck.pop())
+        target.add_card(deck.pop())
+    return asker, target
+
+def run_requests(compact_hand, num_requests, seed=0):
+    """Replay the checks Game.request_card makes, num_requests times"""
+    asker, target = make_players(compact_hand, seed)
+    rng = random.Random(seed)
+    requests = [rng.choice(ORDINAL_CARDS) for _ in range(1000)]
+    
+    start = time.perf_counter()
+    for i in range(num_requests):
+        card = requests[i % 1000]
+        suit, rank = card.suit, card.rank
+        if asker.has_card(suit, rank) or not asker.has_card_of_family(card.get_family()):
+            continue
+        if target.has_card(suit, rank):
+            # Move the card over and straight back so the hands stay stable
+            asker.add_card(target.remove_card(suit, rank))
+            target.add_card(asker.remove_card(suit, rank))
+    return time.perf_counter() - start
+
+def main(num_requests=1_000_000):
+    list_time = run_requests(False, num_requests)
+    mask_time = run_requests(True, num_requests)
+    print(f"{num_requests:,} simulated requests")
+    print(f"  list hands:    {list_time:.3f}s")
+    print(f"  bitmask hands: {mask_time:.3f}s")
+    print(f"  speedup:       {list_time / mask_time:.2f}x")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,50 @@
+"""
+Game snapshot benchmark
+Compares Game.to_bytes / Game.from_bytes against pickle on mid-game states
+
+Run from the repository root:
+    python -m benchmarks.bench_snapshot [num_games]
+"""
+import pickle
+import sys
+import time
+
+from game_logic import Game
+
+def make_games(num_games, moves=40):
+    """Bot-only games played a few dozen moves in, so hands are uneven"""
+    games = []
+    for seed in range(num_games):
+        game = Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=seed)
+        for _ in range(moves):
+            if game.is_over:
+                break
+            game.handle_bot_turn()
+        games.append(game)
+    return games
+
+def time_round_trip(games, dump, load):
+    """Seconds to dump every game, seconds to load them all, and bytes per game"""
+    start = time.perf_counter()
+    blobs = [dump(game) for game in games]
+    dump_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for blob in blobs:
+        load(blob)
+    load_time = time.perf_counter() - start
+    return dump_time, load_time, sum(len(blob) for blob in blobs) / len(blobs)
+
+def main(num_games=10_000):
+    games = make_games(num_games)
+    results = {
+        'to_bytes': time_round_trip(games, Game.to_bytes, Game.from_bytes),
+        'pickle': time_round_trip(games, pickle.dumps, pickle.loads),
+    }
+    print(f"{num_games:,} mid-game snapshots")
+    for name, (dump_time, load_time, size) in results.items():
+        print(f"  {name:9} {size:7.0f} bytes  "
+              f"dump {dump_time / num_games * 1e6:6.1f}us  load {load_time / num_games * 1e6:6.1f}us")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,67 @@
+"""
+Socket.IO fan-out load test
+Opens one client per game on the web server, has every game make moves
+(human asks and bot turns) and counts the messages all clients receive, to
+check that each move only reaches its own game's room
+
+Run from the repository root:
+    python -m benchmarks.load_rooms [games ...]
+"""
+import logging
+import sys
+import time
+
+import server
+
+def open_games(num_games):
+    """One test client per game, each having created its own game"""
+    clients = []
+    for _ in range(num_games):
+        client = server.socketio.test_client(server.app)
+        client.emit('create_game', {'player_count': 6})
+        created = [msg for msg in client.get_received() if msg['name'] == 'game_created']
+        clients.append((client, created[0]['args'][0]['game_id']))
+    return clients
+
+def make_moves(clients, rounds):
+    """Every game moves rounds times, the human asking for a legal card and
+    bots playing their turn through the server; returns (moves, seconds)"""
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for client, game_id in clients:
+            game = server.active_games[game_id]
+            if game.is_over:
+                continue
+            if game.current_player.is_bot:
+                server.handle_bot_turn(game_id)
+            else:
+                target, card = game.legal_moves(game.current_player_idx)[0]
+                client.emit('request_card', {'game_id': game_id, 'target_player_idx': target,
+                                             'suit': card.suit, 'rank': card.rank})
+            moves += 1
+    return moves, time.perf_counter() - start
+
+def run(num_games, rounds=5):
+    """Messages received per move, summed over every client, and ms per move"""
+    clients = open_games(num_games)
+    for client, _ in clients:
+        client.get_received()
+    moves, seconds = make_moves(clients, rounds)
+    received = sum(len(client.get_received()) for client, _ in clients)
+    for client, _ in clients:
+        client.disconnect()
+    for _, game_id in clients:
+        server.active_games.pop(game_id, None)
+    return received / moves, seconds / moves * 1000
+
+def main(game_counts=(1, 10, 50, 200)):
+    # Per-move engine and server logging would swamp the timings
+    logging.disable(logging.INFO)
+    print(f"{'games':>6} {'messages/move':>14} {'ms/move':>8}")
+    for num_games in game_counts:
+        per_move, ms = run(num_games)
+        print(f"{num_games:>6} {per_move:>14.2f} {ms:>8.2f}")
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or (1, 10, 50, 200))
@@ -0,0 +1,238 @@
+"""
+Benchmark suite for the engine and server hot paths
+Times micro benchmarks (single engine/server calls) and macro benchmarks
+(whole games), writes the results as JSON and compares them against a
+stored baseline
+
+Run from the repository root:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.10
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+import game_logic
+from game_logic import Game
+from simulator import Simulator
+
+# Benchmarks are registered as (name, kind, setup); setup builds fresh state
+# and returns the zero-argument callable that gets timed
+BENCHMARKS = []
+
+def benchmark(name, kind='micro'):
+    def register(setup):
+        BENCHMARKS.append((name, kind, setup))
+        return setup
+    return register
+
+@benchmark('game_init_headless')
+def setup_game_init_headless():
+    seeds = iter(range(10**9))
+    return lambda: Game(6, human_player_idx=None, headless=True, seed=next(seeds))
+
+@benchmark('game_init')
+def setup_game_init():
+    seeds = iter(range(10**9))
+    return lambda: Game(6, seed=next(seeds))
+
+@benchmark('deal_cards')
+def setup_deal_cards():
+    game = Game(6, human_player_idx=None, headless=True, seed=1)
+    deck = list(game_logic.ORDINAL_CARDS)
+    game.rng.shuffle(deck)
+    
+    def deal():
+        for player in game.players:
+            player.hand = []
+        game.deck = list(deck)
+        game.deal_cards()
+    return deal
+
+@benchmark('request_card')
+def setup_request_card():
+    """The human asks seat 3 for a card it holds, then the card goes back"""
+    game = Game(6, seed=1)
+    human = game.human_player
+    card = next(card for card in game.players[3].hand
+                if game.can_request_card(human, card.suit, card.rank))
+    
+    def request():
+        game.current_player_idx = 0
+        game.request_card(3, card.suit, card.rank)
+        game.transfer(card, 3)
+    return request
+
+@benchmark('game_clone')
+def setup_game_clone():
+    game = Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=3)
+    for _ in range(40):
+        game.handle_bot_turn()
+    rng = random.Random(0)
+    return lambda: game.clone(rng)
+
+@benchmark('hand_sample')
+def setup_hand_sample():
+    """One uniform deal of the hidden cards for a seat 40 turns in"""
+    from hand_sampler import HandSampler
+    game = Game(6, human_player_idx=None, headless=True, seed=5,
+                bot_classes=(game_logic.KnowledgeBot, game_logic.KnowledgeBot))
+    for _ in range(40):
+        game.current_player.take_turn(game)
+    sampler = HandSampler.from_game(game, game.current_player_idx)
+    rng = random.Random(0)
+    return lambda: sampler.sample(rng)
+
+@benchmark('bot_take_turn')
+def setup_bot_take_turn():
+    """One bot turn, starting a new game whenever the last one ends"""
+    state = {'game': Game(6, human_player_idx=None, headless=True, seed=0)}
+    
+    def turn():
+        game = state['game']
+        if game.is_over:
+            game = state['game'] = Game(6, human_player_idx=None, headless=True, seed=game.seed + 1)
+        game.current_player.take_turn(game)
+    return turn
+
+@benchmark('gamestate_declare_set')
+def setup_gamestate_declare_set():
+    """A correct declaration on models.game_state.GameState, hands restored after"""
+    from models.game_state import GameState
+    from models.player import Player as ModelPlayer
+    
+    random.seed(1)
+    state = GameState([ModelPlayer(f"P{i}", i) for i in range(6)])
+    state.deal_cards()
+    hands = [list(player.hand) for player in state.players]
+    set_name = hands[0][0].get_set()
+    assignments = {f"{card.rank}_{card.suit}": player.id
+                   for player in state.players for card in player.hand if card.get_set() == set_name}
+    
+    def declare():
+        for player, hand in zip(state.players, hands):
+            player.hand = list(hand)
+        state.current_turn = 0
+        state.team1_sets = state.team2_sets = 0
+        state.declare_set(0, set_name, assignments)
+    return declare
+
+@benchmark('server_get_game_state')
+def setup_server_get_game_state():
+    import server
+    game = Game(6, seed=1)
+    return lambda: server.get_game_state(game, 'bench')
+
+@benchmark('full_game', kind='macro')
+def setup_full_game():
+    simulator = Simulator()
+    seeds = iter(range(10**9))
+    return lambda: simulator.play_game(seed=next(seeds))
+
+def measure(fn, repeat=5, min_time=0.2):
+    """Time fn, returning per-call seconds for each of repeat runs
+    
+    The number of calls per run is calibrated (as timeit does) so each run
+    lasts at least min_time.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return [elapsed / number for elapsed in timer.repeat(repeat, number)], number
+
+def run_suite(names=None, repeat=5, min_time=0.2):
+    """Run the selected benchmarks (all if names is None) and return results"""
+    # Engine logging would dominate the non-headless timings and flood stdout
+    logging.disable(logging.INFO)
+    results = {}
+    try:
+        for name, kind, setup in BENCHMARKS:
+            if names and name not in names:
+                continue
+            times, number = measure(setup(), repeat, min_time)
+            results[name] = {
+                'kind': kind,
+                'calls_per_run': number,
+                'min': min(times),
+                'median': statistics.median(times),
+                'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+            }
+    finally:
+        logging.disable(logging.NOTSET)
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def compare(baseline, current, threshold=0.10):
+    """Compare median timings, returning (name, baseline, current, ratio, regressed) rows"""
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = result['median'] / base['median']
+        rows.append((name, base['median'], result['median'], ratio, ratio > 1 + threshold))
+    return rows
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+def format_results(report):
+    lines = [f"{'benchmark':24} {'kind':6} {'median':>10} {'min':>10} {'stdev':>10}"]
+    for name, result in report['results'].items():
+        lines.append(f"{name:24} {result['kind']:6} {format_time(result['median']):>10} "
+                     f"{format_time(result['min']):>10} {format_time(result['stdev']):>10}")
+    return "\n".join(lines)
+
+def format_comparison(rows, threshold):
+    lines = [f"{'benchmark':24} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for name, base, current, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{name:24} {format_time(base):>10} {format_time(current):>10} {ratio - 1:>+8.1%}{flag}")
+    regressions = sum(row[4] for row in rows)
+    lines.append(f"{regressions} regression(s) over {threshold:.0%}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Literature engine and server")
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against a stored JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="slowdown (as a fraction) that counts as a regression")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per run")
+    args = parser.parse_args(argv)
+    
+    report = run_suite(args.only, args.repeat, args.min_time)
+    print(format_results(report))
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print()
+        print(format_comparison(rows, args.threshold))
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
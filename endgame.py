@@ -0,0 +1,237 @@
+"""
+Literature Card Game - Endgame Solver
+Exact alpha-beta search over positions where every card's holder is known
+"""
+import time
+
+from game_logic import FAMILY_CARDS, NO_OWNER
+from transposition import TranspositionTable
+
+# Memo entry flags: the stored value is exact, a lower bound or an upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class BudgetExceeded(Exception):
+    """Raised inside the search when the node or time budget runs out"""
+
+class EndgameSolver:
+    """Finds optimal play once every in-play card's holder is known
+    
+    A position is the card owners plus the player to move, packed into
+    bytes as the memo key. Its value is the number of sets Team A will
+    still win minus those Team B will, with Team A maximizing and Team B
+    minimizing. Moves are:
+        ('declare', family_id)  a correct declaration of a set the mover
+                                holds a card of and the team holds fully
+        ('ask', target, card)   a successful ask, or one failing ask per
+                                opponent, which hands them the turn
+    Wrong declarations never help with everything known and are skipped.
+    A player with no cards passes as Game.pass_turn does. A position that
+    repeats on the current line (turns passed back and forth with no card
+    moving) scores 0, so values found through such cycles are approximate.
+    They depend on the line that led to the position, so they are never
+    memoized.
+    
+    The memo (a TranspositionTable) is kept between calls. solve() gives
+    up and returns None after max_nodes nodes or time_budget_ms (None for
+    no limit).
+    """
+    def __init__(self, max_nodes=200_000, time_budget_ms=100, memo_entries=200_000):
+        self.max_nodes = max_nodes
+        self.time_budget_ms = time_budget_ms
+        self.memo = TranspositionTable(memo_entries)
+        self.nodes = 0
+        # Repetitions scored so far, to tell which values relied on one
+        self.repetitions = 0
+    
+    def solve(self, game, card_owners=None):
+        """Solve the game's position (or the same position with card_owners
+        swapped in). Returns {'value', 'move', 'nodes', 'seconds'}, or None
+        if the budget ran out or the game is over."""
+        owners = bytearray(game.card_owners if card_owners is None else card_owners)
+        counts = [0] * len(game.players)
+        for owner in owners:
+            if owner != NO_OWNER:
+                counts[owner] += 1
+        self.teams = [player.team for player in game.players]
+        self.path = set()
+        self.nodes = 0
+        start = time.perf_counter()
+        self.deadline = start + self.time_budget_ms / 1000 if self.time_budget_ms is not None else None
+        
+        seat = self._to_move(counts, game.current_player_idx)
+        if seat is None:
+            return None
+        try:
+            value, move = self._search_root(owners, counts, seat)
+        except BudgetExceeded:
+            return None
+        return {
+            'value': value,
+            'move': move,
+            'nodes': self.nodes,
+            'seconds': time.perf_counter() - start,
+        }
+    
+    def _to_move(self, counts, seat):
+        """The seat that actually moves: seat itself if it has cards, else
+        the next teammate with cards, else the next player with cards"""
+        if counts[seat]:
+            return seat
+        num_players = len(counts)
+        team = self.teams[seat]
+        seats = [(seat + step) % num_players for step in range(1, num_players)]
+        for idx in seats:
+            if self.teams[idx] == team and counts[idx]:
+                return idx
+        for idx in seats:
+            if counts[idx]:
+                return idx
+        return None
+    
+    def _moves(self, owners, counts, seat):
+        """Moves for the seat to play, declarations first, then successful
+        asks, then one failing ask per opponent"""
+        teams = self.teams
+        team = teams[seat]
+        declarations = []
+        hits = []
+        for family_id, cards in enumerate(FAMILY_CARDS):
+            holders = [owners[card.ordinal] for card in cards]
+            if seat not in holders:
+                continue
+            if all(holder == NO_OWNER or teams[holder] == team for holder in holders):
+                declarations.append(('declare', family_id))
+                continue
+            for card, holder in zip(cards, holders):
+                if holder == seat:
+                    continue
+                if holder != NO_OWNER and teams[holder] != team:
+                    hits.append(('ask', holder, card))
+        misses = []
+        for target in range(len(counts)):
+            if teams[target] == team or not counts[target]:
+                continue
+            card = self._missing_card(owners, seat, target)
+            if card is not None:
+                misses.append(('ask', target, card))
+        return declarations + hits + misses
+    
+    def _missing_card(self, owners, seat, target):
+        """A card the seat may legally ask target for that target lacks"""
+        for cards in FAMILY_CARDS:
+            if any(owners[card.ordinal] == seat for card in cards):
+                for card in cards:
+                    owner = owners[card.ordinal]
+                    if owner not in (seat, target, NO_OWNER):
+                        return card
+        return None
+    
+    def _play(self, owners, counts, seat, move, alpha, beta):
+        """Value of making move from this position"""
+        if move[0] == 'declare':
+            removed = []
+            for card in FAMILY_CARDS[move[1]]:
+                owner = owners[card.ordinal]
+                if owner != NO_OWNER:
+                    removed.append((card.ordinal, owner))
+                    owners[card.ordinal] = NO_OWNER
+                    counts[owner] -= 1
+            gain = 1 if self.teams[seat] == 0 else -1
+            try:
+                return gain + self._search(owners, counts, seat, alpha - gain, beta - gain)
+            finally:
+                for ordinal, owner in removed:
+                    owners[ordinal] = owner
+                    counts[owner] += 1
+        
+        _, target, card = move
+        if owners[card.ordinal] != target:
+            return self._search(owners, counts, target, alpha, beta)
+        owners[card.ordinal] = seat
+        counts[target] -= 1
+        counts[seat] += 1
+        try:
+            return self._search(owners, counts, seat, alpha, beta)
+        finally:
+            owners[card.ordinal] = target
+            counts[target] += 1
+            counts[seat] -= 1
+    
+    def _search_root(self, owners, counts, seat):
+        maximizing = self.teams[seat] == 0
+        best_value = None
+        best_move = None
+        alpha, beta = -len(FAMILY_CARDS), len(FAMILY_CARDS)
+        key = bytes(owners) + bytes((seat,))
+        self.path.add(key)
+        for move in self._moves(owners, counts, seat):
+            value = self._play(owners, counts, seat, move, alpha, beta)
+            if best_value is None or (value > best_value if maximizing else value < best_value):
+                best_value, best_move = value, move
+                if maximizing:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+        self.path.discard(key)
+        return best_value, best_move
+    
+    def _search(self, owners, counts, seat, alpha, beta):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded()
+        if self.deadline is not None and not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise BudgetExceeded()
+        
+        seat = self._to_move(counts, seat)
+        if seat is None:
+            return 0
+        key = bytes(owners) + bytes((seat,))
+        if key in self.path:
+            self.repetitions += 1
+            return 0
+        entry = self.memo.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+        
+        alpha_in, beta_in = alpha, beta
+        repetitions = self.repetitions
+        maximizing = self.teams[seat] == 0
+        best = None
+        self.path.add(key)
+        try:
+            for move in self._moves(owners, counts, seat):
+                value = self._play(owners, counts, seat, move, alpha, beta)
+                if maximizing:
+                    if best is None or value > best:
+                        best = value
+                    alpha = max(alpha, value)
+                else:
+                    if best is None or value < best:
+                        best = value
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    break
+        finally:
+            self.path.discard(key)
+        
+        if best is None:
+            return 0
+        # A value that relied on a repetition holds only for this line
+        if self.repetitions != repetitions:
+            return best
+        if best <= alpha_in:
+            flag = UPPER
+        elif best >= beta_in:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.memo.store(key, (best, flag))
+        return best
@@ -0,0 +1,91 @@
+"""
+Literature Card Game - Engine Logging
+Structured, lazily formatted log events for the game engine
+
+Each engine subsystem logs to its own child of the "game_logic" logger, so
+levels can be set per subsystem:
+    game_logic.setup  game creation, the deal and starting hands
+    game_logic.moves  human requests, declarations and turn changes
+    game_logic.bots   bot turns
+
+Events are logged as (event, template, fields). Nothing is formatted unless
+the logger is enabled for the level and a handler actually formats the
+record; handlers can also read record.event and record.fields directly.
+"""
+import json
+import logging
+import random
+
+SUBSYSTEMS = ('setup', 'moves', 'bots')
+
+def get_logger(subsystem):
+    return logging.getLogger(f"game_logic.{subsystem}")
+
+class LazyMessage:
+    """A log message that formats its template only when turned into a string"""
+    __slots__ = ('template', 'fields')
+    
+    def __init__(self, template, fields):
+        self.template = template
+        self.fields = fields
+    
+    def __str__(self):
+        return self.template.format(**self.fields)
+
+def log_event(logger, level, event, template, **fields):
+    """Log a structured event if the logger is enabled for level
+    
+    Pass raw values (names, counts, labels) as fields rather than
+    preformatted strings, so a disabled event costs one level check.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, LazyMessage(template, fields), extra={'event': event, 'fields': fields})
+
+class SamplingFilter(logging.Filter):
+    """Pass only a fraction of records below WARNING, chosen at random
+    
+    Warnings and errors always pass. The filter keeps its own Random so
+    sampling never touches a game's rng.
+    """
+    def __init__(self, rate, seed=None):
+        super().__init__()
+        self.rate = rate
+        self.rng = random.Random(seed)
+    
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rng.random() < self.rate
+
+class StructuredFormatter(logging.Formatter):
+    """Format records as one JSON object per line
+    
+    Engine events become {"time", "level", "logger", "event", ...fields};
+    other records get their message under "message".
+    """
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        if hasattr(record, 'event'):
+            entry['event'] = record.event
+            entry.update(record.fields)
+        else:
+            entry['message'] = record.getMessage()
+        return json.dumps(entry, default=str)
+
+def configure(levels=None, sample=None, seed=None):
+    """Set per-subsystem levels and sampling rates
+    
+    levels maps a subsystem name to a logging level, e.g.
+    {'bots': logging.WARNING}. sample maps a subsystem name to the fraction
+    of its sub-WARNING records to keep (1.0 or None removes sampling).
+    """
+    for subsystem, level in (levels or {}).items():
+        get_logger(subsystem).setLevel(level)
+    for subsystem, rate in (sample or {}).items():
+        logger = get_logger(subsystem)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+        if rate is not None and rate < 1.0:
+            logger.addFilter(SamplingFilter(rate, seed))
@@ -0,0 +1,225 @@
+"""
+Literature Card Game - Game Database
+Durable game snapshots and move events in SQLite, written behind the game
+by one background thread
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    snapshot BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS moves (
+    id INTEGER PRIMARY KEY,
+    game_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    player INTEGER NOT NULL,
+    target INTEGER,
+    value INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS moves_by_game ON moves (game_id, id);
+"""
+
+class GameDatabase:
+    """Game snapshots and move events in a SQLite file, with write-behind
+    
+    save_game and log_move only queue the write, so callers never wait on
+    disk. A background thread takes the first queued write, gathers
+    whatever else arrives in the next flush_ms milliseconds and commits the
+    lot in one transaction (a group commit). A game saved again before the
+    writer gets to it is written once, with its latest snapshot. load_game
+    and moves see a write as soon as it is queued, before it reaches the
+    file, so readers never wait on the writer either.
+    
+    A move is ('ask', player, target, card ordinal, success) or ('declare',
+    player, None, family id, success). A crash can lose the last flush_ms
+    of writes, never a torn one. A batch that fails to commit is logged and
+    dropped, snapshots and moves alike; a game's next save writes it again.
+    """
+    def __init__(self, path, flush_ms=50):
+        self.path = path
+        self.flush_seconds = flush_ms / 1000
+        self.queue = queue.Queue()
+        # game_id -> latest snapshot not yet committed, and the games with
+        # one waiting in the queue (as opposed to taken into a batch)
+        self.pending = {}
+        self.queued = set()
+        # game_id -> moves not yet committed, as (id, kind, player, target,
+        # value, success). Move ids are handed out here rather than by
+        # SQLite so a reader can tell which of these it already read.
+        self.pending_moves = {}
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.snapshots_written = 0
+        self.snapshots_coalesced = 0
+        self.moves_written = 0
+        self.errors = 0
+        self.snapshots_dropped = 0
+        self.moves_dropped = 0
+        
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self.next_move_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM moves').fetchone()[0]
+        conn.close()
+        # Reads come from handler threads, one at a time
+        self.reader = self._connect(check_same_thread=False)
+        self.read_lock = threading.Lock()
+        self.writer = threading.Thread(target=self._run, name='game-db-writer', daemon=True)
+        self.writer.start()
+    
+    def _connect(self, check_same_thread=True):
+        conn = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        # WAL lets the reader run alongside the writer's commits
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    def save_game(self, game_id, snapshot):
+        """Queue the game's latest snapshot (bytes) to be written"""
+        with self.lock:
+            self.pending[game_id] = snapshot
+            if game_id in self.queued:
+                self.snapshots_coalesced += 1
+                return
+            self.queued.add(game_id)
+        self.queue.put(('game', game_id))
+    
+    def log_move(self, game_id, kind, player, target, value, success):
+        """Queue a move event to be written"""
+        with self.lock:
+            move_id = self.next_move_id
+            self.next_move_id += 1
+            self.pending_moves.setdefault(game_id, []).append((move_id, kind, player, target, value, bool(success)))
+        self.queue.put(('move', (move_id, game_id, kind, player, target, value, int(success), time.time())))
+    
+    def load_game(self, game_id):
+        """The game's latest snapshot, or None if it was never saved"""
+        with self.lock:
+            snapshot = self.pending.get(game_id)
+        if snapshot is not None:
+            return snapshot
+        with self.read_lock:
+            row = self.reader.execute('SELECT snapshot FROM games WHERE game_id = ?', (game_id,)).fetchone()
+        return None if row is None else bytes(row[0])
+    
+    def moves(self, game_id):
+        """The game's move events, oldest first, as (kind, player, target,
+        value, success) tuples, including those still queued"""
+        # Taken before reading the file: a queued move committed in between
+        # then shows up in both, and the ids tell the copies apart
+        with self.lock:
+            queued = list(self.pending_moves.get(game_id, ()))
+        with self.read_lock:
+            rows = self.reader.execute('SELECT id, kind, player, target, value, success FROM moves '
+                                       'WHERE game_id = ? ORDER BY id', (game_id,)).fetchall()
+        committed = {row[0] for row in rows}
+        rows += [row for row in queued if row[0] not in committed]
+        rows.sort()
+        return [(kind, player, target, value, bool(success)) for _, kind, player, target, value, success in rows]
+    
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        self.queue.join()
+    
+    def close(self):
+        """Commit what is queued, then stop the writer"""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        self.reader.close()
+    
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'batches': self.batches,
+            'snapshots_written': self.snapshots_written,
+            'snapshots_coalesced': self.snapshots_coalesced,
+            'moves_written': self.moves_written,
+            'errors': self.errors,
+            'snapshots_dropped': self.snapshots_dropped,
+            'moves_dropped': self.moves_dropped,
+        }
+    
+    def _run(self):
+        conn = self._connect()
+        closing = False
+        while not closing:
+            batch = [self.queue.get()]
+            if batch[0] is None:
+                break
+            # Gather what arrives within the flush window into the same commit
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                wait = deadline - time.monotonic()
+                try:
+                    item = self.queue.get(timeout=wait) if wait > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            snapshots, moves = self._take(batch)
+            try:
+                self._write(conn, snapshots, moves)
+            except Exception:
+                # Keep the writer alive: a dead one would leave flush waiting
+                self.errors += 1
+                self.snapshots_dropped += len(snapshots)
+                self.moves_dropped += len(moves)
+                log.exception(f"Failed to write {len(batch)} queued game writes, "
+                              f"dropped {len(snapshots)} snapshots and {len(moves)} moves")
+            # Written or dropped, the batch is no longer served from memory
+            self._settle(snapshots, moves)
+            for _ in batch:
+                self.queue.task_done()
+        # The None that ended the loop
+        self.queue.task_done()
+        conn.close()
+    
+    def _take(self, batch):
+        """Split a batch into (game_id, snapshot) pairs and move rows,
+        taking its games off the queued set"""
+        game_ids = [game_id for kind, game_id in batch if kind == 'game']
+        moves = [row for kind, row in batch if kind == 'move']
+        with self.lock:
+            self.queued.difference_update(game_ids)
+            snapshots = [(game_id, self.pending[game_id]) for game_id in game_ids]
+        return snapshots, moves
+    
+    def _write(self, conn, snapshots, moves):
+        now = time.time()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO games (game_id, snapshot, updated_at) VALUES (?, ?, ?)',
+                             [(game_id, snapshot, now) for game_id, snapshot in snapshots])
+            conn.executemany('INSERT INTO moves (id, game_id, kind, player, target, value, success, created_at) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', moves)
+        self.batches += 1
+        self.snapshots_written += len(snapshots)
+        self.moves_written += len(moves)
+    
+    def _settle(self, snapshots, moves):
+        """Drop a finished batch from pending and pending_moves. A game
+        saved again since the batch took it is queued again, and keeps its
+        newer snapshot."""
+        done = {move[0] for move in moves}
+        with self.lock:
+            for game_id, _ in snapshots:
+                if game_id not in self.queued:
+                    del self.pending[game_id]
+            for game_id in {move[1] for move in moves}:
+                left = [row for row in self.pending_moves[game_id] if row[0] not in done]
+                if left:
+                    self.pending_moves[game_id] = left
+                else:
+                    del self.pending_moves[game_id]
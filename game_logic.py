@@ -2,38 +2,191 @@
 Literature Card Game - Core Game Logic
 Separated from the web interface for clean architecture
 """
+import importlib
 import random
 import logging
+import struct
+
+from engine_log import get_logger, log_event
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
-log = logging.getLogger(__name__)
+setup_log = get_logger('setup')
+moves_log = get_logger('moves')
+bots_log = get_logger('bots')
 
 class Card:
-    """A simple playing card"""
+    """A playing card
+    
+    Cards are flyweights: exactly 52 instances are created once at import
+    and shared by every game. Card(suit, rank) and Card.of(suit, rank) both
+    return the interned instance, so no card is ever allocated at runtime and
+    cards compare by identity.
+    """
     SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
     RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+    # Ace sits in the high set, only 2-7 are in low sets
+    LOW_RANKS = ['2', '3', '4', '5', '6', '7']
+    # Family names indexed by family id: Low/High for each suit in SUITS order
+    FAMILIES = [f"{prefix} {suit}" for suit in SUITS for prefix in ("Low", "High")]
+    
+    __slots__ = ('suit', 'rank', 'ordinal', 'bit', 'family_id', 'family', 'label')
     
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
+    def __new__(cls, suit, rank):
+        return cls.of(suit, rank)
+    
+    @staticmethod
+    def of(suit, rank):
+        """Return the interned card for suit and rank"""
+        try:
+            return _CARDS_BY_SUIT[suit][rank]
+        except KeyError:
+            raise ValueError(f"Invalid card: {rank} of {suit}") from None
+    
+    def __reduce__(self):
+        # Keep cards interned across pickle/copy
+        return (Card.of, (self.suit, self.rank))
     
     def __str__(self):
-        return f"{self.rank} of {self.suit}"
+        return self.label
+    
+    def __repr__(self):
+        return f"Card({self.suit!r}, {self.rank!r})"
     
     def get_family(self):
         """Get the card family (used for Literature game rules)"""
-        # Move Ace to high set, only 2-7 are in low sets now
-        if self.rank in ['2', '3', '4', '5', '6', '7']:
-            return f"Low {self.suit}"
-        else:
-            return f"High {self.suit}"
+        return self.family
+
+def _build_card_table():
+    """Create the 52 interned cards in ordinal (suit-major) order"""
+    cards = []
+    for suit_idx, suit in enumerate(Card.SUITS):
+        for rank in Card.RANKS:
+            card = object.__new__(Card)
+            card.suit = suit
+            card.rank = rank
+            card.ordinal = len(cards)
+            card.bit = 1 << card.ordinal
+            card.family_id = suit_idx * 2 + (0 if rank in Card.LOW_RANKS else 1)
+            card.family = Card.FAMILIES[card.family_id]
+            card.label = f"{rank} of {suit}"
+            cards.append(card)
+    return cards
+
+# Compact card indexing: every card has an ordinal 0-51 so a hand can be
+# stored as a 52-bit integer with one bit per card.
+ORDINAL_CARDS = _build_card_table()
+CARD_ORDINALS = {(card.suit, card.rank): card.ordinal for card in ORDINAL_CARDS}
+# suit -> rank -> card, for lookups that don't build a (suit, rank) key
+_CARDS_BY_SUIT = {suit: {card.rank: card for card in ORDINAL_CARDS if card.suit == suit} for suit in Card.SUITS}
+_NO_RANKS = {}
+
+# Bitmask of every card in each family, by family id and by name
+FAMILY_ID_MASKS = [0] * len(Card.FAMILIES)
+for _card in ORDINAL_CARDS:
+    FAMILY_ID_MASKS[_card.family_id] |= _card.bit
+FAMILY_MASKS = dict(zip(Card.FAMILIES, FAMILY_ID_MASKS))
+FAMILY_IDS = {family: i for i, family in enumerate(Card.FAMILIES)}
+FAMILY_CARDS = [[card for card in ORDINAL_CARDS if card.family_id == i]
+                for i in range(len(Card.FAMILIES))]
+
+def wanted_mask(hand_mask, in_play_mask):
+    """The cards a player holding hand_mask may ask for: in-play cards
+    they don't hold from the families they hold a card of"""
+    wanted = 0
+    for family_mask in FAMILY_ID_MASKS:
+        if hand_mask & family_mask:
+            wanted |= family_mask
+    return wanted & in_play_mask & ~hand_mask
+
+# Table sizes the game is played at, dealing 48 cards either way: 8 each
+# for 6 players, 6 each for 8
+PLAYER_COUNTS = (6, 8)
+
+# Owner index value for cards no player holds (left in the deck or declared)
+NO_OWNER = 0xFF
+
+# Team value for a set removed without points, and for a drawn game
+NO_TEAM = -1
+
+# Zobrist keys for position hashing: one random 64-bit key per (card, holder)
+# for up to 8 players, per (family, winning team or NO_TEAM as index -1) and
+# per player to move. Fixed seed, so hashes are stable across runs.
+MAX_PLAYERS = 8
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_CARD_KEYS = [[_zobrist_rng.getrandbits(64) for _ in range(MAX_PLAYERS)] for _ in ORDINAL_CARDS]
+ZOBRIST_FAMILY_KEYS = [[_zobrist_rng.getrandbits(64) for _ in range(3)] for _ in Card.FAMILIES]
+ZOBRIST_TURN_KEYS = [_zobrist_rng.getrandbits(64) for _ in range(MAX_PLAYERS)]
+
+class BitmaskHand:
+    """A hand stored as a 52-bit integer, one bit per card ordinal.
+    
+    Membership, removal and family checks are single bitwise operations.
+    The hand still reads like a list of Card objects (iteration, len,
+    indexing) so the front ends can keep treating player.hand as a list.
+    """
+    __slots__ = ('mask',)
+    
+    def __init__(self, cards=()):
+        self.mask = 0
+        for card in cards:
+            self.append(card)
+    
+    @classmethod
+    def from_mask(cls, mask):
+        hand = cls()
+        hand.mask = mask
+        return hand
+    
+    def append(self, card):
+        self.mask |= card.bit
+    
+    def remove(self, card):
+        if not self.mask & card.bit:
+            raise ValueError(f"{card} is not in hand")
+        self.mask ^= card.bit
+    
+    def remove_card(self, suit, rank):
+        """Remove a card by suit and rank, returning it (or None if absent)"""
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        if card is not None and self.mask & card.bit:
+            self.mask ^= card.bit
+            return card
+        return None
+    
+    def has_card(self, suit, rank):
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        return card is not None and self.mask & card.bit != 0
+    
+    def has_family(self, family):
+        return bool(self.mask & FAMILY_MASKS.get(family, 0))
+    
+    def __contains__(self, card):
+        return self.mask & card.bit != 0
+    
+    def __iter__(self):
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield ORDINAL_CARDS[low.bit_length() - 1]
+            mask ^= low
+    
+    def __len__(self):
+        return self.mask.bit_count()
+    
+    def __getitem__(self, index):
+        return list(self)[index]
+    
+    def __repr__(self):
+        return f"BitmaskHand([{', '.join(str(card) for card in self)}])"
 
 class Player:
     """A player with a hand of cards"""
-    def __init__(self, name, is_bot=True, team=0):
+    def __init__(self, name, is_bot=True, team=0, compact_hand=False):
         self.name = name
-        self.hand = []
+        # compact_hand stores the hand as a bitmask instead of a list
+        self.compact_hand = compact_hand
+        self.hand = BitmaskHand() if compact_hand else []
         self.is_bot = is_bot
         self.team = team  # 0 for first team, 1 for second team
         
@@ -42,50 +195,178 @@ class Player:
         
     def remove_card(self, suit, rank):
         """Remove a card from player's hand if it exists"""
-        for i, card in enumerate(self.hand):
-            if card.suit == suit and card.rank == rank:
-                return self.hand.pop(i)
-        return None
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        if self.compact_hand:
+            hand = self.hand
+            if card is not None and hand.mask & card.bit:
+                hand.mask ^= card.bit
+                return card
+            return None
+        try:
+            self.hand.remove(card)
+        except ValueError:
+            return None
+        return card
     
     def has_card(self, suit, rank):
         """Check if player has the specified card"""
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        if self.compact_hand:
+            return card is not None and self.hand.mask & card.bit != 0
+        return card in self.hand
+    
+    def clone(self):
+        """A copy sharing name, team and other metadata, with its own hand"""
+        clone = object.__new__(self.__class__)
+        state = self.__dict__.copy()
+        if self.compact_hand:
+            hand = state['hand'] = object.__new__(BitmaskHand)
+            hand.mask = self.hand.mask
+        else:
+            state['hand'] = self.hand[:]
+        # Fill the dict before attaching it, which is cheaper than setattr
+        clone.__dict__ = state
+        return clone
+    
+    def hand_mask(self):
+        """The hand as a bitmask of card ordinals"""
+        if self.compact_hand:
+            return self.hand.mask
+        mask = 0
         for card in self.hand:
-            if card.suit == suit and card.rank == rank:
-                return True
-        return False
+            mask |= card.bit
+        return mask
     
     def has_card_of_family(self, family):
         """Check if player has any card of a specific family"""
+        if self.compact_hand:
+            return self.hand.mask & FAMILY_MASKS.get(family, 0) != 0
         for card in self.hand:
-            if card.get_family() == family:
+            if card.family == family:
                 return True
         return False
 
 class Bot(Player):
     """AI player that makes automatic moves"""
-    def __init__(self, name, team=0):
-        super().__init__(name, is_bot=True, team=team)
+    # Chance per turn of declaring a set on a guess rather than asking
+    DECLARE_CHANCE = 0.05
+    # Whether the bot's moves follow from the game's seed alone. Games
+    # seating a bot that doesn't keep every bot move for replays.
+    REPLAYS_FROM_SEED = True
+    
+    def __init__(self, name, team=0, compact_hand=False):
+        super().__init__(name, is_bot=True, team=team, compact_hand=compact_hand)
+    
+    def choose_declaration(self, game):
+        """A family the bot holds every in-play card of, or None"""
+        hand_mask = self.hand_mask()
+        in_play = game.in_play_mask
+        for family_id, family_mask in enumerate(FAMILY_ID_MASKS):
+            live = family_mask & in_play
+            if live and live & hand_mask == live:
+                return family_id
+        return None
+    
+    def choose_request(self, game):
+        """Pick a (card, target player index) to ask for, or None
+        
+        Simple strategy: a random in-play card the bot doesn't hold from a
+        family it does hold, asked of a random opponent who still has cards.
+        """
+        wanted = wanted_mask(self.hand_mask(), game.in_play_mask)
+        
+        targets = [i for i, p in enumerate(game.players) if p.team != self.team and p.hand]
+        if not wanted or not targets:
+            return None
+        
+        # Uniform pick among the wanted cards: drop k low bits, take the next
+        rng = game.rng
+        for _ in range(rng.randrange(wanted.bit_count())):
+            wanted &= wanted - 1
+        card = ORDINAL_CARDS[(wanted & -wanted).bit_length() - 1]
+        return card, rng.choice(targets)
+    
+    def guess_declaration(self, game, seat):
+        """Declare the family the bot holds the largest share of, guessing
+        which teammate holds each card it doesn't. Returns (family_id, assignments)."""
+        hand_mask = self.hand_mask()
+        in_play = game.in_play_mask
+        family_id = None
+        best_share = -1.0
+        for i, family_mask in enumerate(FAMILY_ID_MASKS):
+            live = family_mask & in_play
+            held = live & hand_mask
+            if held:
+                share = held.bit_count() / live.bit_count()
+                if share > best_share:
+                    family_id, best_share = i, share
+        
+        teammates = [i for i, p in enumerate(game.players)
+                     if p.team == self.team and i != seat and p.hand] or [seat]
+        assignments = {}
+        for card in FAMILY_CARDS[family_id]:
+            if card.bit & hand_mask:
+                assignments[card] = seat
+            elif card.bit & in_play:
+                assignments[card] = game.rng.choice(teammates)
+        return family_id, assignments
+    
+    def declaration_assignments(self, game, family_id, seat):
+        """Card -> seat map for a family chosen by choose_declaration"""
+        family_mask = FAMILY_ID_MASKS[family_id] & game.in_play_mask
+        return {card: seat for card in FAMILY_CARDS[family_id] if card.bit & family_mask}
     
     def take_turn(self, game):
         """Bot takes its turn automatically"""
-        # Simple strategy: randomly ask another player for a card the bot has
+        game.turns += 1
+        headless = game.headless
         if not self.hand:
-            message = f"{self.name} has no cards, skipping turn"
-            game.game_message = message
-            log.info(message)
+            game.pass_turn()
+            if not headless:
+                game.game_message = f"{self.name} has no cards, passing the turn to {game.current_player.name}"
+                log_event(bots_log, logging.INFO, 'bot_pass', "{bot} has no cards, passing the turn to {to}",
+                          bot=self.name, to=game.current_player.name)
             return False
-            
-        # Choose a random card from hand
-        card = random.choice(self.hand)
         
-        # Choose a random player from the other team
-        other_team = 1 if self.team == 0 else 0
-        other_team_players = [p for p in game.players if p.team == other_team]
+        # The bot is always the current player when taking its turn
+        seat = game.current_player_idx
         
-        if not other_team_players:
+        family_id = self.choose_declaration(game)
+        if family_id is not None:
+            return self.declare(game, seat, Card.FAMILIES[family_id],
+                                self.declaration_assignments(game, family_id, seat))
+        
+        request = None
+        if game.rng.random() >= self.DECLARE_CHANCE:
+            request = self.choose_request(game)
+        if request is None:
+            # Declare on a guess now and then, and whenever the other team
+            # has no cards left to ask for
+            family_id, assignments = self.guess_declaration(game, seat)
+            return self.declare(game, seat, Card.FAMILIES[family_id], assignments)
+        card, target_player_idx = request
+        return self.ask(game, seat, card, target_player_idx)
+    
+    def declare(self, game, seat, family, assignments):
+        """Declare a family for the bot's team (game.make_declaration)"""
+        if game.bot_actions is not None:
+            game.bot_actions.append((game.turns - 1, 'declare', (family, dict(assignments))))
+        return game.make_declaration(family, assignments, seat)
+    
+    def ask(self, game, seat, card, target_player_idx):
+        """Ask a player for a card, keeping the turn on a hit"""
+        if game.bot_actions is not None:
+            game.bot_actions.append((game.turns - 1, 'request', (target_player_idx, card.suit, card.rank)))
+        if game.headless:
+            if game.card_owners[card.ordinal] == target_player_idx:
+                game.transfer(card, seat)
+                game.ask_history.append((seat, target_player_idx, card.ordinal, True))
+                return True
+            game.ask_history.append((seat, target_player_idx, card.ordinal, False))
+            game.current_player_idx = target_player_idx
             return False
-            
-        target_player = random.choice(other_team_players)
+        
+        target_player = game.players[target_player_idx]
         
         # Store the current request info for logging
         game.last_request = {
@@ -94,54 +375,213 @@ class Bot(Player):
             'card': card
         }
         
-        # Find the target player's index for turn management
-        target_player_idx = game.players.index(target_player)
-        
-        # Create detailed message about the request
-        request_message = f"{self.name} asks {target_player.name} for the {card.rank} of {card.suit}"
-        game.game_message = request_message
-        log.info(request_message)
-        
         # Check if target has the card
-        if target_player.has_card(card.suit, card.rank):
+        success = game.owner_of(card) == target_player_idx
+        game.ask_history.append((seat, target_player_idx, card.ordinal, success))
+        log_event(bots_log, logging.INFO, 'bot_request', "{bot} asks {target} for the {card}: {result}",
+                  bot=self.name, target=target_player.name, card=card.label,
+                  result="success" if success else "miss")
+        if success:
             # Success! Get the card
-            target_card = target_player.remove_card(card.suit, card.rank)
-            if target_card:
-                self.add_card(target_card)
-                result_message = f"SUCCESS! {self.name} got the {card.rank} of {card.suit} from {target_player.name}"
-                game.game_message = result_message
-                log.info(result_message)
-                # Bot gets another turn on success
-                return True
+            game.transfer(card, game.current_player_idx)
+            game.game_message = f"SUCCESS! {self.name} got the {card.rank} of {card.suit} from {target_player.name}"
+            # Bot gets another turn on success
+            return True
         
-        fail_message = f"{target_player.name} doesn't have the {card.rank} of {card.suit}"
-        game.game_message = fail_message
-        log.info(fail_message)
+        game.game_message = f"{target_player.name} doesn't have the {card.rank} of {card.suit}"
         
         # On failure, turn passes to the target player
         game.current_player_idx = target_player_idx
         return False
 
+class KnowledgeBot(Bot):
+    """Bot that tracks which players could be holding each card
+    
+    possible[ordinal] is a bitmask of the seats that could hold a card. It
+    starts as "anyone but me" for cards outside the bot's hand and is
+    narrowed by reading game.ask_history incrementally, O(1) per ask: a hit
+    pins the card on the asker, a miss rules out both the asker (who must
+    have lacked it) and the target.
+    
+    The bot asks for the missing card of one of its families that has the
+    fewest possible holders on the other team, from the candidate with the
+    most cards. It declares once every live card of a family it holds is
+    known to be on its team, and otherwise only when nothing is left to ask.
+    """
+    DECLARE_CHANCE = 0.0
+    
+    def __init__(self, name, team=0, compact_hand=False):
+        super().__init__(name, team=team, compact_hand=compact_hand)
+        self.possible = None
+        self.seen_asks = 0
+    
+    def clone(self):
+        clone = super().clone()
+        if self.possible is not None:
+            clone.possible = self.possible[:]
+        return clone
+    
+    def observe(self, game, seat):
+        """Apply the asks made since the bot last looked"""
+        possible = self.possible
+        if possible is None:
+            others = ((1 << len(game.players)) - 1) & ~(1 << seat)
+            possible = self.possible = [others] * len(ORDINAL_CARDS)
+            for card in self.hand:
+                possible[card.ordinal] = 1 << seat
+        history = game.ask_history
+        for i in range(self.seen_asks, len(history)):
+            asker, target, ordinal, success = history[i]
+            if success:
+                possible[ordinal] = 1 << asker
+            else:
+                possible[ordinal] &= ~((1 << asker) | (1 << target))
+        self.seen_asks = len(history)
+    
+    def team_masks(self, game):
+        """Seat bitmasks of (teammates, opponents) who still have cards"""
+        team = opponents = 0
+        for i, player in enumerate(game.players):
+            if player.hand:
+                if player.team == self.team:
+                    team |= 1 << i
+                else:
+                    opponents |= 1 << i
+        return team, opponents
+    
+    def choose_declaration(self, game):
+        """A held family whose every live card is known to be on the team, or None"""
+        hand_mask = self.hand_mask()
+        in_play = game.in_play_mask
+        team, _ = self.team_masks(game)
+        possible = self.possible
+        for family_id, family_mask in enumerate(FAMILY_ID_MASKS):
+            live = family_mask & in_play
+            if not live & hand_mask:
+                continue
+            for card in FAMILY_CARDS[family_id]:
+                if card.bit & live:
+                    holders = possible[card.ordinal]
+                    if holders & (holders - 1) or not holders & team:
+                        break
+            else:
+                return family_id
+        return None
+    
+    def declaration_assignments(self, game, family_id, seat):
+        live = FAMILY_ID_MASKS[family_id] & game.in_play_mask
+        return {card: self.possible[card.ordinal].bit_length() - 1
+                for card in FAMILY_CARDS[family_id] if card.bit & live}
+    
+    def choose_request(self, game):
+        """The missing card with the fewest possible opponent holders, asked
+        of the one holding the most cards, or None if no opponent can have one"""
+        wanted = wanted_mask(self.hand_mask(), game.in_play_mask)
+        _, opponents = self.team_masks(game)
+        
+        possible = self.possible
+        best_card = None
+        best_holders = 0
+        best_count = len(game.players) + 1
+        while wanted:
+            low = wanted & -wanted
+            wanted ^= low
+            ordinal = low.bit_length() - 1
+            holders = possible[ordinal] & opponents
+            if holders and holders.bit_count() < best_count:
+                best_card, best_holders, best_count = ORDINAL_CARDS[ordinal], holders, holders.bit_count()
+        if best_card is None:
+            return None
+        
+        players = game.players
+        target = max((i for i in range(len(players)) if best_holders >> i & 1),
+                     key=lambda i: len(players[i].hand))
+        return best_card, target
+    
+    def guess_declaration(self, game, seat):
+        """Declare the held family with the most cards located on the team,
+        putting each card on a teammate who could hold it"""
+        hand_mask = self.hand_mask()
+        in_play = game.in_play_mask
+        team, _ = self.team_masks(game)
+        team |= 1 << seat
+        possible = self.possible
+        family_id = None
+        best_share = -1.0
+        for i, family_mask in enumerate(FAMILY_ID_MASKS):
+            live = family_mask & in_play
+            if live & hand_mask:
+                located = sum(1 for card in FAMILY_CARDS[i]
+                              if card.bit & live and not possible[card.ordinal] & ~team)
+                share = located / live.bit_count()
+                if share > best_share:
+                    family_id, best_share = i, share
+        
+        teammates = [i for i in range(len(game.players)) if team >> i & 1]
+        assignments = {}
+        for card in FAMILY_CARDS[family_id]:
+            if card.bit & in_play:
+                candidates = [i for i in teammates if possible[card.ordinal] >> i & 1] or teammates
+                assignments[card] = game.rng.choice(candidates)
+        return family_id, assignments
+    
+    def take_turn(self, game):
+        if self.hand:
+            self.observe(game, game.current_player_idx)
+        return super().take_turn(game)
+
 class Game:
-    """Core game logic"""
-    def __init__(self, num_players=6, human_player_idx=0):
-        log.info(f"Creating new game with {num_players} players (human is player {human_player_idx+1})")
+    """Core game logic
+    
+    human_player_idx=None makes every player a bot. bot_classes gives the Bot
+    class to seat for each team (default Bot for both). headless=True skips
+    all logging and message formatting, for bot-only simulations.
+    
+    All randomness (the shuffle and every bot choice) comes from self.rng,
+    seeded with seed (a random one if not given). The seed plus the human's
+    actions, and the bots' moves when they don't follow from the seed (see
+    replay_record), replays a game exactly.
+    
+    Cards left in the deck after dealing are out of play and public, as are
+    declared sets. The game ends once every set has been declared.
+    """
+    def __init__(self, num_players=6, human_player_idx=0, compact_hands=False, headless=False,
+                 bot_classes=None, seed=None):
+        if num_players not in PLAYER_COUNTS:
+            raise ValueError(f"Literature is played by 6 or 8 players, not {num_players}")
+        # Snapshots store the seed as an unsigned 64-bit integer
+        if seed is not None and not (isinstance(seed, int) and 0 <= seed < 1 << 64):
+            raise ValueError(f"Game seeds are integers from 0 to 2**64 - 1, not {seed!r}")
+        self.headless = headless
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        if not headless:
+            log_event(setup_log, logging.INFO, 'game_created', "Creating new game with {players} players "
+                      "(human seat {human}, seed {seed})",
+                      players=num_players, human=human_player_idx, seed=self.seed)
         
         # Create players - one human, rest bots, split into teams
-        self.players = []
-        half = num_players // 2
-        
-        for i in range(num_players):
-            team = 0 if i < half else 1
-            if i == human_player_idx:
-                self.players.append(Player(f"Player {i+1} (You)", is_bot=False, team=team))
-            else:
-                self.players.append(Bot(f"Bot {i+1}", team=team))
-                
-        self.human_player_idx = human_player_idx
+        self.seat_players(num_players, human_player_idx, compact_hands, bot_classes)
         self.current_player_idx = 0
         self.auto_play = False
         
+        # Turns played so far, and the human's accepted actions as
+        # (turn, action, args) for replays
+        self.turns = 0
+        self.human_actions = []
+        
+        # Every ask so far as (asker, target, card ordinal, success). Asks and
+        # their results are public, so bots may read this to track cards.
+        self.ask_history = []
+        
+        # Per-player legal move cache, see legal_moves
+        self.legal_moves_cache = {}
+        
+        # Sets won per team, and the team that won each family (None while
+        # in play, NO_TEAM if it was removed without points)
+        self.scores = [0, 0]
+        self.family_winners = [None] * len(Card.FAMILIES)
+        
         # Team names
         self.team_names = ["Team A", "Team B"]
         
@@ -152,50 +592,136 @@ class Game:
         # Game state
         self.game_message = "Game started. It's your turn!"
         
-        # Print game setup info
-        for player in self.players:
-            log.info(f"{player.name} has {len(player.hand)} cards (Team {player.team+1})")
+        if not headless and setup_log.isEnabledFor(logging.DEBUG):
+            self.log_initial_distribution()
+    
+    def seat_players(self, num_players, human_player_idx, compact_hands=False, bot_classes=None):
+        """Create the players with empty hands, first half Team A and the rest Team B"""
+        self.players = []
+        half = num_players // 2
+        bot_classes = bot_classes or (Bot, Bot)
         
-        # After dealing cards, add detailed logging
-        log.info("=== INITIAL CARD DISTRIBUTION ===")
+        for i in range(num_players):
+            team = 0 if i < half else 1
+            if i == human_player_idx:
+                self.players.append(Player(f"Player {i+1} (You)", is_bot=False, team=team,
+                                           compact_hand=compact_hands))
+            else:
+                self.players.append(bot_classes[team](f"Bot {i+1}", team=team, compact_hand=compact_hands))
+                
+        self.human_player_idx = human_player_idx
+        # Bot moves as (turn, action, args) like human_actions, kept only
+        # when a bot's moves can't be replayed from the seed
+        self.bot_actions = None if all(p.REPLAYS_FROM_SEED for p in self.players if p.is_bot) else []
+    
+    def log_initial_distribution(self):
+        """Log every player's starting hand, grouped by suit (DEBUG on game_logic.setup)"""
         for i, player in enumerate(self.players):
-            card_list = [f"{card.rank} of {card.suit}" for card in player.hand]
-            log.info(f"Player {i}: {player.name} (Team {player.team}) - {len(player.hand)} cards:")
-            
             # Group cards by suit for clearer display
             suits = {}
-            for card in player.hand:
-                if card.suit not in suits:
-                    suits[card.suit] = []
-                suits[card.suit].append(card.rank)
-            
-            # Log cards organized by suit
-            for suit in sorted(suits.keys()):
-                ranks = sorted(suits[suit], key=lambda r: Card.RANKS.index(r) if r in Card.RANKS else 100)
-                log.info(f"  {suit}: {', '.join(ranks)}")
-            
-        log.info("================================")
+            for card in sorted(player.hand, key=lambda card: card.ordinal):
+                suits.setdefault(card.suit, []).append(card.rank)
+            log_event(setup_log, logging.DEBUG, 'initial_hand', "Player {seat}: {player} (Team {team}) - "
+                      "{count} cards: {hand}", seat=i, player=player.name, team=player.team,
+                      count=len(player.hand), hand=suits)
     
     def create_deck(self):
         """Create a standard deck of cards"""
-        self.deck = []
-        for suit in Card.SUITS:
-            for rank in Card.RANKS:
-                self.deck.append(Card(suit, rank))
+        self.deck = list(ORDINAL_CARDS)
         
-        random.shuffle(self.deck)
-        log.info(f"Created and shuffled deck with {len(self.deck)} cards")
+        self.rng.shuffle(self.deck)
+        if not self.headless:
+            log_event(setup_log, logging.DEBUG, 'deck_shuffled', "Created and shuffled deck with {cards} cards",
+                      cards=len(self.deck))
     
     def deal_cards(self):
         """Deal cards to all players"""
         cards_per_player = 6 if len(self.players) == 8 else 8
-        log.info(f"Dealing {cards_per_player} cards per player")
+        if not self.headless:
+            log_event(setup_log, logging.DEBUG, 'deal', "Dealing {cards} cards per player", cards=cards_per_player)
+        
+        # Authoritative card -> player index map, one byte per card ordinal
+        self.card_owners = bytearray([NO_OWNER]) * len(ORDINAL_CARDS)
+        
+        # Bitmask of cards still held by players
+        self.in_play_mask = 0
+        
+        # Zobrist hash of card ownership and declared sets (see position_hash)
+        self.zobrist = 0
         
         for _ in range(cards_per_player):
-            for player in self.players:
+            for i, player in enumerate(self.players):
                 if self.deck:
                     card = self.deck.pop()
                     player.add_card(card)
+                    self.card_owners[card.ordinal] = i
+                    self.in_play_mask |= card.bit
+                    self.zobrist ^= ZOBRIST_CARD_KEYS[card.ordinal][i]
+    
+    def owner_of(self, card):
+        """Index of the player holding a card, or None if nobody holds it"""
+        owner = self.card_owners[card.ordinal]
+        return None if owner == NO_OWNER else owner
+    
+    def transfer(self, card, to_player_idx):
+        """Move a card from its current holder to another player"""
+        from_player_idx = self.card_owners[card.ordinal]
+        self.players[from_player_idx].hand.remove(card)
+        self.players[to_player_idx].add_card(card)
+        self.card_owners[card.ordinal] = to_player_idx
+        keys = ZOBRIST_CARD_KEYS[card.ordinal]
+        self.zobrist ^= keys[from_player_idx] ^ keys[to_player_idx]
+    
+    @property
+    def position_hash(self):
+        """64-bit Zobrist hash of the position: who holds each card, how
+        each declared set went, and the player to move. Kept up to date
+        incrementally, so reading it is O(1)."""
+        return self.zobrist ^ ZOBRIST_TURN_KEYS[self.current_player_idx]
+    
+    def compute_zobrist(self):
+        """Recompute the ownership and declared-set part of the hash from scratch"""
+        zobrist = 0
+        for ordinal, owner in enumerate(self.card_owners):
+            if owner != NO_OWNER:
+                zobrist ^= ZOBRIST_CARD_KEYS[ordinal][owner]
+        for family_id, winner in enumerate(self.family_winners):
+            if winner is not None:
+                zobrist ^= ZOBRIST_FAMILY_KEYS[family_id][winner]
+        return zobrist
+    
+    @property
+    def is_over(self):
+        """The game ends once every set has been declared"""
+        return None not in self.family_winners
+    
+    @property
+    def winning_team(self):
+        """The team with more sets once the game is over (NO_TEAM on a draw),
+        or None while play continues"""
+        if not self.is_over:
+            return None
+        if self.scores[0] == self.scores[1]:
+            return NO_TEAM
+        return 0 if self.scores[0] > self.scores[1] else 1
+    
+    def pass_turn(self):
+        """Pass the turn to the next teammate (clockwise) who still has cards,
+        or to the next player with cards if the whole team is out"""
+        team = self.current_player.team
+        num_players = len(self.players)
+        seats = [(self.current_player_idx + step) % num_players for step in range(1, num_players)]
+        for idx in seats:
+            player = self.players[idx]
+            if player.team == team and player.hand:
+                self.current_player_idx = idx
+                return player
+        for idx in seats:
+            player = self.players[idx]
+            if player.hand:
+                self.current_player_idx = idx
+                return player
+        return None
     
     @property
     def current_player(self):
@@ -210,13 +736,15 @@ class Game:
         starting a new round, not after each card request."""
         self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
         player = self.current_player
+        if self.headless:
+            return player
         
         if player.is_bot:
             self.game_message = f"It's {player.name}'s turn"
         else:
             self.game_message = f"It's your turn! Select a player to request a card."
             
-        log.info(f"Next player: {player.name}")
+        log_event(moves_log, logging.INFO, 'next_player', "Next player: {player}", player=player.name)
         return player
     
     def can_request_from_player(self, from_player, to_player):
@@ -231,9 +759,54 @@ class Game:
             return False
             
         # Player must have at least one card from the same family
-        card = Card(suit, rank)
-        family = card.get_family()
-        return player.has_card_of_family(family)
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        return card is not None and player.has_card_of_family(card.family)
+    
+    def _legal_masks(self, player_idx):
+        """Cached (wanted card mask, target seat mask) for a player
+        
+        The cache entry is keyed on the player's hand and on which opponents
+        still hold cards, so it is only rebuilt after one of those changes.
+        """
+        player = self.players[player_idx]
+        hand_mask = player.hand_mask()
+        team = player.team
+        targets = 0
+        for i, other in enumerate(self.players):
+            if other.team != team and other.hand:
+                targets |= 1 << i
+        entry = self.legal_moves_cache.get(player_idx)
+        if entry is None or entry[0] != hand_mask or entry[1] != targets:
+            # Only declarations change in_play_mask, and they take the whole
+            # family out of every hand, so a hand key covers it too
+            entry = self.legal_moves_cache[player_idx] = [hand_mask, targets,
+                                                          wanted_mask(hand_mask, self.in_play_mask), None]
+        return entry
+    
+    def legal_moves(self, player_idx):
+        """Every legal ask for a player, as a tuple of (target index, Card)
+        
+        A legal ask is for a card the player doesn't hold from a family they
+        hold a card of, put to an opponent who still has cards. The result
+        is cached per player (see _legal_masks); treat it as read-only.
+        """
+        entry = self._legal_masks(player_idx)
+        if entry[3] is None:
+            cards = list(BitmaskHand.from_mask(entry[2]))
+            targets = entry[1]
+            entry[3] = tuple((target, card) for target in range(len(self.players)) if targets >> target & 1
+                             for card in cards)
+        return entry[3]
+    
+    def legal_target_mask(self, player_idx):
+        """Seat bitmask of the players the player may legally ask for some card"""
+        _, targets, wanted, _ = self._legal_masks(player_idx)
+        return targets if wanted else 0
+    
+    def is_legal_move(self, player_idx, target_player_idx, card):
+        """Whether asking target_player_idx for card is legal, in O(1) on a cache hit"""
+        _, targets, wanted, _ = self._legal_masks(player_idx)
+        return bool(targets >> target_player_idx & 1 and wanted & card.bit)
     
     def handle_bot_turn(self):
         """Handle a bot's turn"""
@@ -262,30 +835,39 @@ class Game:
             self.game_message = f"You can only request cards from the other team!"
             return False
             
+        if not target.hand:
+            self.game_message = f"{target.name} has no cards left!"
+            return False
+            
         # Verify the card request is valid (same family, don't have it)
-        if not self.can_request_card(human, suit, rank):
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        if card is None or not self.is_legal_move(self.human_player_idx, target_player_idx, card):
             self.game_message = f"You can only request cards from families you already have!"
             return False
             
+        self.human_actions.append((self.turns, 'request', (target_player_idx, suit, rank)))
+        self.turns += 1
+        
         # Create a detailed message about the request
         request_message = f"YOU asked {target.name} for the {rank} of {suit}"
         self.game_message = request_message
-        log.info(f"{human.name} asks {target.name} for {rank} of {suit}")
+        log_event(moves_log, logging.INFO, 'human_request', "{player} asks {target} for {rank} of {suit}",
+                  player=human.name, target=target.name, rank=rank, suit=suit)
         
         # Check if target has the card
-        if target.has_card(suit, rank):
+        success = self.card_owners[card.ordinal] == target_player_idx
+        self.ask_history.append((self.human_player_idx, target_player_idx, card.ordinal, success))
+        if success:
             # Success! Get the card
-            card = target.remove_card(suit, rank)
-            if card:
-                human.add_card(card)
-                result_message = f"SUCCESS! You got the {rank} of {suit} from {target.name}"
-                self.game_message = result_message
-                
-                # Add a visual indicator for the new card
-                self.received_card = card
-                
-                # Don't change turn on success - player gets another turn
-                return True
+            self.transfer(card, self.human_player_idx)
+            result_message = f"SUCCESS! You got the {rank} of {suit} from {target.name}"
+            self.game_message = result_message
+            
+            # Add a visual indicator for the new card
+            self.received_card = card
+            
+            # Don't change turn on success - player gets another turn
+            return True
         
         fail_message = f"{target.name} doesn't have the {rank} of {suit}"
         self.game_message = fail_message
@@ -294,7 +876,294 @@ class Game:
         self.current_player_idx = target_player_idx
         return False
     
-    def make_declaration(self, family):
-        """Make a declaration for a complete family of cards"""
-        # TODO: Implement in a future update
-        pass 
\ No newline at end of file
+    def make_declaration(self, family, assignments, player_idx=None):
+        """Declare a family (e.g. "Low Hearts") for the declarer's team
+        
+        assignments maps each in-play Card of the family to the index of the
+        teammate claimed to hold it. It is checked against card_owners in
+        O(set size). A claim is correct only if the declarer's team holds
+        every card and each is assigned to its holder; it wins the set and
+        the declarer keeps the turn. A wrong claim gives the set to the other
+        team if they held any of its cards (naming its true holders doesn't
+        help), otherwise removes it without points, and the turn passes to
+        the next player. Either way the set's cards leave play.
+        
+        Returns True if the declaring team won the set.
+        """
+        if player_idx is None:
+            player_idx = self.current_player_idx
+        declarer = self.players[player_idx]
+        family_id = FAMILY_IDS.get(family)
+        
+        if player_idx != self.current_player_idx:
+            self.game_message = "It's not your turn!"
+            return False
+        if family_id is None or self.family_winners[family_id] is not None:
+            self.game_message = f"{family} is not a set that can be declared"
+            return False
+        if not declarer.hand_mask() & FAMILY_ID_MASKS[family_id]:
+            self.game_message = "You can only declare a set you hold a card from!"
+            return False
+        
+        if not declarer.is_bot:
+            self.human_actions.append((self.turns, 'declare', (family, dict(assignments))))
+            self.turns += 1
+        
+        team = declarer.team
+        correct = True
+        opponents_held = False
+        owners = self.card_owners
+        for card in FAMILY_CARDS[family_id]:
+            owner = owners[card.ordinal]
+            if owner == NO_OWNER:
+                continue
+            holder = self.players[owner]
+            if holder.team != team:
+                opponents_held = True
+                correct = False
+            if assignments.get(card) != owner:
+                correct = False
+            # The set leaves play whatever the outcome
+            holder.hand.remove(card)
+            owners[card.ordinal] = NO_OWNER
+            self.zobrist ^= ZOBRIST_CARD_KEYS[card.ordinal][owner]
+        self.in_play_mask &= ~FAMILY_ID_MASKS[family_id]
+        
+        if correct:
+            winner = team
+        elif opponents_held:
+            winner = 1 - team
+        else:
+            winner = NO_TEAM
+        self.family_winners[family_id] = winner
+        self.zobrist ^= ZOBRIST_FAMILY_KEYS[family_id][winner]
+        if winner != NO_TEAM:
+            self.scores[winner] += 1
+        
+        if not correct:
+            self.current_player_idx = (player_idx + 1) % len(self.players)
+        # A human can't take a turn without cards, so move the turn on
+        if not self.current_player.is_bot and not self.current_player.hand:
+            self.pass_turn()
+        
+        if not self.headless:
+            # Store the declaration outcome for the front ends
+            self.last_declaration = {
+                'player_idx': player_idx,
+                'family': family,
+                'success': correct,
+                'winner': winner
+            }
+            if correct:
+                message = f"{declarer.name} declared {family} correctly! {self.team_names[team]} wins the set"
+            elif winner != NO_TEAM:
+                message = f"{declarer.name} declared {family} wrongly. {self.team_names[winner]} wins the set"
+            else:
+                message = f"{declarer.name} declared {family} wrongly. The set is removed from play"
+            if self.is_over:
+                message += f". Game over: {self.team_names[0]} {self.scores[0]} - {self.scores[1]} {self.team_names[1]}"
+            self.game_message = message
+            log_event(moves_log, logging.INFO, 'declaration', "{player} declared {family}: {result}, set to {winner}",
+                      player=declarer.name, family=family, result="correct" if correct else "wrong",
+                      winner=self.team_names[winner] if winner != NO_TEAM else "nobody",
+                      scores=list(self.scores))
+        return correct
+    
+    def clone(self, rng=None):
+        """A copy of the game for lookahead
+        
+        Only mutable state is copied: card ownership, hands, turn, scores,
+        set winners and histories. Everything else, including the Card
+        flyweights and player metadata, is shared. The clone's rng is a copy
+        of this game's rng state unless an rng is passed in; copying the
+        state dominates the cost, so search code that brings its own Random
+        should pass it.
+        """
+        state = self.__dict__.copy()
+        state['players'] = [player.clone() for player in self.players]
+        state['card_owners'] = self.card_owners[:]
+        state['scores'] = self.scores[:]
+        state['family_winners'] = self.family_winners[:]
+        state['ask_history'] = self.ask_history[:]
+        state['human_actions'] = self.human_actions[:]
+        if self.bot_actions is not None:
+            state['bot_actions'] = self.bot_actions[:]
+        state['deck'] = self.deck[:]
+        state['legal_moves_cache'] = {}
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        state['rng'] = rng
+        game = object.__new__(Game)
+        game.__dict__ = state
+        return game
+    
+    def replay_record(self):
+        """Everything needed to replay this game with Game.replay
+        
+        Each team's bot class is recorded by name ("module.Class"), but not
+        the arguments it was made with (a search bot's time budget, say).
+        bot_actions holds every bot move if a bot's moves don't follow from
+        the seed (see Bot.REPLAYS_FROM_SEED), else None. Actions are
+        [turn, action, args] lists with declared cards given as [ordinal,
+        seat] pairs, so the record survives a round trip through JSON.
+        """
+        bot_classes = [None, None]
+        for player in self.players:
+            if player.is_bot and bot_classes[player.team] is None:
+                bot_classes[player.team] = f"{type(player).__module__}.{type(player).__qualname__}"
+        return {
+            'seed': self.seed,
+            'num_players': len(self.players),
+            'human_player_idx': self.human_player_idx,
+            'bot_classes': bot_classes,
+            'human_actions': [_action_record(action) for action in self.human_actions],
+            'bot_actions': None if self.bot_actions is None else
+                           [_action_record(action) for action in self.bot_actions],
+            'turns': self.turns,
+        }
+    
+    @classmethod
+    def replay(cls, record, headless=True, bot_classes=None):
+        """Rebuild a game from a replay_record, move for move
+        
+        Bots are made from the record's bot class names unless bot_classes
+        is given (needed when they took arguments, like MonteCarloBot's).
+        If the record has bot_actions, bots play those moves instead of
+        choosing their own.
+        """
+        if bot_classes is None:
+            bot_classes = tuple(_bot_class(name) for name in record.get('bot_classes') or (None, None))
+        game = cls(record['num_players'], human_player_idx=record['human_player_idx'],
+                   headless=headless, seed=record['seed'], bot_classes=bot_classes)
+        actions = iter(record['human_actions'])
+        bot_actions = record.get('bot_actions')
+        bot_actions = iter(bot_actions) if bot_actions is not None else None
+        while game.turns < record['turns']:
+            player = game.current_player
+            # A bot with no cards just passes, which takes no choosing
+            if player.is_bot and (bot_actions is None or not player.hand):
+                game.handle_bot_turn()
+                continue
+            turn, action, args = next(bot_actions if player.is_bot else actions)
+            if turn != game.turns:
+                raise ValueError(f"Replay diverged at turn {game.turns}")
+            if action == 'declare':
+                family, pairs = args
+                args = (family, {ORDINAL_CARDS[ordinal]: seat for ordinal, seat in pairs})
+            if player.is_bot:
+                game.turns += 1
+                seat = game.current_player_idx
+                if action == 'request':
+                    target_player_idx, suit, rank = args
+                    player.ask(game, seat, Card.of(suit, rank), target_player_idx)
+                else:
+                    player.declare(game, seat, *args)
+            elif action == 'request':
+                game.request_card(*args)
+            else:
+                game.make_declaration(*args)
+        return game
+    
+    def to_bytes(self):
+        """Snapshot the game in a compact binary format (79 bytes)
+        
+        Layout (little endian, see SNAPSHOT_HEADER): version, player count,
+        human seat (NO_OWNER if none), current seat, flags, turns, seed,
+        both scores, then one byte per family winner and one byte per card
+        owner (NO_OWNER for cards nobody holds). Hands, the in-play mask and
+        the undealt deck are all rebuilt from the owners on restore.
+        """
+        flags = (SNAPSHOT_COMPACT_HANDS if self.players[0].compact_hand else 0) | \
+                (SNAPSHOT_AUTO_PLAY if self.auto_play else 0)
+        human = NO_OWNER if self.human_player_idx is None else self.human_player_idx
+        winners = bytes(SNAPSHOT_WINNER_CODES[winner] for winner in self.family_winners)
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, len(self.players), human, self.current_player_idx,
+                                    flags, self.turns, self.seed, self.scores[0], self.scores[1]) \
+            + winners + bytes(self.card_owners)
+    
+    @classmethod
+    def from_bytes(cls, data, headless=True, bot_classes=None):
+        """Restore a game saved with to_bytes
+        
+        Bot classes aren't stored, so pass the same bot_classes the game was
+        created with. The human's action history and the ask history aren't
+        stored either, so a restored game can't produce a replay_record of
+        moves before the snapshot and bots start tracking cards afresh. Its
+        rng is reseeded from (seed, turns): play from a snapshot is
+        deterministic but doesn't follow the original game.
+        """
+        if len(data) != SNAPSHOT_SIZE or data[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a version {SNAPSHOT_VERSION} game snapshot")
+        (_, num_players, human, current, flags, turns, seed,
+         score_a, score_b) = SNAPSHOT_HEADER.unpack_from(data)
+        if num_players not in PLAYER_COUNTS:
+            raise ValueError(f"Snapshot has {num_players} players")
+        
+        game = cls.__new__(cls)
+        game.headless = headless
+        game.seed = seed
+        game.rng = random.Random((turns << 64) | seed)
+        game.seat_players(num_players, None if human == NO_OWNER else human,
+                          bool(flags & SNAPSHOT_COMPACT_HANDS), bot_classes)
+        game.current_player_idx = current
+        game.auto_play = bool(flags & SNAPSHOT_AUTO_PLAY)
+        game.turns = turns
+        game.human_actions = []
+        game.ask_history = []
+        game.legal_moves_cache = {}
+        game.scores = [score_a, score_b]
+        offset = SNAPSHOT_HEADER.size
+        game.family_winners = [SNAPSHOT_WINNERS[code] for code in data[offset:offset + len(Card.FAMILIES)]]
+        game.team_names = ["Team A", "Team B"]
+        
+        game.card_owners = owners = bytearray(data[offset + len(Card.FAMILIES):])
+        masks = [0] * num_players
+        for ordinal, owner in enumerate(owners):
+            if owner != NO_OWNER:
+                masks[owner] |= 1 << ordinal
+        for player, mask in zip(game.players, masks):
+            if player.compact_hand:
+                player.hand.mask = mask
+            else:
+                player.hand = list(BitmaskHand.from_mask(mask))
+        game.in_play_mask = in_play = sum(masks)
+        
+        # Undealt cards: out of play but in a family nobody has declared
+        declared = 0
+        for family_id, winner in enumerate(game.family_winners):
+            if winner is not None:
+                declared |= FAMILY_ID_MASKS[family_id]
+        game.deck = list(BitmaskHand.from_mask(((1 << len(ORDINAL_CARDS)) - 1) & ~(in_play | declared)))
+        game.zobrist = game.compute_zobrist()
+        
+        game.game_message = "Game restored."
+        return game
+
+def _bot_class(name):
+    """The Bot subclass a replay record names ("module.Class"), Bot for None"""
+    if name is None:
+        return Bot
+    module, _, qualname = name.rpartition('.')
+    bot_class = getattr(importlib.import_module(module), qualname, None)
+    if not isinstance(bot_class, type) or not issubclass(bot_class, Bot):
+        raise ValueError(f"{name} is not a bot class")
+    return bot_class
+
+def _action_record(action):
+    """A (turn, action, args) entry as JSON-friendly lists, with a
+    declaration's Card -> seat map as [ordinal, seat] pairs"""
+    turn, kind, args = action
+    if kind == 'declare':
+        family, assignments = args
+        args = (family, [[card.ordinal, seat] for card, seat in assignments.items()])
+    return [turn, kind, list(args)]
+
+# Snapshot format for Game.to_bytes / Game.from_bytes
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<BBBBBIQBB')
+SNAPSHOT_SIZE = SNAPSHOT_HEADER.size + len(Card.FAMILIES) + len(ORDINAL_CARDS)
+SNAPSHOT_COMPACT_HANDS = 1
+SNAPSHOT_AUTO_PLAY = 2
+SNAPSHOT_WINNER_CODES = {0: 0, 1: 1, NO_TEAM: 2, None: 3}
+SNAPSHOT_WINNERS = {code: winner for winner, code in SNAPSHOT_WINNER_CODES.items()}
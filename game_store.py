@@ -0,0 +1,172 @@
+"""
+Literature Card Game - Game Store
+A bounded map of live games that evicts idle and least recently used games,
+optionally spilling them to disk so they can be brought back on demand
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from game_logic import Game
+
+class GameStore(MutableMapping):
+    """Live games by game_id, bounded by count and idle time
+    
+    Reading a game (store[game_id] or store.get) marks it used. Games idle
+    for more than ttl_seconds are evicted whenever the store is touched, and
+    adding a game beyond max_games evicts the least recently used one.
+    Either limit can be None for no limit.
+    
+    With spill_dir set, an evicted game is written there as dump(game_id,
+    game) (by default its 79-byte Game.to_bytes snapshot) and read back with
+    load(game_id, data) the next time it is asked for; the file is removed
+    once the game is live again. Without it, evicted games are dropped.
+    on_evict(game_id) is called for every eviction, so callers can release
+    whatever else they keep per game.
+    
+    restore(game_id), if given, is asked for a game that is neither live nor
+    spilled (e.g. one saved by a GameDatabase before a restart); it returns
+    data for load, or None if it doesn't have the game either.
+    
+    stats() reports the live game count and counters for evictions (split
+    into expired and LRU), spills, rehydrations and restores.
+    """
+    def __init__(self, max_games=None, ttl_seconds=None, spill_dir=None, dump=None, load=None,
+                 on_evict=None, restore=None, clock=time.monotonic):
+        self.max_games = max_games
+        self.ttl_seconds = ttl_seconds
+        self.spill_dir = spill_dir
+        self.dump = dump or (lambda game_id, game: game.to_bytes())
+        self.load = load or (lambda game_id, data: Game.from_bytes(data, headless=False))
+        self.on_evict = on_evict
+        self.restore = restore
+        self.clock = clock
+        # game_id -> [game, last used], least recently used first
+        self.games = OrderedDict()
+        self.lock = threading.RLock()
+        self.expired = 0
+        self.lru_evictions = 0
+        self.spills = 0
+        self.rehydrations = 0
+        self.restores = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+    
+    def spill_path(self, game_id):
+        # game_ids come from clients, so keep them from naming other paths
+        return os.path.join(self.spill_dir, os.path.basename(str(game_id)) + '.game')
+    
+    def __getitem__(self, game_id):
+        with self.lock:
+            self.evict_expired()
+            entry = self.games.get(game_id)
+            if entry is None:
+                game = self._rehydrate(game_id)
+                if game is None:
+                    raise KeyError(game_id)
+                return game
+            entry[1] = self.clock()
+            self.games.move_to_end(game_id)
+            return entry[0]
+    
+    def __setitem__(self, game_id, game):
+        with self.lock:
+            self.evict_expired()
+            self.games[game_id] = [game, self.clock()]
+            self.games.move_to_end(game_id)
+            self._evict_over_limit()
+    
+    def __delitem__(self, game_id):
+        with self.lock:
+            if game_id in self.games:
+                del self.games[game_id]
+                return
+            if self.spill_dir and os.path.exists(self.spill_path(game_id)):
+                os.remove(self.spill_path(game_id))
+                return
+            raise KeyError(game_id)
+    
+    def __contains__(self, game_id):
+        """Whether the game is live or spilled, without loading it"""
+        with self.lock:
+            return game_id in self.games or bool(self.spill_dir) and os.path.exists(self.spill_path(game_id))
+    
+    def __iter__(self):
+        """The live games' ids (spilled games aren't listed)"""
+        with self.lock:
+            return iter(list(self.games))
+    
+    def __len__(self):
+        return len(self.games)
+    
+    def evict_expired(self):
+        """Evict every game idle for longer than ttl_seconds"""
+        if self.ttl_seconds is None:
+            return
+        with self.lock:
+            cutoff = self.clock() - self.ttl_seconds
+            games = self.games
+            # Least recently used first, so stop at the first fresh game
+            while games:
+                game_id, (_, last_used) = next(iter(games.items()))
+                if last_used > cutoff:
+                    break
+                self._evict(game_id)
+                self.expired += 1
+    
+    def _evict_over_limit(self):
+        if self.max_games is None:
+            return
+        while len(self.games) > self.max_games:
+            self._evict(next(iter(self.games)))
+            self.lru_evictions += 1
+    
+    def _evict(self, game_id):
+        game, _ = self.games.pop(game_id)
+        if self.spill_dir:
+            with open(self.spill_path(game_id), 'wb') as f:
+                f.write(self.dump(game_id, game))
+            self.spills += 1
+        if self.on_evict is not None:
+            self.on_evict(game_id)
+    
+    def _rehydrate(self, game_id):
+        """Load a spilled or restorable game back in, or None if there isn't one"""
+        data = None
+        if self.spill_dir:
+            path = self.spill_path(game_id)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                pass
+        if data is not None:
+            game = self.load(game_id, data)
+            os.remove(path)
+            self.rehydrations += 1
+        elif self.restore is not None:
+            data = self.restore(game_id)
+            if data is None:
+                return None
+            game = self.load(game_id, data)
+            self.restores += 1
+        else:
+            return None
+        self.games[game_id] = [game, self.clock()]
+        self._evict_over_limit()
+        return game
+    
+    def stats(self):
+        return {
+            'live_games': len(self.games),
+            'max_games': self.max_games,
+            'ttl_seconds': self.ttl_seconds,
+            'evictions': self.expired + self.lru_evictions,
+            'expired': self.expired,
+            'lru_evictions': self.lru_evictions,
+            'spills': self.spills,
+            'rehydrations': self.rehydrations,
+            'restores': self.restores,
+        }
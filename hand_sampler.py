@@ -0,0 +1,216 @@
+"""
+Literature Card Game - Hand Sampler
+Uniformly random deals of the cards one seat can't see, consistent with
+everything that seat has observed: hand sizes, cards known to be with a
+player and cards a player is known not to have
+"""
+from bisect import bisect_right
+from math import comb, factorial
+
+import numpy as np
+
+from game_logic import ORDINAL_CARDS, NO_OWNER
+
+def possible_holders(game, seat):
+    """Seat bitmasks of who could hold each card, as the seat sees it
+    
+    Built from the game's public state only: the seat's own hand and
+    game.ask_history, read the way KnowledgeBot reads it (a hit puts the
+    card with the asker, a miss rules out both the asker and the target).
+    """
+    others = ((1 << len(game.players)) - 1) & ~(1 << seat)
+    possible = [others] * len(ORDINAL_CARDS)
+    for card in game.players[seat].hand:
+        possible[card.ordinal] = 1 << seat
+    for asker, target, ordinal, success in game.ask_history:
+        if success:
+            possible[ordinal] = 1 << asker
+        else:
+            possible[ordinal] &= ~((1 << asker) | (1 << target))
+    return possible
+
+class HandSampler:
+    """Uniform sampler over the deals consistent with one seat's knowledge
+    
+    Cards pinned to one player (the seat's own hand, or a mask with a single
+    possible holder left) are placed first. The rest are grouped into
+    classes by their possible-holder mask; a deal is then fixed by how many
+    cards of each class every player gets, and each such split accounts for
+    a product of binomials worth of deals. Those counts are worked out once
+    per sampler, memoised on the capacities left, with the largest class
+    last so its split is forced. Drawing a deal walks the counts, picking
+    each split with probability proportional to the deals below it, so
+    every consistent deal is equally likely.
+    
+    Raises ValueError if no deal is consistent with the masks and hand sizes.
+    """
+    def __init__(self, card_owners, hand_sizes, possible, seat):
+        self.base = bytearray(card_owners)
+        capacity = list(hand_sizes)
+        capacity[seat] = 0
+        hidden = [ordinal for ordinal, owner in enumerate(self.base)
+                  if owner != NO_OWNER and owner != seat]
+        if len(hidden) != sum(capacity):
+            raise ValueError("hand sizes don't match the cards in play")
+        
+        # Pin cards with one possible holder until nothing changes, since
+        # pinning can fill a hand and narrow other masks down to one player
+        masks = {}
+        while True:
+            open_seats = 0
+            for i, count in enumerate(capacity):
+                if count:
+                    open_seats |= 1 << i
+            pinned = False
+            for ordinal in hidden:
+                mask = possible[ordinal] & open_seats
+                if not mask:
+                    raise ValueError(f"no player can hold {ORDINAL_CARDS[ordinal]}")
+                if not mask & (mask - 1):
+                    owner = mask.bit_length() - 1
+                    if not capacity[owner]:
+                        raise ValueError(f"{ORDINAL_CARDS[ordinal]} is pinned on a full hand")
+                    self.base[ordinal] = owner
+                    capacity[owner] -= 1
+                    pinned = True
+                else:
+                    masks[ordinal] = mask
+            if not pinned:
+                break
+            hidden = list(masks)
+            masks = {}
+        
+        self.players = [i for i, count in enumerate(capacity) if count]
+        slot = {seat_idx: i for i, seat_idx in enumerate(self.players)}
+        classes = {}
+        for ordinal, mask in masks.items():
+            classes.setdefault(mask, []).append(ordinal)
+        # Smallest classes first; the last one's split is forced
+        self.classes = sorted(((tuple(slot[i] for i in self.players if mask >> i & 1), cards)
+                               for mask, cards in classes.items()), key=lambda entry: len(entry[1]))
+        self.capacity = tuple(capacity[i] for i in self.players)
+        self.memo = {}
+        self.options = {}
+        self.total = self._count(0, 0, len(self.classes[0][1]) if self.classes else 0, self.capacity)
+        if not self.total:
+            raise ValueError("no deal is consistent with the hand sizes and known cards")
+    
+    @classmethod
+    def from_game(cls, game, seat, possible=None):
+        """A sampler for seat's view of game; possible defaults to what the
+        public state shows (see possible_holders)"""
+        if possible is None:
+            possible = possible_holders(game, seat)
+        return cls(game.card_owners, [len(p.hand) for p in game.players], possible, seat)
+    
+    def _count(self, class_idx, pos, left, capacity):
+        """Deals of the left cards of class class_idx among its players from
+        pos on, times the deals of every later class"""
+        classes = self.classes
+        if class_idx == len(classes):
+            return 1 if not any(capacity) else 0
+        key = (class_idx, pos, left, capacity)
+        memo = self.memo
+        if key in memo:
+            return memo[key]
+        
+        players, cards = classes[class_idx]
+        if class_idx == len(classes) - 1 and pos == 0:
+            # Last class: every remaining slot must be one of its cards
+            if sum(capacity) != left or any(capacity[i] for i in range(len(capacity)) if i not in players):
+                ways = 0
+            else:
+                ways = factorial(left)
+                for i in players:
+                    ways //= factorial(capacity[i])
+        elif pos == len(players):
+            ways = 0 if left else self._count(class_idx + 1, 0, self._class_size(class_idx + 1), capacity)
+        else:
+            player = players[pos]
+            ways = 0
+            for take in range(min(left, capacity[player]) + 1):
+                rest = capacity[:player] + (capacity[player] - take,) + capacity[player + 1:]
+                ways += comb(left, take) * self._count(class_idx, pos + 1, left - take, rest)
+        memo[key] = ways
+        return ways
+    
+    def _class_size(self, class_idx):
+        return len(self.classes[class_idx][1]) if class_idx < len(self.classes) else 0
+    
+    def _options(self, class_idx, pos, left, capacity):
+        """(cumulative deal counts, takes, capacities after) for how many of
+        the left cards the player at pos takes, cached per state"""
+        key = (class_idx, pos, left, capacity)
+        options = self.options.get(key)
+        if options is None:
+            player = self.classes[class_idx][0][pos]
+            cumulative, takes, rests = [], [], []
+            running = 0
+            for take in range(min(left, capacity[player]) + 1):
+                rest = capacity[:player] + (capacity[player] - take,) + capacity[player + 1:]
+                ways = comb(left, take) * self._count(class_idx, pos + 1, left - take, rest)
+                if ways:
+                    running += ways
+                    cumulative.append(running)
+                    takes.append(take)
+                    rests.append(rest)
+            options = self.options[key] = (cumulative, takes, rests)
+        return options
+    
+    def _split(self, rng):
+        """How many cards of each class go to each player, drawn with
+        probability proportional to the deals each split accounts for"""
+        classes = self.classes
+        capacity = self.capacity
+        splits = []
+        for class_idx, (players, cards) in enumerate(classes):
+            if class_idx == len(classes) - 1:
+                splits.append([capacity[player] for player in players])
+                break
+            left = len(cards)
+            counts = []
+            for pos in range(len(players)):
+                cumulative, takes, rests = self._options(class_idx, pos, left, capacity)
+                i = bisect_right(cumulative, rng.randrange(cumulative[-1]))
+                counts.append(takes[i])
+                left -= takes[i]
+                capacity = rests[i]
+            splits.append(counts)
+        return splits
+    
+    def sample(self, rng):
+        """One uniformly random consistent deal as a card_owners bytearray"""
+        owners = bytearray(self.base)
+        seats = self.players
+        for (players, cards), counts in zip(self.classes, self._split(rng)):
+            cards = list(cards)
+            rng.shuffle(cards)
+            start = 0
+            for player, count in zip(players, counts):
+                for ordinal in cards[start:start + count]:
+                    owners[ordinal] = seats[player]
+                start += count
+        return owners
+    
+    def sample_batch(self, k, rng):
+        """k uniformly random consistent deals as a (k, 52) uint8 array
+        
+        The splits are drawn one deal at a time; dealing the cards within
+        each class is done for all k deals at once with NumPy.
+        """
+        owners = np.tile(np.frombuffer(bytes(self.base), dtype=np.uint8), (k, 1))
+        if not self.classes:
+            return owners
+        splits = [self._split(rng) for _ in range(k)]
+        np_rng = np.random.default_rng(rng.getrandbits(64))
+        seats = np.array(self.players, dtype=np.uint8)
+        rows = np.arange(k)[:, None]
+        for class_idx, (players, cards) in enumerate(self.classes):
+            # Slot j of a deal goes to the first player whose running total exceeds j
+            counts = np.array([split[class_idx] for split in splits])
+            bounds = np.cumsum(counts, axis=1)
+            slots = np.arange(len(cards))
+            holder = (bounds[:, None, :] <= slots[None, :, None]).sum(axis=2)
+            order = np.argsort(np_rng.random((k, len(cards))), axis=1)
+            owners[rows, np.array(cards)[order]] = seats[np.array(players)[holder]]
+        return owners
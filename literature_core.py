@@ -82,26 +82,69 @@ def ensure_card_images():
 # ===================== GAME CLASSES =====================
 
 class Card:
-    """A simple playing card"""
+    """A playing card
+    
+    Cards are flyweights: the 52 instances are created once at import and
+    Card(suit, rank) / Card.of(suit, rank) return the interned instance.
+    """
     SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
     RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+    # In Literature, cards are grouped as:
+    # Low: A-7
+    # High: 8-K
+    LOW_RANKS = ['A', '2', '3', '4', '5', '6', '7']
+    FAMILIES = [f"{prefix} {suit}" for suit in SUITS for prefix in ("Low", "High")]
+    
+    __slots__ = ('suit', 'rank', 'ordinal', 'family_id', 'family', 'label')
+    
+    def __new__(cls, suit, rank):
+        return cls.of(suit, rank)
     
-    def __init__(self, suit, rank):
-        self.suit = suit
-        self.rank = rank
+    @staticmethod
+    def of(suit, rank):
+        """Return the interned card for suit and rank"""
+        try:
+            return _CARDS_BY_SUIT[suit][rank]
+        except KeyError:
+            raise ValueError(f"Invalid card: {rank} of {suit}") from None
+    
+    def __reduce__(self):
+        return (Card.of, (self.suit, self.rank))
     
     def __str__(self):
-        return f"{self.rank} of {self.suit}"
+        return self.label
     
     def get_family(self):
         """Get the card family (used for Literature game rules)"""
-        # In Literature, cards are grouped as:
-        # Low: A-7
-        # High: 8-K
-        if self.rank in ['A', '2', '3', '4', '5', '6', '7']:
-            return f"Low {self.suit}"
-        else:
-            return f"High {self.suit}"
+        return self.family
+
+def _build_card_table():
+    """Create the 52 interned cards in suit-major order"""
+    table = {}
+    for suit_idx, suit in enumerate(Card.SUITS):
+        for rank in Card.RANKS:
+            card = object.__new__(Card)
+            card.suit = suit
+            card.rank = rank
+            card.ordinal = len(table)
+            card.family_id = suit_idx * 2 + (0 if rank in Card.LOW_RANKS else 1)
+            card.family = Card.FAMILIES[card.family_id]
+            card.label = f"{rank} of {suit}"
+            table[(suit, rank)] = card
+    return table
+
+_CARD_TABLE = _build_card_table()
+# suit -> rank -> card, for lookups that don't build a (suit, rank) key
+_CARDS_BY_SUIT = {suit: {card.rank: card for card in _CARD_TABLE.values() if card.suit == suit}
+                  for suit in Card.SUITS}
+_NO_RANKS = {}
+
+# Cards of each family in rank order, built once for the card selection popup
+FAMILY_CARDS = {family: [card for card in _CARD_TABLE.values() if card.family == family]
+                for family in Card.FAMILIES}
+
+# Winner of a set declared wrongly with no opponent holding any of its cards
+NO_TEAM = -1
 
 class CardWidget(BoxLayout):
     """Widget to display a card with image or text fallback"""
@@ -149,22 +192,21 @@ class Player:
         
     def remove_card(self, suit, rank):
         """Remove a card from player's hand if it exists"""
-        for i, card in enumerate(self.hand):
-            if card.suit == suit and card.rank == rank:
-                return self.hand.pop(i)
-        return None
+        card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        try:
+            self.hand.remove(card)
+        except ValueError:
+            return None
+        return card
     
     def has_card(self, suit, rank):
         """Check if player has the specified card"""
-        for card in self.hand:
-            if card.suit == suit and card.rank == rank:
-                return True
-        return False
+        return _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank) in self.hand
     
     def has_card_of_family(self, family):
         """Check if player has any card of a specific family"""
         for card in self.hand:
-            if card.get_family() == family:
+            if card.family == family:
                 return True
         return False
 
@@ -204,13 +246,11 @@ class Bot(Player):
         # Check if target has the card
         if target_player.has_card(card.suit, card.rank):
             # Success! Get the card
-            target_card = target_player.remove_card(card.suit, card.rank)
-            if target_card:
-                self.add_card(target_card)
-                result_message = f"SUCCESS! {self.name} got the {card.rank} of {card.suit} from {target_player.name}"
-                game.game_message = result_message
-                log.info(result_message)
-                return True
+            game.transfer(card, game.players.index(self))
+            result_message = f"SUCCESS! {self.name} got the {card.rank} of {card.suit} from {target_player.name}"
+            game.game_message = result_message
+            log.info(result_message)
+            return True
         
         fail_message = f"{target_player.name} doesn't have the {card.rank} of {card.suit}"
         game.game_message = fail_message
@@ -239,6 +279,13 @@ class Game:
         # Team names
         self.team_names = ["Team A", "Team B"]
         
+        # Seat index holding each card by ordinal (None once out of play),
+        # sets won per team and the team that won each family (None while
+        # the family is still in play)
+        self.card_owners = [None] * len(_CARD_TABLE)
+        self.scores = [0, 0]
+        self.family_winners = [None] * len(Card.FAMILIES)
+        
         # Create and deal cards
         self.create_deck()
         self.deal_cards()
@@ -255,10 +302,7 @@ class Game:
     
     def create_deck(self):
         """Create a standard deck of cards"""
-        self.deck = []
-        for suit in Card.SUITS:
-            for rank in Card.RANKS:
-                self.deck.append(Card(suit, rank))
+        self.deck = list(_CARD_TABLE.values())
         
         random.shuffle(self.deck)
         log.info(f"Created and shuffled deck with {len(self.deck)} cards")
@@ -269,12 +313,19 @@ class Game:
         log.info(f"Dealing {cards_per_player} cards per player")
         
         for _ in range(cards_per_player):
-            for player in self.players:
+            for i, player in enumerate(self.players):
                 if self.deck:
                     card = self.deck.pop()
                     player.add_card(card)
+                    self.card_owners[card.ordinal] = i
                     log.info(f"Dealt {card} to {player.name}")
     
+    def transfer(self, card, to_player_idx):
+        """Move a card from its current holder to another player"""
+        self.players[self.card_owners[card.ordinal]].hand.remove(card)
+        self.players[to_player_idx].add_card(card)
+        self.card_owners[card.ordinal] = to_player_idx
+    
     @property
     def current_player(self):
         return self.players[self.current_player_idx]
@@ -283,6 +334,11 @@ class Game:
     def human_player(self):
         return self.players[self.human_player_idx]
     
+    @property
+    def is_over(self):
+        """True once every set has been declared"""
+        return all(winner is not None for winner in self.family_winners)
+    
     def can_request_from_player(self, from_player, to_player):
         """Check if a player can request from another player"""
         # Players must be on different teams
@@ -290,16 +346,16 @@ class Game:
     
     def can_request_card(self, player, suit, rank):
         """Check if a player can request a specific card"""
-        # Player must have at least one card of the same family
-        requested_card = Card(suit, rank)
-        requested_family = requested_card.get_family()
+        requested_card = _CARDS_BY_SUIT.get(suit, _NO_RANKS).get(rank)
+        if requested_card is None:
+            return False
         
         # Player must not already have the card
-        if player.has_card(suit, rank):
+        if requested_card in player.hand:
             return False
             
         # Player must have at least one card from the same family
-        return player.has_card_of_family(requested_family)
+        return player.has_card_of_family(requested_card.family)
     
     def next_player(self):
         """Move to the next player and handle bot turns"""
@@ -336,7 +392,7 @@ class Game:
             self.game_message = f"{self.current_player.name} didn't get a card."
         
         return result
-
+    
     def request_card(self, target_player_idx, suit, rank):
         """Human player requests a card from another player"""
         # Verify it's the human's turn
@@ -365,26 +421,87 @@ class Game:
         # Check if target has the card
         if target.has_card(suit, rank):
             # Success! Get the card
-            card = target.remove_card(suit, rank)
-            if card:
-                human.add_card(card)
-                result_message = f"SUCCESS! You got the {rank} of {suit} from {target.name}"
-                self.game_message = result_message
-                
-                # Add a visual indicator for the new card
-                self.received_card = card
-                
-                return True
+            card = Card.of(suit, rank)
+            self.transfer(card, self.human_player_idx)
+            result_message = f"SUCCESS! You got the {rank} of {suit} from {target.name}"
+            self.game_message = result_message
+            
+            # Add a visual indicator for the new card
+            self.received_card = card
+            
+            return True
         
         fail_message = f"{target.name} doesn't have the {rank} of {suit}"
         self.game_message = fail_message
         self.next_player()  # Move to next player after failed request
         return False
-
-    def make_declaration(self, family):
-        """Make a declaration for a complete family of cards"""
-        # TODO: Implement in a future update
-        pass
+    
+    def make_declaration(self, family, assignments, player_idx=None):
+        """Declare a family (e.g. "Low Hearts") for the declarer's team
+        
+        assignments maps each in-play Card of the family to the index of the
+        teammate claimed to hold it, checked against card_owners in O(set
+        size). A correct claim wins the set and the declarer keeps the turn.
+        A wrong one gives the set to the other team if they held any of its
+        cards, otherwise nobody scores it, and the turn passes on. Either
+        way the set's cards leave play.
+        
+        Returns True if the declaring team won the set.
+        """
+        if player_idx is None:
+            player_idx = self.current_player_idx
+        declarer = self.players[player_idx]
+        
+        if player_idx != self.current_player_idx:
+            self.game_message = "It's not your turn!"
+            return False
+        if family not in FAMILY_CARDS or self.family_winners[Card.FAMILIES.index(family)] is not None:
+            self.game_message = f"{family} is not a set that can be declared"
+            return False
+        if not declarer.has_card_of_family(family):
+            self.game_message = "You can only declare a set you hold a card from!"
+            return False
+        
+        team = declarer.team
+        correct = True
+        opponents_held = False
+        for card in FAMILY_CARDS[family]:
+            owner = self.card_owners[card.ordinal]
+            if owner is None:
+                continue
+            holder = self.players[owner]
+            if holder.team != team:
+                opponents_held = True
+                correct = False
+            if assignments.get(card) != owner:
+                correct = False
+            # The set leaves play whatever the outcome
+            holder.hand.remove(card)
+            self.card_owners[card.ordinal] = None
+        
+        if correct:
+            winner = team
+        elif opponents_held:
+            winner = 1 - team
+        else:
+            winner = NO_TEAM
+        self.family_winners[Card.FAMILIES.index(family)] = winner
+        if winner != NO_TEAM:
+            self.scores[winner] += 1
+        
+        if correct:
+            message = f"{declarer.name} declared {family} correctly! {self.team_names[team]} wins the set"
+        elif winner != NO_TEAM:
+            message = f"{declarer.name} declared {family} wrongly. {self.team_names[winner]} wins the set"
+        else:
+            message = f"{declarer.name} declared {family} wrongly. The set is removed from play"
+        if self.is_over:
+            message += f". Game over: {self.team_names[0]} {self.scores[0]} - {self.scores[1]} {self.team_names[1]}"
+        log.info(message)
+        if not correct:
+            self.next_player()
+        self.game_message = message
+        return correct
 
 # ===================== UI SCREENS =====================
 
@@ -410,22 +527,11 @@ class CardSelectionPopup(Popup):
         self.cards_grid = GridLayout(cols=1, spacing=5, size_hint_y=None)
         self.cards_grid.bind(minimum_height=self.cards_grid.setter('height'))
         
-        # Group cards by family
-        families = {}
-        for suit in Card.SUITS:
-            for prefix in ["Low", "High"]:
-                family = f"{prefix} {suit}"
-                families[family] = []
-                
-                ranks = ['A', '2', '3', '4', '5', '6', '7'] if prefix == "Low" else ['8', '9', '10', 'J', 'Q', 'K']
-                for rank in ranks:
-                    families[family].append((suit, rank))
-        
         # Add family sections
         app = App.get_running_app()
         human_player = app.game.human_player
         
-        for family, cards in families.items():
+        for family, cards in FAMILY_CARDS.items():
             # Only show families the player has at least one card from
             if human_player.has_card_of_family(family):
                 # Add family header
@@ -442,9 +548,10 @@ class CardSelectionPopup(Popup):
                 # Add card grid for this family
                 card_grid = GridLayout(cols=4, spacing=5)
                 
-                for suit, rank in cards:
+                for card in cards:
+                    suit, rank = card.suit, card.rank
                     # Skip cards the player already has
-                    if human_player.has_card(suit, rank):
+                    if card in human_player.hand:
                         card_btn = Button(
                             text=f"{rank} of {suit}\n(You have it)",
                             disabled=True,
@@ -726,7 +833,7 @@ class GamePlayScreen(Screen):
         
         # Short delay to show thinking
         Clock.schedule_once(lambda dt: self.perform_bot_action(), 1.5)
-
+    
     def perform_bot_action(self):
         """Perform the bot's action and show results"""
         app = App.get_running_app()
@@ -24,6 +24,16 @@ class Card:
             return False
         return self.rank == other.rank and self.suit == other.suit
     
+    def ordinal(self):
+        """Return the card's index (0-47) in suit-major deck order"""
+        return self.VALID_SUITS.index(self.suit) * len(self.VALID_RANKS) + self.VALID_RANKS.index(self.rank)
+    
+    @classmethod
+    def from_ordinal(cls, ordinal):
+        """Create the card with the given deck index"""
+        suit_idx, rank_idx = divmod(ordinal, len(cls.VALID_RANKS))
+        return cls(cls.VALID_RANKS[rank_idx], cls.VALID_SUITS[suit_idx])
+    
     def get_image_path(self):
         """Return the path to the card image"""
         # Convert face cards to abbreviations
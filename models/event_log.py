@@ -0,0 +1,74 @@
+from array import array
+
+class EventLog:
+    """Append-only game log stored as fixed-width columns
+    
+    Each event is one row across parallel array.array columns (type, actor,
+    target, card, success, turn), so appending is O(1) and a long game costs
+    six bytes per event. Rows are only turned into dicts when a client asks
+    for them, via the decoder passed in by the owner of the log.
+    """
+    
+    NO_VALUE = -1
+    COLUMNS = ('types', 'actors', 'targets', 'cards', 'successes', 'turns')
+    
+    def __init__(self, event_types, decoder=None):
+        """event_types lists the event type names; decoder(event_type, row)
+        turns a row tuple (actor, target, card, success, turn) into details"""
+        self.event_types = list(event_types)
+        self._type_ids = {name: i for i, name in enumerate(self.event_types)}
+        self.decoder = decoder
+        for column in self.COLUMNS:
+            setattr(self, column, array('b'))
+    
+    def append(self, event_type, actor=NO_VALUE, target=NO_VALUE, card=NO_VALUE,
+               success=NO_VALUE, turn=NO_VALUE):
+        """Add an event; success is stored as 1/0 (or NO_VALUE)"""
+        self.types.append(self._type_ids[event_type])
+        self.actors.append(actor)
+        self.targets.append(target)
+        self.cards.append(card)
+        self.successes.append(success if success == self.NO_VALUE else int(bool(success)))
+        self.turns.append(turn)
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        """One event as a dict, or a list of dicts for a slice"""
+        if isinstance(index, slice):
+            return [self._row_to_dict(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._row_to_dict(index)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._row_to_dict(i)
+    
+    def slice(self, start=0, stop=None):
+        """A new EventLog holding rows [start:stop], copied column by column"""
+        part = EventLog(self.event_types, self.decoder)
+        for column in self.COLUMNS:
+            setattr(part, column, getattr(self, column)[start:stop])
+        return part
+    
+    def to_dicts(self, start=0, stop=None):
+        """Rows [start:stop] as dicts in the original game_log format"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self._row_to_dict(i) for i in range(start, stop)]
+    
+    def page(self, page, page_size=50):
+        """One page of events (page 0 is the oldest) as dicts"""
+        start = page * page_size
+        return self.to_dicts(start, start + page_size)
+    
+    def _row_to_dict(self, i):
+        event_type = self.event_types[self.types[i]]
+        row = (self.actors[i], self.targets[i], self.cards[i], self.successes[i], self.turns[i])
+        details = self.decoder(event_type, row) if self.decoder else dict(zip(self.COLUMNS[1:], row))
+        return {
+            "action": event_type,
+            "details": details,
+            "turn": self.turns[i]
+        }
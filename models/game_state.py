@@ -1,5 +1,9 @@
 import random
 from models.card import Card
+from models.event_log import EventLog
+
+EVENT_TYPES = ["GAME_START", "CARD_REQUEST", "SET_DECLARATION", "GAME_OVER"]
+SET_NAMES = [f"{set_type} {suit}" for suit in Card.VALID_SUITS for set_type in ("Low", "High")]
 
 class GameState:
     """Represents the state of a Literature game"""
@@ -9,7 +13,7 @@ class GameState:
         self.current_turn = 0
         self.team1_sets = 0
         self.team2_sets = 0
-        self.game_log = []
+        self.game_log = EventLog(EVENT_TYPES, decoder=self._decode_event)
         self.game_over = False
     
     def create_deck(self):
@@ -38,10 +42,7 @@ class GameState:
             player.hand = deck[start:end]
         
         # Log the deal
-        self.add_to_log("GAME_START", {
-            "player_count": num_players,
-            "first_player": self.current_turn
-        })
+        self.add_to_log("GAME_START", actor=self.current_turn, target=num_players)
     
     def request_card(self, requesting_player, target_player, rank, suit):
         """Process a request for a card from another player"""
@@ -61,12 +62,8 @@ class GameState:
         target_has_card = target.has_card(rank, suit)
         
         # Log the request
-        self.add_to_log("CARD_REQUEST", {
-            "requester": requesting_player,
-            "target": target_player,
-            "card": {"rank": rank, "suit": suit},
-            "success": target_has_card
-        })
+        self.add_to_log("CARD_REQUEST", actor=requesting_player, target=target_player,
+                        card=self._card_ordinal(rank, suit), success=target_has_card)
         
         if target_has_card:
             # Find the card object
@@ -135,11 +132,9 @@ class GameState:
                 break
         
         # Log the declaration
-        self.add_to_log("SET_DECLARATION", {
-            "player": declaring_player,
-            "set": set_name,
-            "success": all_correct
-        })
+        self.add_to_log("SET_DECLARATION", actor=declaring_player,
+                        card=SET_NAMES.index(set_name) if set_name in SET_NAMES else EventLog.NO_VALUE,
+                        success=all_correct)
         
         # Update game state based on result
         if all_correct:
@@ -163,11 +158,8 @@ class GameState:
             # Check for game end
             if self.team1_sets + self.team2_sets == 8:  # All 8 sets collected
                 self.game_over = True
-                self.add_to_log("GAME_OVER", {
-                    "team1_sets": self.team1_sets,
-                    "team2_sets": self.team2_sets,
-                    "winning_team": 1 if self.team1_sets > self.team2_sets else 2
-                })
+                self.add_to_log("GAME_OVER", actor=1 if self.team1_sets > self.team2_sets else 2,
+                                target=self.team1_sets, card=self.team2_sets)
             
             return True, declaring_team
         else:
@@ -181,11 +173,8 @@ class GameState:
             # Check for game end
             if self.team1_sets + self.team2_sets == 8:  # All 8 sets collected
                 self.game_over = True
-                self.add_to_log("GAME_OVER", {
-                    "team1_sets": self.team1_sets,
-                    "team2_sets": self.team2_sets,
-                    "winning_team": 1 if self.team1_sets > self.team2_sets else 2
-                })
+                self.add_to_log("GAME_OVER", actor=1 if self.team1_sets > self.team2_sets else 2,
+                                target=self.team1_sets, card=self.team2_sets)
             
             # Transfer turn to a player on the opposite team
             opposite_team_players = [p for p in range(len(self.players)) if p % 2 == opposing_team]
@@ -194,10 +183,49 @@ class GameState:
             
             return False, opposing_team
     
-    def add_to_log(self, action_type, details):
-        """Add an entry to the game log"""
-        self.game_log.append({
-            "action": action_type,
-            "details": details,
-            "turn": self.current_turn
-        }) 
\ No newline at end of file
+    def add_to_log(self, action_type, actor=EventLog.NO_VALUE, target=EventLog.NO_VALUE,
+                   card=EventLog.NO_VALUE, success=EventLog.NO_VALUE):
+        """Add an entry to the game log
+        
+        Column meaning per event type:
+            GAME_START: actor=first_player, target=player_count
+            CARD_REQUEST: actor=requester, target=target, card=card ordinal, success
+            SET_DECLARATION: actor=player, card=set index in SET_NAMES, success
+            GAME_OVER: actor=winning_team, target=team1_sets, card=team2_sets
+        """
+        self.game_log.append(action_type, actor, target, card, success, self.current_turn)
+    
+    def get_log(self, page=None, page_size=50):
+        """Return the game log as dicts, either whole or one page at a time"""
+        if page is None:
+            return self.game_log.to_dicts()
+        return self.game_log.page(page, page_size)
+    
+    @staticmethod
+    def _card_ordinal(rank, suit):
+        """Deck index of a requested card, or NO_VALUE if it isn't a valid card"""
+        if rank not in Card.VALID_RANKS or suit not in Card.VALID_SUITS:
+            return EventLog.NO_VALUE
+        return Card(rank, suit).ordinal()
+    
+    @staticmethod
+    def _decode_event(action_type, row):
+        """Turn a stored log row back into the details dict clients expect"""
+        actor, target, card, success, _ = row
+        if action_type == "GAME_START":
+            return {"player_count": target, "first_player": actor}
+        if action_type == "CARD_REQUEST":
+            card_obj = Card.from_ordinal(card) if card != EventLog.NO_VALUE else None
+            return {
+                "requester": actor,
+                "target": target,
+                "card": {"rank": card_obj.rank, "suit": card_obj.suit} if card_obj else None,
+                "success": bool(success)
+            }
+        if action_type == "SET_DECLARATION":
+            return {
+                "player": actor,
+                "set": SET_NAMES[card] if card != EventLog.NO_VALUE else None,
+                "success": bool(success)
+            }
+        return {"team1_sets": target, "team2_sets": card, "winning_team": actor}
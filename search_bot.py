@@ -0,0 +1,405 @@
+"""
+Literature Card Game - Search Bot
+Information-set Monte Carlo bot: samples hidden hands consistent with what
+the bot knows, plays each candidate ask out with fast random rollouts and
+picks the ask with the best average result, within a wall-clock budget
+"""
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from endgame import EndgameSolver
+from hand_sampler import HandSampler
+from game_logic import (Bot, Game, KnowledgeBot, FAMILY_CARDS, FAMILY_ID_MASKS, ORDINAL_CARDS,
+                        NO_OWNER, SNAPSHOT_HEADER, wanted_mask)
+
+# Byte offsets into a Game.to_bytes snapshot
+_HUMAN_OFFSET = 2
+_OWNERS_OFFSET = SNAPSHOT_HEADER.size + len(FAMILY_ID_MASKS)
+
+# Rollouts play on with random bots, capped at ROLLOUT_MOVES as a safety net
+ROLLOUT_BOTS = (Bot, Bot)
+ROLLOUT_MOVES = 2000
+
+def sample_owners(card_owners, hand_sizes, possible, seat, rng, sampler=None):
+    """A copy of card_owners with every card the seat can't see dealt at random
+    
+    The deal is drawn uniformly from those that keep every player's hand
+    size and respect the possible-holder masks (see HandSampler; pass one
+    built for the same position to skip setting it up again). If the masks
+    can't all be met, the cards are dealt by hand size alone.
+    """
+    try:
+        if sampler is None:
+            sampler = HandSampler(card_owners, hand_sizes, possible, seat)
+        return sampler.sample(rng)
+    except ValueError:
+        owners = bytearray(card_owners)
+        hidden = [ordinal for ordinal, owner in enumerate(owners) if owner != NO_OWNER and owner != seat]
+        rng.shuffle(hidden)
+        slots = [i for i, count in enumerate(hand_sizes) if i != seat for _ in range(count)]
+        for ordinal, owner in zip(hidden, slots):
+            owners[ordinal] = owner
+        return owners
+
+def play_rollout(snapshot, owners, seat, team, ordinal, target, rng):
+    """Play one determinized game from the seat's ask to the end, returning
+    the team's set margin. snapshot is a bytearray from Game.to_bytes."""
+    snapshot[_OWNERS_OFFSET:] = owners
+    game = Game.from_bytes(snapshot, bot_classes=ROLLOUT_BOTS)
+    game.rng = rng
+    if game.card_owners[ordinal] == target:
+        game.transfer(ORDINAL_CARDS[ordinal], seat)
+    else:
+        game.current_player_idx = target
+    
+    moves = 0
+    while moves < ROLLOUT_MOVES and not game.is_over:
+        game.current_player.take_turn(game)
+        moves += 1
+    return game.scores[team] - game.scores[1 - team]
+
+def run_rollouts(snapshot, hand_sizes, possible, seat, team, asks, rng, deadline=None, max_rollouts=None):
+    """Evaluate (card ordinal, target) asks until time.time() passes deadline
+    or max_rollouts is reached. Returns (totals, visits, rollouts) with one
+    total and visit count per ask.
+    
+    Every ask is played on the same sampled deal before the next deal is
+    drawn, so asks are compared like for like.
+    """
+    snapshot = bytearray(snapshot)
+    totals = [0] * len(asks)
+    visits = [0] * len(asks)
+    rollouts = 0
+    owners = None
+    try:
+        sampler = HandSampler(snapshot[_OWNERS_OFFSET:], hand_sizes, possible, seat)
+    except ValueError:
+        sampler = None
+    while True:
+        if max_rollouts is not None and rollouts >= max_rollouts:
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+        index = rollouts % len(asks)
+        if index == 0:
+            owners = sample_owners(snapshot[_OWNERS_OFFSET:], hand_sizes, possible, seat, rng, sampler)
+        ordinal, target = asks[index]
+        totals[index] += play_rollout(snapshot, owners, seat, team, ordinal, target, rng)
+        visits[index] += 1
+        rollouts += 1
+    return totals, visits, rollouts
+
+# Set in each pool worker by _init_worker
+_start_barrier = None
+
+def _init_worker(barrier):
+    global _start_barrier
+    _start_barrier = barrier
+
+def _warm_up(timeout):
+    # A worker waiting here can't take another warm-up task, so the barrier
+    # only opens once every worker holds one
+    _start_barrier.wait(timeout)
+    return os.getpid()
+
+def _rollout_worker(snapshot, hand_sizes, possible, seat, team, asks, seed, deadline, max_rollouts):
+    return run_rollouts(snapshot, hand_sizes, possible, seat, team, asks, random.Random(seed),
+                        deadline, max_rollouts)
+
+class RolloutPool:
+    """A persistent process pool for search bots' rollouts
+    
+    Workers are started up front and reused for every search. A search
+    ships each worker only the 79-byte game snapshot, hand sizes, the
+    possible-holder masks and the candidate asks; each worker samples its
+    own deals with its own seed and runs rollouts until the shared deadline,
+    and the visit statistics are summed. Several bots (or games) can share
+    one pool. Use as a context manager, or call close().
+    """
+    # Extra time allowed past the deadline for results to come back
+    GRACE_SECONDS = 0.05
+    # Longest to wait for every worker to be up
+    START_TIMEOUT = 30
+    
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(multiprocessing.Barrier(self.workers),))
+        # Start every worker now rather than during the first search
+        self.pids = set(future.result() for future in
+                        [self.executor.submit(_warm_up, self.START_TIMEOUT) for _ in range(self.workers)])
+    
+    def run(self, snapshot, hand_sizes, possible, seat, team, asks, seed, budget=None, max_rollouts=None):
+        """Spread run_rollouts over the workers for budget seconds (or
+        max_rollouts in total) and merge the results the same way"""
+        deadline = time.time() + budget if budget is not None else None
+        if max_rollouts is not None:
+            # Whole rounds of asks per worker, so every ask shares each deal
+            rounds = -(-max_rollouts // len(asks))
+            quotas = [(rounds * (i + 1) // self.workers - rounds * i // self.workers) * len(asks)
+                      for i in range(self.workers)]
+        else:
+            quotas = [None] * self.workers
+        futures = [self.executor.submit(_rollout_worker, snapshot, hand_sizes, possible, seat, team,
+                                        asks, seed + i, deadline, quota)
+                   for i, quota in enumerate(quotas) if quota != 0]
+        done, not_done = wait(futures, timeout=budget + self.GRACE_SECONDS if budget is not None else None)
+        for future in not_done:
+            future.cancel()
+        
+        totals = [0] * len(asks)
+        visits = [0] * len(asks)
+        rollouts = 0
+        for future in done:
+            part_totals, part_visits, part_rollouts = future.result()
+            for i in range(len(asks)):
+                totals[i] += part_totals[i]
+                visits[i] += part_visits[i]
+            rollouts += part_rollouts
+        return totals, visits, rollouts
+    
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class MonteCarloBot(KnowledgeBot):
+    """KnowledgeBot that chooses its asks by Monte Carlo search
+    
+    Each rollout samples a deal of the cards the bot can't see (respecting
+    hand sizes and the possible-holder masks), makes one candidate ask in a
+    headless copy of the game and plays the rest with random Bots. The
+    result is the bot's team's final set margin. Candidates are tried in
+    turn until time_budget_ms runs out (or max_rollouts, if given), and the
+    best average so far is always available, so the search can stop at any
+    point. With no rollouts done the bot falls back to KnowledgeBot's ask.
+    Pass a RolloutPool as pool to spread the rollouts over worker processes.
+    
+    Certain declarations, turns with nothing to ask and turns where no
+    card is narrowed down to a couple of holders are left to KnowledgeBot.
+    Stats for the last search are kept in last_search.
+    
+    Once at most endgame_uncertainty live cards have more than one possible
+    holder, the bot switches to the exact EndgameSolver instead: it solves
+    ENDGAME_SAMPLES sampled deals (just one when nothing is uncertain) and
+    plays the move most of them pick. If the solver runs out of its node or
+    time budget the bot carries on as above. The last result is kept in
+    last_endgame.
+    
+    time_budget_ms covers the whole turn: the solver gets up to
+    ENDGAME_SHARE of it and the search whatever is left.
+    """
+    TIME_BUDGET_MS = 50
+    # The search stops on the clock, so replays need the bot's moves
+    REPLAYS_FROM_SEED = False
+    # Cards any more opponents could hold are left to KnowledgeBot's rule:
+    # early on there are too many of them to sample well within the budget
+    MAX_CANDIDATE_HOLDERS = 2
+    ENDGAME_UNCERTAINTY = 2
+    ENDGAME_SAMPLES = 8
+    ENDGAME_MAX_NODES = 50_000
+    ENDGAME_SHARE = 0.5
+    
+    def __init__(self, name, team=0, compact_hand=False, time_budget_ms=None, max_rollouts=None, pool=None,
+                 endgame_uncertainty=None, endgame_max_nodes=None):
+        super().__init__(name, team=team, compact_hand=compact_hand)
+        self.time_budget_ms = self.TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+        self.max_rollouts = max_rollouts
+        self.pool = pool
+        self.search_rng = None
+        self.last_search = None
+        self.endgame_uncertainty = self.ENDGAME_UNCERTAINTY if endgame_uncertainty is None else endgame_uncertainty
+        self.solver = EndgameSolver(self.ENDGAME_MAX_NODES if endgame_max_nodes is None else endgame_max_nodes,
+                                    self.time_budget_ms)
+        self.endgame_move = None
+        self.last_endgame = None
+        # perf_counter() time the current turn must end by, set by take_turn
+        self.turn_deadline = None
+    
+    def clone(self):
+        # Searching or solving in a cloned game mustn't move this bot's
+        # random stream, memo or planned move, so the clone gets its own
+        clone = super().clone()
+        clone.search_rng = None
+        clone.solver = EndgameSolver(self.solver.max_nodes, self.solver.time_budget_ms)
+        clone.endgame_move = None
+        return clone
+    
+    def remaining_ms(self):
+        """Milliseconds left of the turn's time budget, or None without one"""
+        if self.time_budget_ms is None:
+            return None
+        if self.turn_deadline is None:
+            return self.time_budget_ms
+        return max(0.0, (self.turn_deadline - time.perf_counter()) * 1000)
+    
+    def uncertainty(self, game):
+        """How many live cards could still be with more than one player"""
+        holding = 0
+        for i, player in enumerate(game.players):
+            if player.hand:
+                holding |= 1 << i
+        possible = self.possible
+        count = 0
+        for ordinal, owner in enumerate(game.card_owners):
+            if owner != NO_OWNER:
+                holders = possible[ordinal] & holding
+                if holders & (holders - 1):
+                    count += 1
+        return count
+    
+    def plan_endgame(self, game, seat):
+        """The solver's move for this turn, as ('declare', family_id,
+        assignments) or ('ask', target, card), or None if the position is
+        still too uncertain or no deal could be solved within budget"""
+        uncertain = self.uncertainty(game)
+        if uncertain > self.endgame_uncertainty:
+            return None
+        if self.search_rng is None:
+            self.search_rng = random.Random(game.rng.getrandbits(64))
+        
+        votes = {}
+        assignments = {}
+        solved = nodes = 0
+        start = time.perf_counter()
+        remaining = self.remaining_ms()
+        budget_ms = remaining * self.ENDGAME_SHARE if remaining is not None else None
+        try:
+            sampler = HandSampler.from_game(game, seat, self.possible)
+        except ValueError:
+            sampler = None
+        for _ in range(self.ENDGAME_SAMPLES if uncertain else 1):
+            # All the solves share the endgame's part of the turn
+            if budget_ms is not None:
+                remaining = budget_ms - (time.perf_counter() - start) * 1000
+                if remaining <= 0:
+                    break
+                self.solver.time_budget_ms = remaining
+            owners = self.sample_owners(game, seat, self.search_rng, sampler)
+            result = self.solver.solve(game, owners)
+            if result is None or result['move'] is None:
+                continue
+            solved += 1
+            nodes += result['nodes']
+            move = result['move']
+            votes[move] = votes.get(move, 0) + 1
+            if move[0] == 'declare' and move not in assignments:
+                assignments[move] = {card: owners[card.ordinal] for card in FAMILY_CARDS[move[1]]
+                                     if owners[card.ordinal] != NO_OWNER}
+        
+        self.last_endgame = {
+            'uncertainty': uncertain,
+            'solved': solved,
+            'nodes': nodes,
+            'seconds': time.perf_counter() - start,
+        }
+        if not votes:
+            return None
+        move = max(votes, key=votes.get)
+        if move[0] == 'declare':
+            return move + (assignments[move],)
+        return move
+    
+    def candidate_asks(self, game):
+        """(card, target) asks worth searching: cards that at most
+        MAX_CANDIDATE_HOLDERS opponents could hold, asked of each of them"""
+        wanted = wanted_mask(self.hand_mask(), game.in_play_mask)
+        _, opponents = self.team_masks(game)
+        
+        asks = []
+        while wanted:
+            low = wanted & -wanted
+            wanted ^= low
+            ordinal = low.bit_length() - 1
+            holders = self.possible[ordinal] & opponents
+            if holders and holders.bit_count() <= self.MAX_CANDIDATE_HOLDERS:
+                for target in range(len(game.players)):
+                    if holders >> target & 1:
+                        asks.append((ORDINAL_CARDS[ordinal], target))
+        return asks
+    
+    def sample_owners(self, game, seat, rng, sampler=None):
+        """A card_owners bytearray with the hidden cards dealt at random"""
+        return sample_owners(game.card_owners, [len(p.hand) for p in game.players], self.possible, seat, rng,
+                             sampler)
+    
+    def search(self, game, seat, asks):
+        """Run rollouts until what is left of the turn's budget is spent;
+        returns {ask: [total, visits]}
+        
+        Rollouts run in this process, or across self.pool if one is set.
+        """
+        if self.search_rng is None:
+            self.search_rng = random.Random(game.rng.getrandbits(64))
+        rng = self.search_rng
+        snapshot = bytearray(game.to_bytes())
+        snapshot[_HUMAN_OFFSET] = NO_OWNER
+        hand_sizes = [len(p.hand) for p in game.players]
+        packed_asks = [(card.ordinal, target) for card, target in asks]
+        remaining = self.remaining_ms()
+        budget = remaining / 1000 if remaining is not None else None
+        
+        start = time.perf_counter()
+        if self.pool is not None:
+            totals, visits, rollouts = self.pool.run(bytes(snapshot), hand_sizes, self.possible, seat, self.team,
+                                                     packed_asks, rng.getrandbits(64), budget, self.max_rollouts)
+        else:
+            deadline = time.time() + budget if budget is not None else None
+            totals, visits, rollouts = run_rollouts(snapshot, hand_sizes, self.possible, seat, self.team,
+                                                    packed_asks, rng, deadline, self.max_rollouts)
+        elapsed = time.perf_counter() - start
+        
+        stats = {ask: [total, count] for ask, total, count in zip(asks, totals, visits)}
+        self.last_search = {
+            'rollouts': rollouts,
+            'seconds': elapsed,
+            'rollouts_per_second': rollouts / elapsed if elapsed else 0.0,
+            'workers': self.pool.workers if self.pool is not None else 1,
+            'stats': stats,
+        }
+        return stats
+    
+    def take_turn(self, game):
+        self.endgame_move = None
+        if self.time_budget_ms is not None:
+            self.turn_deadline = time.perf_counter() + self.time_budget_ms / 1000
+        try:
+            if self.hand:
+                self.observe(game, game.current_player_idx)
+                self.endgame_move = self.plan_endgame(game, game.current_player_idx)
+            return super().take_turn(game)
+        finally:
+            self.turn_deadline = None
+    
+    def choose_declaration(self, game):
+        move = self.endgame_move
+        if move is not None:
+            return move[1] if move[0] == 'declare' else None
+        return super().choose_declaration(game)
+    
+    def declaration_assignments(self, game, family_id, seat):
+        move = self.endgame_move
+        if move is not None and move[0] == 'declare' and move[1] == family_id:
+            return move[2]
+        return super().declaration_assignments(game, family_id, seat)
+    
+    def choose_request(self, game):
+        move = self.endgame_move
+        if move is not None and move[0] == 'ask':
+            return move[2], move[1]
+        asks = self.candidate_asks(game)
+        if len(asks) <= 1:
+            return asks[0] if asks else super().choose_request(game)
+        
+        stats = self.search(game, game.current_player_idx, asks)
+        visited = [ask for ask in asks if stats[ask][1]]
+        if not visited:
+            return super().choose_request(game)
+        return max(visited, key=lambda ask: stats[ask][0] / stats[ask][1])
@@ -3,11 +3,12 @@ Literature Card Game - Web Server
 Runs the game logic and serves the web interface
 """
 import os
-import random
 import logging
 import json
+import struct
+import atexit
 from flask import Flask, render_template, request, jsonify, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
 import uuid
 from datetime import datetime
 
@@ -30,16 +31,124 @@ app.config['SECRET_KEY'] = 'literature-game-secret'
 socketio = SocketIO(app)
 
 # Import the game logic
-from game_logic import Card, Player, Bot, Game
+from game_logic import Card, Player, Bot, Game, BitmaskHand, FAMILY_IDS, PLAYER_COUNTS
+from turn_scheduler import TurnScheduler
+from game_store import GameStore
+from game_db import GameDatabase
+import engine_log
 
-# Store active games
-active_games = {}
+# Engine log levels per subsystem, e.g. ENGINE_LOG_LEVELS="bots=WARNING,moves=INFO",
+# and the fraction of bot turn records to keep, e.g. ENGINE_LOG_SAMPLE_BOTS=0.1
+engine_log.configure(
+    levels=dict(item.split('=') for item in os.environ.get('ENGINE_LOG_LEVELS', '').split(',') if item),
+    sample={'bots': float(os.environ['ENGINE_LOG_SAMPLE_BOTS'])} if 'ENGINE_LOG_SAMPLE_BOTS' in os.environ else None
+)
+
+# Bots seated in new games. BOT_TIME_BUDGET_MS switches to the Monte Carlo
+# search bot, thinking for at most that long per ask.
+BOT_CLASSES = None
+if os.environ.get('BOT_TIME_BUDGET_MS'):
+    from functools import partial
+    from search_bot import MonteCarloBot
+    # BOT_ROLLOUT_WORKERS spreads the search bots' rollouts over that many processes
+    _rollout_pool = None
+    if os.environ.get('BOT_ROLLOUT_WORKERS'):
+        from search_bot import RolloutPool
+        _rollout_pool = RolloutPool(int(os.environ['BOT_ROLLOUT_WORKERS']))
+    _search_bot = partial(MonteCarloBot, time_budget_ms=float(os.environ['BOT_TIME_BUDGET_MS']),
+                          pool=_rollout_pool)
+    BOT_CLASSES = (_search_bot, _search_bot)
+
+# Bot turns for every game run from this scheduler's one background task.
+# A bot announces it is thinking, plays THINK_SECONDS later, and the next
+# bot (with auto-play on) starts NEXT_TURN_SECONDS after that.
+scheduler = TurnScheduler(socketio)
+THINK_SECONDS = 1.5
+NEXT_TURN_SECONDS = 2
+
+# What each game's room was last sent: game_id -> [version, state_key(game)].
+# Changes go out as 'game_patch' events numbered by version; a client sees a
+# full 'game_updated' state only when it joins or reports a version gap.
+state_versions = {}
+
+def dump_game(game_id, game):
+    """A game as its patch version followed by its snapshot, as spilled and
+    saved to the game database"""
+    version = state_versions.get(game_id)
+    return struct.pack('<I', version[0] if version else 0) + game.to_bytes()
+
+def load_game(game_id, data):
+    """Bring back a game saved by dump_game, with its ask history from the
+    game database, picking up its bot turns again"""
+    game = Game.from_bytes(data[4:], headless=False, bot_classes=BOT_CLASSES)
+    if game_db is not None:
+        # The snapshot leaves out the asks, which KnowledgeBot and the hand
+        # sampler infer hands from: replay them from the logged moves
+        game.ask_history = [(player, target, ordinal, success)
+                            for kind, player, target, ordinal, success in game_db.moves(game_id) if kind == 'ask']
+    # Patches carry on from the old version, starting with the whole state
+    state_versions[game_id] = [struct.unpack_from('<I', data)[0], None]
+    if game.auto_play and not game.is_over and game.current_player.is_bot:
+        schedule_bot_turn(game_id)
+    return game
+
+# GAME_DB_PATH keeps every game's latest snapshot and its moves in that
+# SQLite file, committed in batches every GAME_DB_FLUSH_MS by a background
+# writer. After a restart, games come back one by one as they are asked for.
+game_db = None
+if os.environ.get('GAME_DB_PATH'):
+    game_db = GameDatabase(os.environ['GAME_DB_PATH'], flush_ms=float(os.environ.get('GAME_DB_FLUSH_MS', 50)))
+    atexit.register(game_db.close)
+
+def save_game(game_id, game):
+    """Queue the game's snapshot for the game database, if there is one"""
+    if game_db is not None:
+        game_db.save_game(game_id, dump_game(game_id, game))
+
+def record_ask(game_id, game):
+    """Queue the game's latest ask for the game database"""
+    if game_db is not None and game.ask_history:
+        asker, target, ordinal, success = game.ask_history[-1]
+        game_db.log_move(game_id, 'ask', asker, target, ordinal, success)
+
+def record_declaration(game_id, game, player_idx, family, success):
+    """Queue a declaration for the game database, if it settled the set"""
+    if game_db is None or family not in FAMILY_IDS or game.family_winners[FAMILY_IDS[family]] is None:
+        return
+    game_db.log_move(game_id, 'declare', player_idx, None, FAMILY_IDS[family], success)
+
+def forget_game(game_id):
+    """Drop what the server keeps for a game besides the game itself"""
+    state_versions.pop(game_id, None)
+    scheduler.cancel(game_id)
+
+# Store active games. Each game's events go to a Socket.IO room named
+# after its game_id, joined on create_game and rejoin_game.
+# At most MAX_ACTIVE_GAMES stay live and any idle for GAME_IDLE_SECONDS are
+# evicted; with GAME_SPILL_DIR set, evicted games are written there and
+# brought back when a player returns (e.g. with rejoin_game).
+active_games = GameStore(
+    max_games=int(os.environ.get('MAX_ACTIVE_GAMES', 10000)),
+    ttl_seconds=float(os.environ.get('GAME_IDLE_SECONDS', 3600)),
+    spill_dir=os.environ.get('GAME_SPILL_DIR') or None,
+    dump=dump_game, load=load_game, on_evict=forget_game,
+    restore=game_db.load_game if game_db is not None else None
+)
 
 @app.route('/')
 def index():
     """Serve the main game page"""
     return render_template('index.html')
 
+@app.route('/stats')
+def stats():
+    """Live game count, eviction and rehydration counters and, with a game
+    database, its write counters"""
+    stats = active_games.stats()
+    if game_db is not None:
+        stats['database'] = game_db.stats()
+    return jsonify(stats)
+
 @app.route('/assets/<path:path>')
 def send_assets(path):
     """Serve card images and other assets"""
@@ -50,13 +159,18 @@ def handle_create_game(data):
     """Create a new game with the specified number of players"""
     try:
         player_count = int(data.get('player_count', 6))
+        if player_count not in PLAYER_COUNTS:
+            raise ValueError(f"player_count must be 6 or 8, not {player_count}")
         
         # Create game ID
         game_id = str(uuid.uuid4())
         
         # Create new game
-        game = Game(player_count, human_player_idx=0)
+        game = Game(player_count, human_player_idx=0, bot_classes=BOT_CLASSES)
         active_games[game_id] = game
+        state_versions[game_id] = [0, state_key(game)]
+        save_game(game_id, game)
+        enter_game_room(game_id)
         
         # Send initial game state
         game_state = get_game_state(game, game_id)
@@ -69,6 +183,45 @@ def handle_create_game(data):
         emit('error', {'message': f"Failed to create game: {str(e)}"})
         return None
 
+@socketio.on('rejoin_game')
+def handle_rejoin_game(data):
+    """Put a returning client back in a game's room and send it the state"""
+    game_id = data.get('game_id')
+    game = active_games.get(game_id)
+    if not game:
+        emit('error', {'message': 'Game not found'})
+        return
+    
+    enter_game_room(game_id)
+    emit('game_updated', get_game_state(game, game_id))
+
+@socketio.on('resync_game')
+def handle_resync_game(data):
+    """Send the full state to a client that missed a game_patch, making sure
+    it is in the game's room (it may have missed patches by reconnecting)"""
+    game_id = data.get('game_id')
+    game = active_games.get(game_id)
+    if not game:
+        emit('error', {'message': 'Game not found'})
+        return
+    
+    enter_game_room(game_id)
+    emit('game_updated', get_game_state(game, game_id))
+
+@socketio.on('return_to_menu')
+def handle_return_to_menu():
+    """Stop sending a client the game it left"""
+    enter_game_room(None)
+
+def enter_game_room(game_id):
+    """Put the requesting client in game_id's room (None for no game) and
+    take it out of any other game's room"""
+    for room in rooms():
+        if room != request.sid and room != game_id:
+            leave_room(room)
+    if game_id is not None:
+        join_room(game_id)
+
 @socketio.on('request_card')
 def handle_request_card(data):
     """Handle a card request from the human player"""
@@ -107,20 +260,72 @@ def handle_request_card(data):
     }
     
     # Process the request - note that this now handles the turn progression internally
+    asks = len(game.ask_history)
     result = game.request_card(target_player_idx, suit, rank)
+    if len(game.ask_history) > asks:
+        record_ask(game_id, game)
     
     # Update success status in log
     log_entry['success'] = result
     
     # Send the log entry
-    emit('game_log', log_entry)
+    emit('game_log', log_entry, to=game_id)
     
-    # Send the updated game state
-    emit('game_updated', get_game_state(game, game_id))
+    # Send what changed
+    send_state_patch(game, game_id)
     
     # If the next player is a bot and auto-play is on
     if game.current_player.is_bot and game.auto_play:
-        handle_bot_turn(game_id)
+        schedule_bot_turn(game_id)
+
+@socketio.on('declare_set')
+def handle_declare_set(data):
+    """Handle a set declaration from the human player
+    
+    card_assignments maps "<rank>_<suit>" to the index of the teammate
+    claimed to hold that card.
+    """
+    game_id = data.get('game_id')
+    set_name = data.get('set_name')
+    
+    game = active_games.get(game_id)
+    if not game:
+        emit('error', {'message': 'Game not found'})
+        return
+    
+    assignments = {}
+    for card_id, player_idx in (data.get('card_assignments') or {}).items():
+        rank, _, suit = card_id.partition('_')
+        try:
+            assignments[Card.of(suit, rank)] = int(player_idx)
+        except (ValueError, TypeError):
+            emit('error', {'message': f"Invalid card assignment: {card_id}"})
+            return
+    
+    declaring_player = game.human_player_idx
+    success = game.make_declaration(set_name, assignments, declaring_player)
+    family_id = FAMILY_IDS.get(set_name)
+    if family_id is None or game.family_winners[family_id] is None:
+        # Rejected (out of turn, already declared, no card of the set):
+        # nothing happened, so only the declarer hears about it
+        emit('error', {'message': game.game_message})
+        return
+    record_declaration(game_id, game, declaring_player, set_name, success)
+    
+    emit('set_declaration_result', {
+        'game_id': game_id,
+        'declaring_player': declaring_player,
+        'set_name': set_name,
+        'success': success,
+        'team_that_won': game.family_winners[family_id] if family_id is not None else None
+    }, to=game_id)
+    send_state_patch(game, game_id)
+    
+    if game.is_over:
+        emit('game_over', {'game_id': game_id, 'team1_sets': game.scores[0], 'team2_sets': game.scores[1]},
+             to=game_id)
+    elif game.current_player.is_bot and game.auto_play:
+        schedule_bot_turn(game_id)
 
 @socketio.on('next_player')
 def handle_next_player(data):
@@ -133,40 +338,51 @@ def handle_next_player(data):
         emit('error', {'message': 'Game not found'})
         return
     
-    # Just update the client about the current state
-    emit('game_updated', get_game_state(game, game_id))
+    # Update the game's clients with whatever changed
+    send_state_patch(game, game_id)
     
     # Process bot turn if either:
     # 1. Auto-play is on AND current player is a bot
     # 2. User clicked "Process Next Bot Turn" button (force_bot_turn is True)
     if (game.current_player.is_bot and game.auto_play) or force_bot_turn:
-        socketio.sleep(1)  # Reduced delay for better responsiveness
-        handle_bot_turn(game_id)
+        schedule_bot_turn(game_id, delay=1)  # Reduced delay for better responsiveness
 
-def handle_bot_turn(game_id):
-    """Handle a bot's turn"""
+def schedule_bot_turn(game_id, delay=0):
+    """Queue the current bot's turn to start after delay seconds, replacing
+    any turn already queued for the game"""
+    scheduler.schedule(game_id, delay, lambda: start_bot_turn(game_id))
+
+def start_bot_turn(game_id):
+    """Announce that the current bot is thinking and queue its move"""
     game = active_games.get(game_id)
-    if not game or not game.current_player.is_bot:
+    if not game or game.is_over or not game.current_player.is_bot:
         return
     
-    # Send thinking message
     socketio.emit('game_message', {
         'game_id': game_id,
         'message': f"{game.current_player.name} is thinking..."
-    })
-    
-    # Wait a bit to simulate thinking
-    socketio.sleep(1.5)
+    }, to=game_id)
+    scheduler.schedule(game_id, THINK_SECONDS, lambda: handle_bot_turn(game_id))
+
+def handle_bot_turn(game_id):
+    """Play the current bot's turn and send the results to the game's room"""
+    game = active_games.get(game_id)
+    if not game or game.is_over or not game.current_player.is_bot:
+        return
     
-    # Get the bot to select a target and card (we need to capture these before the action)
+    # Handle bot turn - this manages turn changes internally. The bot records
+    # what it asked for in game.last_request.
     bot = game.current_player
-    card = random.choice(bot.hand) if bot.hand else None
-    other_team = 1 if bot.team == 0 else 0
-    other_team_players = [p for p in game.players if p.team == other_team]
-    target = random.choice(other_team_players) if other_team_players else None
+    game.last_request = None
+    game.last_declaration = None
+    result = game.handle_bot_turn()
+    bot_request = game.last_request
+    declaration = game.last_declaration
     
-    if card and target:
-        # Create log entry
+    if bot_request:
+        record_ask(game_id, game)
+        target = bot_request['target']
+        card = bot_request['card']
         log_entry = {
             'type': 'request',
             'timestamp': datetime.now().strftime("%H:%M:%S"),
@@ -183,26 +399,35 @@ def handle_bot_turn(game_id):
                 'suit': card.suit,
                 'rank': card.rank
             },
-            'success': False  # Will be updated after request
+            'success': result
         }
         
-        # Handle bot turn - this now manages turn changes internally
-        result = game.handle_bot_turn()
-        
-        # Update success status in log
-        log_entry['success'] = result
-        
         # Send the log entry
-        socketio.emit('game_log', log_entry)
+        socketio.emit('game_log', log_entry, to=game_id)
+    
+    if declaration:
+        record_declaration(game_id, game, declaration['player_idx'], declaration['family'],
+                           declaration['success'])
+        socketio.emit('set_declaration_result', {
+            'game_id': game_id,
+            'declaring_player': declaration['player_idx'],
+            'set_name': declaration['family'],
+            'success': declaration['success'],
+            'team_that_won': declaration['winner']
+        }, to=game_id)
     
-    # Update game state
-    socketio.emit('game_updated', get_game_state(game, game_id))
+    # Send what changed
+    send_state_patch(game, game_id)
+    
+    if game.is_over:
+        socketio.emit('game_over', {'game_id': game_id, 'team1_sets': game.scores[0],
+                                    'team2_sets': game.scores[1]}, to=game_id)
+        return
     
     # Check if the CURRENT player is a bot (might be different after turn)
     if game.current_player.is_bot and game.auto_play:
         # Add a small delay for better user experience
-        socketio.sleep(2)
-        handle_bot_turn(game_id)
+        schedule_bot_turn(game_id, NEXT_TURN_SECONDS)
 
 @socketio.on('toggle_auto_play')
 def handle_toggle_auto_play(data):
@@ -216,29 +441,43 @@ def handle_toggle_auto_play(data):
         return
     
     game.auto_play = auto_play
-    emit('auto_play_updated', {'game_id': game_id, 'auto_play': auto_play})
+    emit('auto_play_updated', {'game_id': game_id, 'auto_play': auto_play}, to=game_id)
+    send_state_patch(game, game_id)
     
-    # If auto-play is turned on and it's a bot's turn, start processing
+    # If auto-play is turned on and it's a bot's turn, start processing;
+    # turning it off stops any bot turn still queued
     if auto_play and game.current_player.is_bot:
-        handle_bot_turn(game_id)
+        schedule_bot_turn(game_id)
+    elif not auto_play:
+        scheduler.cancel(game_id)
+
+def get_human_cards(game):
+    """The human player's hand as sent to the client"""
+    received = getattr(game, 'received_card', None)
+    return [{'suit': card.suit, 'rank': card.rank, 'is_new': card is received}
+            for card in game.human_player.hand]
+
+def card_id(card):
+    """A card as "<rank>_<suit>", as in declare_set's card_assignments"""
+    return f"{card.rank}_{card.suit}"
+
+def get_legal_targets(game):
+    """Seat bitmask of who the human may ask right now (0 unless it's their turn)"""
+    if game.current_player_idx != game.human_player_idx:
+        return 0
+    return game.legal_target_mask(game.human_player_idx)
+
+def get_declared_sets(game):
+    return {family: winner for family, winner in zip(Card.FAMILIES, game.family_winners) if winner is not None}
 
 def get_game_state(game, game_id):
     """Get the current game state to send to the client"""
     human = game.human_player
     current = game.current_player
     
-    # Get human player's cards
-    human_cards = []
-    for card in human.hand:
-        human_cards.append({
-            'suit': card.suit,
-            'rank': card.rank,
-            'is_new': hasattr(game, 'received_card') and game.received_card and 
-                     game.received_card.suit == card.suit and game.received_card.rank == card.rank
-        })
-    
     # Get player info
     players = []
+    legal_targets = get_legal_targets(game)
     for i, player in enumerate(game.players):
         players.append({
             'index': i,
@@ -248,21 +487,115 @@ def get_game_state(game, game_id):
             'card_count': len(player.hand),
             'is_current': player == current,
             'is_human': player == human,
-            'can_request': current == human and player != human and 
-                         game.can_request_from_player(human, player)
+            'can_request': bool(legal_targets >> i & 1)
         })
     
+    version = state_versions.get(game_id)
     return {
         'game_id': game_id,
-        'human_cards': human_cards,
+        'version': version[0] if version else 0,
+        'human_cards': get_human_cards(game),
         'players': players,
         'current_player_idx': game.current_player_idx,
         'human_player_idx': game.human_player_idx,
         'game_message': game.game_message,
         'team_names': game.team_names,
-        'auto_play': getattr(game, 'auto_play', False)
+        'auto_play': getattr(game, 'auto_play', False),
+        'seed': game.seed,
+        'scores': game.scores,
+        'declared_sets': get_declared_sets(game),
+        'game_over': game.is_over
     }
 
+def state_key(game):
+    """The parts of the client state that can change, in cheap-to-compare form"""
+    return (
+        tuple(len(player.hand) for player in game.players),
+        game.current_player_idx,
+        get_legal_targets(game),
+        game.human_player.hand_mask(),
+        getattr(game, 'received_card', None),
+        game.game_message,
+        tuple(game.scores),
+        tuple(game.family_winners),
+        game.auto_play,
+        game.is_over,
+    )
+
+def get_state_patch(game, game_id):
+    """The changes since the game's last patch as {'version', 'changes'},
+    or None if nothing changed
+    
+    Patches go only to the game's room, and a client is in one game's room
+    at a time (see enter_game_room), so they don't repeat the game_id.
+    
+    changes holds only the fields that changed, named as in get_game_state,
+    except that players' card counts come as 'card_counts' (a list by seat,
+    sent whole when any count changed: as short as naming the two seats a
+    card moved between, and shorter after a declaration) and who may be
+    asked as 'can_request' (a list of seats). The client derives each player's is_current from
+    current_player_idx. 'declared_sets' holds only the newly declared sets.
+    The human's hand changes come as 'cards_added' and 'cards_removed'
+    lists of card ids (see card_id), and 'new_card' (the id of the card to
+    mark as new, or None) when that changes; only the first patch after a
+    game is restored carries the whole hand as 'human_cards'.
+    """
+    version = state_versions.get(game_id)
+    if version is None:
+        version = state_versions[game_id] = [0, None]
+    key = state_key(game)
+    old = version[1]
+    if key == old:
+        return None
+    if old is None:
+        old = ((),) + (None,) * (len(key) - 1)
+    
+    counts, current, targets, hand, received, message, scores, winners, auto_play, over = key
+    changes = {}
+    if counts != old[0]:
+        changes['card_counts'] = list(counts)
+    if current != old[1]:
+        changes['current_player_idx'] = current
+    if targets != old[2]:
+        changes['can_request'] = [i for i in range(len(counts)) if targets >> i & 1]
+    if old[3] is None:
+        changes['human_cards'] = get_human_cards(game)
+    else:
+        if hand != old[3]:
+            added = hand & ~old[3]
+            removed = old[3] & ~hand
+            if added:
+                changes['cards_added'] = [card_id(card) for card in BitmaskHand.from_mask(added)]
+            if removed:
+                changes['cards_removed'] = [card_id(card) for card in BitmaskHand.from_mask(removed)]
+        if received is not old[4]:
+            changes['new_card'] = card_id(received) if received is not None else None
+    if message != old[5]:
+        changes['game_message'] = message
+    if scores != old[6]:
+        changes['scores'] = list(scores)
+    if winners != old[7]:
+        old_winners = old[7] or (None,) * len(winners)
+        changes['declared_sets'] = {family: winner for family, winner, old_winner
+                                    in zip(Card.FAMILIES, winners, old_winners)
+                                    if winner is not None and old_winner is None}
+    if auto_play != old[8]:
+        changes['auto_play'] = auto_play
+    if over != old[9]:
+        changes['game_over'] = over
+    
+    version[0] += 1
+    version[1] = key
+    return {'version': version[0], 'changes': changes}
+
+def send_state_patch(game, game_id):
+    """Send the game's room whatever changed since the last patch, and
+    queue the changed game for the game database"""
+    patch = get_state_patch(game, game_id)
+    if patch is not None:
+        socketio.emit('game_patch', patch, to=game_id)
+        save_game(game_id, game)
+
 if __name__ == '__main__':
     # Ensure asset directories exist
     os.makedirs('assets', exist_ok=True)
@@ -0,0 +1,98 @@
+"""
+Literature Card Game - Headless Simulator
+Runs bot-only games with no logging or message formatting, for balance testing
+
+Run from the repository root:
+    python simulator.py --games 1000 --players 6
+"""
+import argparse
+import time
+
+from game_logic import Bot, Game, NO_TEAM
+
+class Simulator:
+    """Plays complete bot-vs-bot games and reports throughput
+    
+    bot_classes gives the Bot class for each team, e.g. (Bot, Bot).
+    """
+    def __init__(self, num_players=6, max_moves=5000, bot_classes=(Bot, Bot)):
+        self.num_players = num_players
+        # Safety cap so a game that cannot finish doesn't spin forever
+        self.max_moves = max_moves
+        self.bot_classes = bot_classes
+    
+    def new_game(self, seed=None):
+        return Game(self.num_players, human_player_idx=None, compact_hands=True, headless=True,
+                    bot_classes=self.bot_classes, seed=seed)
+    
+    def play_game(self, game=None, seed=None):
+        """Play one game to the end, returning (winning_team, moves)
+        
+        winning_team is NO_TEAM for a draw and None if the move cap was hit.
+        """
+        if game is None:
+            game = self.new_game(seed)
+        moves = 0
+        max_moves = self.max_moves
+        while moves < max_moves and not game.is_over:
+            game.current_player.take_turn(game)
+            moves += 1
+        return game.winning_team, moves
+    
+    def run(self, num_games):
+        """Play num_games games and return a summary dict"""
+        wins = [0, 0]
+        draws = 0
+        unfinished = 0
+        total_moves = 0
+        
+        start = time.perf_counter()
+        for _ in range(num_games):
+            winner, moves = self.play_game()
+            total_moves += moves
+            if winner is None:
+                unfinished += 1
+            elif winner == NO_TEAM:
+                draws += 1
+            else:
+                wins[winner] += 1
+        elapsed = time.perf_counter() - start
+        
+        return {
+            'games': num_games,
+            'players': self.num_players,
+            'wins': wins,
+            'draws': draws,
+            'unfinished': unfinished,
+            'moves': total_moves,
+            'seconds': elapsed,
+            'games_per_second': num_games / elapsed if elapsed else 0.0,
+            'moves_per_second': total_moves / elapsed if elapsed else 0.0,
+        }
+
+def format_summary(summary):
+    """Human readable report of a Simulator.run summary"""
+    games = summary['games']
+    lines = [
+        f"{games} games with {summary['players']} players in {summary['seconds']:.2f}s",
+        f"  {summary['games_per_second']:.1f} games/s "
+        f"({summary['games_per_second'] * 60:.0f} games/min), "
+        f"{summary['moves_per_second']:.0f} moves/s",
+        f"  Team A wins: {summary['wins'][0]}, Team B wins: {summary['wins'][1]}, "
+        f"draws: {summary['draws']}, unfinished (hit move cap): {summary['unfinished']}",
+        f"  average moves per game: {summary['moves'] / games if games else 0:.1f}",
+    ]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless bot-vs-bot Literature games")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--players', type=int, default=6, choices=[6, 8], help="players per game")
+    parser.add_argument('--max-moves', type=int, default=5000, help="move cap per game")
+    args = parser.parse_args()
+    
+    simulator = Simulator(args.players, max_moves=args.max_moves)
+    print(format_summary(simulator.run(args.games)))
+
+if __name__ == '__main__':
+    main()
@@ -190,6 +190,11 @@ function initEventListeners() {
 function initSocketListeners() {
     socket.on('connect', () => {
         console.log('Connected to server');
+        // After a reconnect this is a new session, outside the game's room:
+        // join it again and catch up on the moves missed meanwhile
+        if (gameState && gameState.game_id) {
+            socket.emit('rejoin_game', { game_id: gameState.game_id });
+        }
     });
     
     socket.on('game_created', (data) => {
@@ -205,6 +210,21 @@ function initSocketListeners() {
         updateGameDisplay();
     });
     
+    socket.on('game_patch', (patch) => {
+        // Patches come from the one game room this client is in
+        if (!gameState || patch.version <= gameState.version) {
+            return;
+        }
+        if (patch.version !== gameState.version + 1) {
+            // Missed an update: ask for the full state instead
+            socket.emit('resync_game', { game_id: gameState.game_id, version: gameState.version });
+            return;
+        }
+        applyGamePatch(patch.changes);
+        gameState.version = patch.version;
+        updateGameDisplay();
+    });
+    
     socket.on('error', (data) => {
         console.error('Error:', data.message);
         menuStatus.textContent = data.message;
@@ -244,6 +264,34 @@ function initSocketListeners() {
     });
 }
 
+// Apply the changed fields of a game_patch to gameState
+function applyGamePatch(changes) {
+    for (const [key, value] of Object.entries(changes)) {
+        if (key === 'card_counts') {
+            value.forEach((count, index) => { gameState.players[index].card_count = count; });
+        } else if (key === 'can_request') {
+            gameState.players.forEach(p => { p.can_request = value.includes(p.index); });
+        } else if (key === 'declared_sets') {
+            Object.assign(gameState.declared_sets, value);
+        } else if (key === 'cards_removed') {
+            gameState.human_cards = gameState.human_cards.filter(c => !value.includes(`${c.rank}_${c.suit}`));
+        } else if (key === 'cards_added') {
+            value.forEach(id => {
+                const [rank, suit] = id.split('_');
+                gameState.human_cards.push({ suit: suit, rank: rank, is_new: false });
+            });
+        } else if (key === 'new_card') {
+            // Applied below, once the hand has its added cards
+        } else {
+            gameState[key] = value;
+        }
+    }
+    if ('new_card' in changes) {
+        gameState.human_cards.forEach(c => { c.is_new = `${c.rank}_${c.suit}` === changes.new_card; });
+    }
+    gameState.players.forEach(p => { p.is_current = p.index === gameState.current_player_idx; });
+}
+
 // Create a new game
 function createGame(playerCount) {
     menuStatus.textContent = `Creating ${playerCount}-player game...`;
@@ -1,6 +1,10 @@
 import unittest
 import os
 import logging
+import time
+import random
+import json
+import numpy as np
 from unittest.mock import MagicMock, patch
 from kivy.app import App
 from kivy.clock import Clock
@@ -13,6 +17,23 @@ from main import (
     LiteratureApp, MenuScreen, GameScreen, SettingsScreen
 )
 
+# Core engine used by the web server
+import game_logic
+from simulator import Simulator
+from batch_simulator import BatchSimulator, UNFINISHED
+from tournament import run_tournament
+from benchmarks import suite as bench_suite
+from search_bot import MonteCarloBot, RolloutPool
+from endgame import EndgameSolver
+from hand_sampler import HandSampler, possible_holders
+from transposition import TranspositionTable
+from turn_scheduler import TurnScheduler
+from game_store import GameStore
+from game_db import GameDatabase
+import engine_log
+from models.game_state import GameState as ServerGameState
+from models.player import Player as ServerPlayer
+
 # Configure logging for tests
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -197,6 +218,1530 @@ class LiteratureAppIntegrationTest(unittest.TestCase):
         for player in self.app.game_state.players:
             self.assertEqual(len(player.hand), 6)
 
+class CardFlyweightTest(unittest.TestCase):
+    """Unit tests for the interned cards in game_logic"""
+    
+    def test_cards_are_interned(self):
+        """Test that the same suit and rank always give the same card"""
+        card = game_logic.Card.of("Spades", "7")
+        self.assertIs(card, game_logic.Card("Spades", "7"))
+        self.assertIs(card, game_logic.ORDINAL_CARDS[card.ordinal])
+        self.assertEqual(len(game_logic.ORDINAL_CARDS), 52)
+    
+    def test_precomputed_family(self):
+        """Test that family ids and names follow the Low 2-7 / High rule"""
+        low = game_logic.Card.of("Hearts", "2")
+        high = game_logic.Card.of("Hearts", "A")
+        self.assertEqual(low.get_family(), "Low Hearts")
+        self.assertEqual(high.get_family(), "High Hearts")
+        self.assertEqual(game_logic.Card.FAMILIES[low.family_id], "Low Hearts")
+        self.assertNotEqual(low.family_id, high.family_id)
+    
+    def test_invalid_card(self):
+        """Test that unknown cards are rejected"""
+        with self.assertRaises(ValueError):
+            game_logic.Card.of("Hearts", "1")
+        with self.assertRaises(ValueError):
+            game_logic.Card.of("Stars", "2")
+        self.assertFalse(game_logic.Player("P").has_card("Stars", "2"))
+
+class BitmaskHandTest(unittest.TestCase):
+    """Unit tests for the compact hand backend in game_logic"""
+    
+    def test_compact_hand_matches_list_hand(self):
+        """Test that bitmask and list hands answer the same questions"""
+        cards = [game_logic.Card("Hearts", "2"), game_logic.Card("Spades", "K"),
+                 game_logic.Card("Clubs", "9")]
+        list_player = game_logic.Player("List", compact_hand=False)
+        mask_player = game_logic.Player("Mask", compact_hand=True)
+        for card in cards:
+            list_player.add_card(card)
+            mask_player.add_card(card)
+        
+        for card in game_logic.ORDINAL_CARDS:
+            self.assertEqual(list_player.has_card(card.suit, card.rank),
+                             mask_player.has_card(card.suit, card.rank))
+        for family in game_logic.FAMILY_MASKS:
+            self.assertEqual(list_player.has_card_of_family(family),
+                             mask_player.has_card_of_family(family))
+    
+    def test_compact_hand_list_view(self):
+        """Test that a bitmask hand still reads like a list of cards"""
+        player = game_logic.Player("Mask", compact_hand=True)
+        player.add_card(game_logic.Card("Diamonds", "Q"))
+        player.add_card(game_logic.Card("Hearts", "7"))
+        
+        self.assertEqual(len(player.hand), 2)
+        self.assertEqual({str(card) for card in player.hand}, {"Q of Diamonds", "7 of Hearts"})
+        self.assertEqual(str(player.hand[0]), "7 of Hearts")
+        
+        removed = player.remove_card("Hearts", "7")
+        self.assertEqual(str(removed), "7 of Hearts")
+        self.assertIsNone(player.remove_card("Hearts", "7"))
+        self.assertEqual(len(player.hand), 1)
+
+class GameCardIndexTest(unittest.TestCase):
+    """Unit tests for the card ownership index in game_logic.Game"""
+    
+    def assert_index_matches_hands(self, game):
+        for i, player in enumerate(game.players):
+            for card in player.hand:
+                self.assertEqual(game.owner_of(card), i)
+        for card in game.deck:
+            self.assertIsNone(game.owner_of(card))
+    
+    def test_index_after_deal(self):
+        """Test that every dealt card is indexed to its holder"""
+        game = game_logic.Game(6)
+        self.assert_index_matches_hands(game)
+    
+    def test_transfer_updates_index(self):
+        """Test that transfers move the card and its index entry together"""
+        game = game_logic.Game(6, compact_hands=True)
+        card = game.players[3].hand[0]
+        game.transfer(card, 0)
+        self.assertEqual(game.owner_of(card), 0)
+        self.assertIn(card, game.players[0].hand)
+        self.assertNotIn(card, game.players[3].hand)
+        self.assert_index_matches_hands(game)
+
+class HeadlessSimulationTest(unittest.TestCase):
+    """Unit tests for headless bot-only games"""
+    
+    def test_headless_game_does_not_log(self):
+        """Test that a headless game logs nothing while playing"""
+        with self.assertNoLogs('game_logic', level='INFO'):
+            game = game_logic.Game(6, human_player_idx=None, compact_hands=True, headless=True)
+            for _ in range(200):
+                game.current_player.take_turn(game)
+    
+    def test_bot_requests_are_legal(self):
+        """Test that the random bot only asks opponents for cards it may request"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True)
+        for _ in range(200):
+            bot = game.current_player
+            request = bot.choose_request(game)
+            if request is None:
+                break
+            card, target_idx = request
+            self.assertTrue(game.can_request_card(bot, card.suit, card.rank))
+            self.assertNotEqual(game.players[target_idx].team, bot.team)
+            bot.take_turn(game)
+    
+    def test_simulator_respects_move_cap(self):
+        """Test that simulated games stop at the move cap"""
+        summary = Simulator(6, max_moves=50).run(3)
+        self.assertEqual(summary['games'], 3)
+        self.assertLessEqual(summary['moves'], 150)
+        self.assertEqual(sum(summary['wins']) + summary['draws'] + summary['unfinished'], 3)
+
+class BatchSimulatorTest(unittest.TestCase):
+    """Validation of the NumPy batch engine against the scalar Game engine"""
+    
+    def play_scalar_games(self, num_games, num_players, max_moves):
+        """Play scalar games, returning (winners, moves, successful asks) per game"""
+        results = []
+        for _ in range(num_games):
+            game = game_logic.Game(num_players, human_player_idx=None, compact_hands=True, headless=True)
+            moves = successes = 0
+            while moves < max_moves and not game.is_over:
+                successes += bool(game.current_player.take_turn(game))
+                moves += 1
+            winner = game.winning_team
+            results.append((UNFINISHED if winner is None else winner, moves, successes))
+        return results
+    
+    def assert_same_mean(self, scalar, batch):
+        """Two-sample z-test on the means, failing only on a 4 sigma gap"""
+        scalar = np.asarray(scalar, dtype=float)
+        batch = np.asarray(batch, dtype=float)
+        stderr = np.sqrt(scalar.var() / len(scalar) + batch.var() / len(batch))
+        gap = abs(scalar.mean() - batch.mean())
+        self.assertLessEqual(gap, 4 * stderr + 1e-9)
+    
+    def test_batch_matches_scalar_engine(self):
+        """Test that batch outcomes and move statistics match the scalar engine"""
+        for num_players in (6, 8):
+            scalar = self.play_scalar_games(1000, num_players, max_moves=5000)
+            batch = BatchSimulator(1000, num_players, seed=7, max_moves=5000).run()
+            
+            self.assert_same_mean([winner for winner, _, _ in scalar], batch['winners'])
+            self.assert_same_mean([moves for _, moves, _ in scalar], batch['moves'])
+            self.assert_same_mean([successes for _, _, successes in scalar], batch['successes'])
+    
+    def test_batch_is_reproducible(self):
+        """Test that the same seed replays the same batch"""
+        first = BatchSimulator(50, 6, seed=3, max_moves=100).run()
+        second = BatchSimulator(50, 6, seed=3, max_moves=100).run()
+        self.assertEqual(first['successes'].tolist(), second['successes'].tolist())
+        self.assertEqual(first['moves'].tolist(), second['moves'].tolist())
+
+class TournamentTest(unittest.TestCase):
+    """Unit tests for the multiprocess tournament runner"""
+    
+    def test_results_are_merged_across_chunks(self):
+        """Test that every chunk's games end up in one row per pairing"""
+        results = run_tournament(['random'], 5, max_moves=20, workers=2, chunk_size=2)
+        stats = results[('random', 'random')]
+        self.assertEqual(stats['games'], 5)
+        self.assertEqual(stats['wins_a'] + stats['wins_b'] + stats['draws'] + stats['unfinished'], 5)
+        self.assertLessEqual(stats['moves'], 5 * 20)
+
+class SeededGameTest(unittest.TestCase):
+    """Unit tests for per-game seeded randomness and replays"""
+    
+    def test_same_seed_same_deal(self):
+        """Test that a seed fixes the deal independently of the global RNG"""
+        first = game_logic.Game(6, headless=True, seed=42)
+        game_logic.random.random()
+        second = game_logic.Game(6, headless=True, seed=42)
+        self.assertEqual(first.card_owners, second.card_owners)
+        self.assertEqual(first.seed, 42)
+    
+    def test_replay_reproduces_game(self):
+        """Test that a replay record rebuilds the exact same position"""
+        game = game_logic.Game(6, headless=True, seed=7)
+        for _ in range(100):
+            if game.current_player.is_bot:
+                game.handle_bot_turn()
+                continue
+            human = game.human_player
+            card = next((c for c in game_logic.ORDINAL_CARDS
+                         if game.can_request_card(human, c.suit, c.rank)), None)
+            if card is None or not game.players[3].hand or len(game.human_actions) % 4 == 3:
+                family = human.hand[0].family
+                game.make_declaration(family, {c: 0 for c in human.hand if c.family == family})
+                continue
+            game.request_card(3, card.suit, card.rank)
+        
+        record = game.replay_record()
+        self.assertIn('declare', [action for _, action, _ in record['human_actions']])
+        replayed = game_logic.Game.replay(json.loads(json.dumps(record)))
+        self.assertEqual(replayed.card_owners, game.card_owners)
+        self.assertEqual(replayed.current_player_idx, game.current_player_idx)
+        self.assertEqual(replayed.turns, game.turns)
+    
+    def test_replay_uses_recorded_bot_classes(self):
+        """Test that a game with non-default bots replays with the same bots"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=9,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.Bot))
+        for _ in range(40):
+            if game.is_over:
+                break
+            game.handle_bot_turn()
+        record = game.replay_record()
+        self.assertEqual(record['bot_classes'], ['game_logic.KnowledgeBot', 'game_logic.Bot'])
+        self.assertIsNone(record['bot_actions'])
+        
+        replayed = game_logic.Game.replay(record)
+        self.assertIsInstance(replayed.players[0], game_logic.KnowledgeBot)
+        self.assertEqual(replayed.card_owners, game.card_owners)
+        self.assertEqual(replayed.ask_history, game.ask_history)
+        with self.assertRaises(ValueError):
+            game_logic.Game.replay(dict(record, bot_classes=['os.path', None]))
+    
+    def test_replay_follows_recorded_search_bot_moves(self):
+        """Test that a game seating a search bot bound by the clock replays
+        move for move from its recorded bot moves"""
+        bot = lambda name, team=0, compact_hand=False: MonteCarloBot(name, team, compact_hand, time_budget_ms=2)
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=3,
+                               bot_classes=(bot, game_logic.Bot))
+        while not game.is_over and game.turns < 80:
+            game.handle_bot_turn()
+        record = json.loads(json.dumps(game.replay_record()))
+        self.assertEqual(record['bot_classes'], ['search_bot.MonteCarloBot', 'game_logic.Bot'])
+        self.assertIn('declare', [action for _, action, _ in record['bot_actions']])
+        
+        replayed = game_logic.Game.replay(record)
+        self.assertIsInstance(replayed.players[0], MonteCarloBot)
+        self.assertEqual(replayed.card_owners, game.card_owners)
+        self.assertEqual(replayed.ask_history, game.ask_history)
+        self.assertEqual(replayed.family_winners, game.family_winners)
+        self.assertEqual(replayed.scores, game.scores)
+        self.assertEqual(replayed.current_player_idx, game.current_player_idx)
+
+class DeclarationTest(unittest.TestCase):
+    """Unit tests for set declarations in game_logic.Game"""
+    
+    def setUp(self):
+        self.game = game_logic.Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=5)
+    
+    def move_family_to(self, family, assignments):
+        """Deal every in-play card of a family according to a card -> seat map"""
+        for card in game_logic.FAMILY_CARDS[game_logic.FAMILY_IDS[family]]:
+            if self.game.owner_of(card) is not None:
+                self.game.transfer(card, assignments(card))
+    
+    def family_assignments(self, family):
+        return {card: self.game.owner_of(card)
+                for card in game_logic.FAMILY_CARDS[game_logic.FAMILY_IDS[family]]
+                if self.game.owner_of(card) is not None}
+    
+    def test_correct_declaration(self):
+        """Test that a correct claim scores the set and keeps the turn"""
+        self.move_family_to("Low Hearts", lambda card: card.ordinal % 3)
+        assignments = self.family_assignments("Low Hearts")
+        
+        self.assertTrue(self.game.make_declaration("Low Hearts", assignments, 0))
+        self.assertEqual(self.game.scores, [1, 0])
+        self.assertEqual(self.game.current_player_idx, 0)
+        for card in assignments:
+            self.assertIsNone(self.game.owner_of(card))
+            self.assertNotIn(card, self.game.players[card.ordinal % 3].hand)
+    
+    def test_wrong_declaration_within_team(self):
+        """Test that a misassigned set held by the team is removed without points"""
+        self.move_family_to("Low Hearts", lambda card: card.ordinal % 3)
+        assignments = {card: 0 for card in self.family_assignments("Low Hearts")}
+        
+        self.assertFalse(self.game.make_declaration("Low Hearts", assignments, 0))
+        self.assertEqual(self.game.scores, [0, 0])
+        self.assertEqual(self.game.family_winners[game_logic.FAMILY_IDS["Low Hearts"]], game_logic.NO_TEAM)
+        self.assertEqual(self.game.current_player_idx, 1)
+    
+    def test_wrong_declaration_with_opponent_card(self):
+        """Test that a set with a card on the other team goes to that team"""
+        self.move_family_to("Low Hearts", lambda card: 0 if card.rank != "2" else 3)
+        assignments = {card: 0 for card in self.family_assignments("Low Hearts")}
+        
+        self.assertFalse(self.game.make_declaration("Low Hearts", assignments, 0))
+        self.assertEqual(self.game.scores, [0, 1])
+    
+    def test_naming_opponent_holders_is_wrong(self):
+        """Test that assigning a card to the opponent who holds it still
+        gives the set to the opponents"""
+        self.move_family_to("Low Hearts", lambda card: 0 if card.rank != "2" else 3)
+        assignments = self.family_assignments("Low Hearts")
+        self.assertIn(3, assignments.values())
+        
+        self.assertFalse(self.game.make_declaration("Low Hearts", assignments, 0))
+        self.assertEqual(self.game.scores, [0, 1])
+        self.assertEqual(self.game.family_winners[game_logic.FAMILY_IDS["Low Hearts"]], 1)
+        self.assertEqual(self.game.current_player_idx, 1)
+    
+    def test_cannot_declare_without_a_card(self):
+        """Test that a player must hold a card of the declared set"""
+        self.move_family_to("Low Hearts", lambda card: 3)
+        self.assertFalse(self.game.make_declaration("Low Hearts", {}, 0))
+        self.assertEqual(self.game.family_winners, [None] * 8)
+    
+    def test_player_count_is_validated(self):
+        """Test that only 6 and 8 player games can be created"""
+        for num_players in (4, 7, 10):
+            with self.assertRaises(ValueError):
+                game_logic.Game(num_players, headless=True)
+        self.assertEqual(len(game_logic.Game(8, headless=True).players), 8)
+    
+    def test_bot_games_finish(self):
+        """Test that bot-only games always end with every set declared"""
+        for seed in range(20):
+            game = game_logic.Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=seed)
+            winner, moves = Simulator(6).play_game(game)
+            self.assertTrue(game.is_over)
+            self.assertIsNotNone(winner)
+            self.assertLessEqual(sum(game.scores), 8)
+
+class GameCloneTest(unittest.TestCase):
+    """Unit tests for Game.clone"""
+    
+    def test_clone_plays_identically(self):
+        """Test that a clone with the copied rng plays out exactly like the original"""
+        for compact in (False, True):
+            game = game_logic.Game(6, human_player_idx=None, compact_hands=compact, headless=True, seed=9,
+                                   bot_classes=(game_logic.KnowledgeBot, game_logic.Bot))
+            for _ in range(30):
+                game.handle_bot_turn()
+            clone = game.clone()
+            for each in (game, clone):
+                while not each.is_over:
+                    each.handle_bot_turn()
+            self.assertEqual(clone.to_bytes(), game.to_bytes())
+            self.assertEqual(clone.ask_history, game.ask_history)
+    
+    def test_clone_is_independent(self):
+        """Test that moves in a clone leave the original untouched"""
+        game = game_logic.Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=9,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.Bot))
+        game.handle_bot_turn()
+        before = game.to_bytes()
+        hands = [player.hand_mask() for player in game.players]
+        possible = list(game.players[0].possible)
+        
+        clone = game.clone(random.Random(1))
+        self.assertIs(clone.players[0].name, game.players[0].name)
+        while not clone.is_over:
+            clone.handle_bot_turn()
+        
+        self.assertEqual(game.to_bytes(), before)
+        self.assertEqual([player.hand_mask() for player in game.players], hands)
+        self.assertEqual(game.players[0].possible, possible)
+
+class LegalMovesTest(unittest.TestCase):
+    """Unit tests for Game.legal_moves and its cache"""
+    
+    def brute_force(self, game, seat):
+        player = game.players[seat]
+        return {(target, card) for target, other in enumerate(game.players)
+                if other.team != player.team and other.hand
+                for card in game_logic.ORDINAL_CARDS
+                if card.bit & game.in_play_mask and game.can_request_card(player, card.suit, card.rank)}
+    
+    def test_matches_rules_through_a_game(self):
+        """Test that legal moves match the request rules after every move"""
+        game = game_logic.Game(6, human_player_idx=None, compact_hands=True, headless=True, seed=2)
+        while not game.is_over:
+            for seat in range(6):
+                self.assertEqual(set(game.legal_moves(seat)), self.brute_force(game, seat))
+            game.handle_bot_turn()
+    
+    def test_undealt_cards_are_not_asked_for(self):
+        """Test that neither legal moves nor bots ask for cards nobody was dealt"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=1,
+                               bot_classes=(game_logic.Bot, game_logic.KnowledgeBot))
+        undealt = [card for card in game_logic.ORDINAL_CARDS if not card.bit & game.in_play_mask]
+        self.assertTrue(undealt)
+        for seat in range(6):
+            self.assertFalse({card for _, card in game.legal_moves(seat)} & set(undealt))
+        for _ in range(60):
+            if game.is_over:
+                break
+            game.handle_bot_turn()
+        self.assertFalse({ordinal for _, _, ordinal, _ in game.ask_history} & {card.ordinal for card in undealt})
+    
+    def test_cache_invalidation(self):
+        """Test that the cached moves survive unrelated changes only"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=1)
+        moves = game.legal_moves(0)
+        self.assertIs(game.legal_moves(0), moves)
+        
+        # A card moving between two opponents changes neither key
+        card = game.players[3].hand[0]
+        game.transfer(card, 4)
+        self.assertIs(game.legal_moves(0), moves)
+        
+        game.transfer(card, 0)
+        self.assertIsNot(game.legal_moves(0), moves)
+        self.assertNotIn((3, card), game.legal_moves(0))
+        self.assertEqual(set(game.legal_moves(0)), self.brute_force(game, 0))
+    
+    def test_request_validation(self):
+        """Test that a human can't ask an opponent with no cards"""
+        game = game_logic.Game(6, human_player_idx=0, headless=True, seed=1)
+        for card in list(game.players[3].hand):
+            game.transfer(card, 4)
+        target, card = game.legal_moves(0)[0]
+        
+        self.assertFalse(game.request_card(3, card.suit, card.rank))
+        self.assertEqual(game.game_message, "Bot 4 has no cards left!")
+        self.assertEqual(game.turns, 0)
+
+class ZobristHashTest(unittest.TestCase):
+    """Unit tests for incremental position hashing and the transposition table"""
+    
+    def test_incremental_hash_matches_recompute(self):
+        """Test that the hash kept up on every move equals a fresh computation"""
+        for num_players in (6, 8):
+            game = game_logic.Game(num_players, human_player_idx=None, headless=True, seed=num_players,
+                                   bot_classes=(game_logic.KnowledgeBot, game_logic.Bot))
+            while not game.is_over:
+                game.handle_bot_turn()
+                self.assertEqual(game.zobrist, game.compute_zobrist())
+            restored = game_logic.Game.from_bytes(game.to_bytes())
+            self.assertEqual(restored.position_hash, game.position_hash)
+    
+    def test_hash_tracks_position(self):
+        """Test that moving a card and moving it back restores the hash"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=1)
+        start = game.position_hash
+        card = game.players[3].hand[0]
+        game.transfer(card, 0)
+        self.assertNotEqual(game.position_hash, start)
+        game.transfer(card, 3)
+        self.assertEqual(game.position_hash, start)
+        game.current_player_idx = 1
+        self.assertNotEqual(game.position_hash, start)
+    
+    def test_transposition_table(self):
+        """Test LRU eviction and hit/miss counting"""
+        table = TranspositionTable(max_entries=2)
+        table.store(1, 'a')
+        table.store(2, 'b')
+        self.assertEqual(table.get(1), 'a')
+        table.store(3, 'c')
+        
+        self.assertNotIn(2, table)
+        self.assertIsNone(table.get(2))
+        self.assertEqual(table.get_or_compute(3, lambda: 'unused'), 'c')
+        self.assertEqual(table.get_or_compute(4, lambda: 'd'), 'd')
+        self.assertEqual(table.stats(), {'entries': 2, 'max_entries': 2, 'hits': 2, 'misses': 2,
+                                         'evictions': 2, 'hit_rate': 0.5})
+
+class KnowledgeBotTest(unittest.TestCase):
+    """Unit tests for the card-tracking KnowledgeBot"""
+    
+    def test_observe_asks(self):
+        """Test that hits pin a card and misses rule out the asker and target"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=3,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.Bot))
+        bot = game.players[0]
+        card = next(card for card in game_logic.ORDINAL_CARDS if card not in bot.hand)
+        game.ask_history.append((4, 1, card.ordinal, False))
+        bot.observe(game, 0)
+        self.assertEqual(bot.possible[card.ordinal], 0b101100)
+        
+        game.ask_history.append((5, 2, card.ordinal, True))
+        bot.observe(game, 0)
+        self.assertEqual(bot.possible[card.ordinal], 1 << 5)
+        self.assertEqual(bot.seen_asks, 2)
+    
+    def test_knowledge_is_consistent(self):
+        """Test that a card's true holder is always among its possible holders"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=8,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.KnowledgeBot))
+        while not game.is_over:
+            seat = game.current_player_idx
+            game.handle_bot_turn()
+            bot = game.players[seat]
+            if bot.possible is None:
+                continue
+            bot.observe(game, seat)
+            for card in game_logic.ORDINAL_CARDS:
+                owner = game.owner_of(card)
+                if owner is not None:
+                    self.assertTrue(bot.possible[card.ordinal] >> owner & 1)
+    
+    def test_beats_random_bot(self):
+        """Test that tracking cards wins most games against the random bot"""
+        results = run_tournament(['knowledge', 'random'], 30, workers=1, chunk_size=30)
+        stats = results[('knowledge', 'random')]
+        self.assertEqual(stats['unfinished'], 0)
+        self.assertGreater(stats['wins_a'], 20)
+
+class HandSamplerTest(unittest.TestCase):
+    """Unit tests for sampling hidden hands"""
+    
+    def small_position(self):
+        """Seat 0 holds one card; seats 1-3 share six cards, three of them
+        with a possible holder ruled out"""
+        owners = bytearray([game_logic.NO_OWNER] * 52)
+        for ordinal in range(6):
+            owners[ordinal] = 1
+        owners[10] = 0
+        possible = [0b1110] * 52
+        possible[0], possible[1], possible[2] = 0b0110, 0b1100, 0b1010
+        return owners, [1, 2, 2, 2], possible
+    
+    def mid_game(self, seed=5, turns=40):
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=seed,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.KnowledgeBot))
+        for _ in range(turns):
+            game.current_player.take_turn(game)
+        return game
+    
+    def assert_consistent(self, game, seat, possible, owners):
+        for idx, player in enumerate(game.players):
+            self.assertEqual(list(owners).count(idx), len(player.hand))
+        for ordinal, owner in enumerate(owners):
+            if owner != game_logic.NO_OWNER:
+                self.assertTrue(possible[ordinal] >> owner & 1)
+        for card in game.players[seat].hand:
+            self.assertEqual(owners[card.ordinal], seat)
+    
+    def test_deals_are_uniform(self):
+        """Test that every consistent deal comes up about equally often"""
+        owners, sizes, possible = self.small_position()
+        sampler = HandSampler(owners, sizes, possible, 0)
+        self.assertEqual(sampler.total, 30)
+        rng = random.Random(1)
+        counts = {}
+        for _ in range(15000):
+            deal = bytes(sampler.sample(rng)[:6])
+            counts[deal] = counts.get(deal, 0) + 1
+        self.assertEqual(len(counts), 30)
+        self.assertTrue(all(400 < count < 600 for count in counts.values()))
+    
+    def test_samples_match_knowledge(self):
+        """Test that sampled deals keep hand sizes, the seat's cards and the masks"""
+        game = self.mid_game()
+        seat = game.current_player_idx
+        possible = possible_holders(game, seat)
+        sampler = HandSampler.from_game(game, seat)
+        rng = random.Random(0)
+        for _ in range(20):
+            self.assert_consistent(game, seat, possible, sampler.sample(rng))
+        batch = sampler.sample_batch(50, rng)
+        self.assertEqual(batch.shape, (50, 52))
+        self.assertEqual(batch.dtype, np.uint8)
+        for owners in batch:
+            self.assert_consistent(game, seat, possible, owners)
+    
+    def test_possible_holders_match_knowledge_bot(self):
+        """Test that the public-state masks agree with KnowledgeBot's on its live cards"""
+        game = self.mid_game(seed=2)
+        seat = game.current_player_idx
+        bot = game.players[seat]
+        bot.observe(game, seat)
+        possible = possible_holders(game, seat)
+        for ordinal, owner in enumerate(game.card_owners):
+            if owner != game_logic.NO_OWNER:
+                self.assertEqual(possible[ordinal], bot.possible[ordinal])
+    
+    def test_inconsistent_knowledge(self):
+        """Test that masks no deal can satisfy are rejected"""
+        owners, sizes, possible = self.small_position()
+        for ordinal in range(3):
+            possible[ordinal] = 0b0010
+        with self.assertRaises(ValueError):
+            HandSampler(owners, sizes, possible, 0)
+
+class MonteCarloBotTest(unittest.TestCase):
+    """Unit tests for the Monte Carlo search bot"""
+    
+    def make_game(self, seed, **bot_options):
+        bot = lambda name, team=0, compact_hand=False: MonteCarloBot(name, team, compact_hand, **bot_options)
+        return game_logic.Game(6, human_player_idx=None, headless=True, seed=seed,
+                               bot_classes=(bot, game_logic.KnowledgeBot))
+    
+    def test_sampled_deals_are_consistent(self):
+        """Test that sampled deals keep hand sizes and the bot's own cards"""
+        game = self.make_game(1)
+        for _ in range(20):
+            game.handle_bot_turn()
+        bot = game.players[0]
+        bot.observe(game, 0)
+        rng = random.Random(0)
+        for _ in range(20):
+            owners = bot.sample_owners(game, 0, rng)
+            for seat, player in enumerate(game.players):
+                self.assertEqual(owners.count(seat), len(player.hand))
+            for card in bot.hand:
+                self.assertEqual(owners[card.ordinal], 0)
+    
+    def test_time_budget(self):
+        """Test that search stops at the budget and still returns an ask"""
+        game = self.make_game(4, time_budget_ms=20)
+        while not game.is_over:
+            player = game.current_player
+            start = time.perf_counter()
+            game.handle_bot_turn()
+            if isinstance(player, MonteCarloBot):
+                self.assertLess(time.perf_counter() - start, 0.2)
+        searched = [p.last_search for p in game.players[:3] if p.last_search]
+        self.assertTrue(searched)
+        self.assertTrue(all(search['seconds'] < 0.1 for search in searched))
+    
+    def test_endgame_and_search_share_the_budget(self):
+        """Test that a turn that tries the endgame solver and then searches
+        still ends within the bot's time budget"""
+        # Every turn tries the solver, which early on runs out of time
+        game = self.make_game(3, time_budget_ms=30, endgame_uncertainty=52)
+        while not game.is_over:
+            player = game.current_player
+            start = time.perf_counter()
+            game.handle_bot_turn()
+            if isinstance(player, MonteCarloBot):
+                self.assertLess(time.perf_counter() - start, 0.055)
+        self.assertTrue(any(p.last_endgame for p in game.players[:3]))
+    
+    def test_clone_has_its_own_search_state(self):
+        """Test that a bot's turn in a cloned game leaves the original
+        bot's rng, solver and planned move alone"""
+        game = self.make_game(5, time_budget_ms=None, max_rollouts=20, endgame_uncertainty=52)
+        bot = game.players[0]
+        while bot.search_rng is None:
+            game.handle_bot_turn()
+        rng_state = bot.search_rng.getstate()
+        endgame_move = bot.endgame_move
+        memo_size = len(bot.solver.memo.entries)
+        
+        clone = game.clone()
+        clone.current_player_idx = 0
+        clone.players[0].take_turn(clone)
+        self.assertIsNot(clone.players[0].solver, bot.solver)
+        self.assertEqual(bot.search_rng.getstate(), rng_state)
+        self.assertIs(bot.endgame_move, endgame_move)
+        self.assertEqual(len(bot.solver.memo.entries), memo_size)
+    
+    def test_zero_budget_falls_back(self):
+        """Test that with no time to search the bot plays KnowledgeBot's ask"""
+        game = self.make_game(6, time_budget_ms=0)
+        while not game.is_over:
+            game.handle_bot_turn()
+        searched = [p.last_search for p in game.players[:3] if p.last_search]
+        self.assertTrue(searched)
+        self.assertTrue(all(search['rollouts'] == 0 for search in searched))
+
+class EndgameSolverTest(unittest.TestCase):
+    """Unit tests for the perfect-information endgame solver"""
+    
+    def play_until(self, seed, live_cards):
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=seed,
+                               bot_classes=(game_logic.KnowledgeBot, game_logic.KnowledgeBot))
+        while not game.is_over and sum(owner != game_logic.NO_OWNER for owner in game.card_owners) > live_cards:
+            game.current_player.take_turn(game)
+        return game
+    
+    def test_declares_a_set_the_team_holds(self):
+        """Test that a set held wholly by the mover's team is declared and counted"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=1)
+        owners = bytearray([game_logic.NO_OWNER] * 52)
+        for card in game_logic.FAMILY_CARDS[0]:
+            owners[card.ordinal] = 0
+        owners[game_logic.FAMILY_CARDS[1][0].ordinal] = 2
+        game.current_player_idx = 0
+        result = EndgameSolver().solve(game, owners)
+        self.assertEqual(result['move'], ('declare', 0))
+        # Seat 0 is then out of cards and teammate seat 2 declares the other set
+        self.assertEqual(game.players[2].team, game.players[0].team)
+        self.assertEqual(result['value'], 2 if game.players[0].team == 0 else -2)
+    
+    def test_optimal_play_reaches_the_solved_value(self):
+        """Test that following the solver for both teams scores its value"""
+        game = self.play_until(3, 16)
+        solver = EndgameSolver(max_nodes=None, time_budget_ms=None)
+        expected = solver.solve(game)['value'] + game.scores[0] - game.scores[1]
+        while not game.is_over:
+            seat = game.current_player_idx
+            if not game.players[seat].hand:
+                game.pass_turn()
+                continue
+            move = solver.solve(game)['move']
+            if move[0] == 'declare':
+                assignments = {card: game.card_owners[card.ordinal] for card in game_logic.FAMILY_CARDS[move[1]]
+                               if game.card_owners[card.ordinal] != game_logic.NO_OWNER}
+                self.assertTrue(game.make_declaration(game_logic.Card.FAMILIES[move[1]], assignments, seat))
+            elif game.card_owners[move[2].ordinal] == move[1]:
+                game.transfer(move[2], seat)
+            else:
+                game.current_player_idx = move[1]
+        self.assertEqual(game.scores[0] - game.scores[1], expected)
+    
+    def test_node_budget(self):
+        """Test that the solver gives up once it has searched max_nodes"""
+        game = self.play_until(7, 40)
+        self.assertIsNone(EndgameSolver(max_nodes=5, time_budget_ms=None).solve(game))
+        self.assertIsNotNone(EndgameSolver(max_nodes=None, time_budget_ms=None).solve(game))
+    
+    def test_memo_is_reused(self):
+        """Test that solving the same position again is answered from the memo"""
+        game = self.play_until(7, 30)
+        solver = EndgameSolver(time_budget_ms=None)
+        first = solver.solve(game)
+        second = solver.solve(game)
+        self.assertEqual(first['value'], second['value'])
+        self.assertLess(second['nodes'], first['nodes'])
+    
+    def test_repetitions_are_not_memoized(self):
+        """Test that a value scored through a repeated position, which only
+        holds for the line that led there, is kept out of the memo"""
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=1)
+        owners = bytearray([game_logic.NO_OWNER] * 52)
+        low, high = game_logic.FAMILY_CARDS[0], game_logic.FAMILY_CARDS[1]
+        for card, seat in ((low[0], 0), (low[1], 1), (low[2], 3), (high[0], 3), (high[1], 1)):
+            owners[card.ordinal] = seat
+        counts = [owners.count(seat) for seat in range(6)]
+        solver = EndgameSolver(max_nodes=None, time_budget_ms=None)
+        solver.teams = [player.team for player in game.players]
+        solver.deadline = None
+        # Seat 0 asking seat 3 for the card teammate seat 1 holds leads back
+        # to a position already on the line
+        solver.path = {bytes(owners) + bytes((3,))}
+        solver._search(owners, counts, 0, -8, 8)
+        self.assertIsNone(solver.memo.get(bytes(owners) + bytes((0,))))
+        
+        solver.path = set()
+        solver._search(owners, counts, 0, -8, 8)
+        self.assertIsNotNone(solver.memo.get(bytes(owners) + bytes((0,))))
+    
+    def test_bot_switches_to_solver(self):
+        """Test that MonteCarloBot plans with the solver late in the game"""
+        bot = lambda name, team=0, compact_hand=False: MonteCarloBot(name, team, compact_hand, max_rollouts=10,
+                                                                     endgame_uncertainty=10)
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=2,
+                               bot_classes=(bot, game_logic.KnowledgeBot))
+        while not game.is_over:
+            game.handle_bot_turn()
+        planned = [p.last_endgame for p in game.players[:3] if p.last_endgame]
+        self.assertTrue(planned)
+        self.assertTrue(all(plan['uncertainty'] <= 10 for plan in planned))
+
+class RolloutPoolTest(unittest.TestCase):
+    """Unit tests for parallel rollouts on a persistent process pool"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = RolloutPool(2)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+    
+    def make_game(self, **bot_options):
+        bot = lambda name, team=0, compact_hand=False: MonteCarloBot(name, team, compact_hand, pool=self.pool,
+                                                                     **bot_options)
+        game = game_logic.Game(6, human_player_idx=None, headless=True, seed=4,
+                               bot_classes=(bot, game_logic.KnowledgeBot))
+        return game
+    
+    def test_rollout_quota_is_split(self):
+        """Test that a fixed rollout count is shared out and merged exactly"""
+        game = self.make_game()
+        bot = game.players[0]
+        bot.observe(game, 0)
+        asks = [(card.ordinal, 3) for card in game_logic.ORDINAL_CARDS[:3]]
+        sizes = [len(p.hand) for p in game.players]
+        first = self.pool.run(game.to_bytes(), sizes, bot.possible, 0, 0, asks, seed=1, max_rollouts=12)
+        second = self.pool.run(game.to_bytes(), sizes, bot.possible, 0, 0, asks, seed=1, max_rollouts=12)
+        
+        self.assertEqual(first[1:], ([4, 4, 4], 12))
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.pool.pids), 2)
+    
+    def test_pooled_bot_plays_within_budget(self):
+        """Test that a pooled bot finishes a game and reports its throughput"""
+        game = self.make_game(time_budget_ms=20)
+        # Results may come back up to GRACE_SECONDS past the deadline
+        limit = 0.02 + RolloutPool.GRACE_SECONDS + 0.025
+        while not game.is_over:
+            player = game.current_player
+            start = time.perf_counter()
+            game.handle_bot_turn()
+            if isinstance(player, MonteCarloBot):
+                self.assertLess(time.perf_counter() - start, limit)
+        searches = [p.last_search for p in game.players[:3] if p.last_search]
+        self.assertTrue(searches)
+        self.assertTrue(all(search['workers'] == 2 for search in searches))
+        self.assertTrue(any(search['rollouts_per_second'] > 0 for search in searches))
+
+class SnapshotTest(unittest.TestCase):
+    """Unit tests for Game.to_bytes / Game.from_bytes"""
+    
+    def play(self, game, moves):
+        for _ in range(moves):
+            if game.is_over:
+                break
+            game.handle_bot_turn()
+        return game
+    
+    def test_round_trip(self):
+        """Test that a restored mid-game state matches the original"""
+        for compact in (False, True):
+            game = self.play(game_logic.Game(6, human_player_idx=None, compact_hands=compact,
+                                             headless=True, seed=11), 60)
+            data = game.to_bytes()
+            restored = game_logic.Game.from_bytes(data)
+            
+            self.assertLess(len(data), 100)
+            self.assertEqual(restored.to_bytes(), data)
+            self.assertEqual([p.hand_mask() for p in restored.players], [p.hand_mask() for p in game.players])
+            self.assertEqual(restored.in_play_mask, game.in_play_mask)
+            self.assertEqual(restored.family_winners, game.family_winners)
+            self.assertEqual((restored.turns, restored.seed, restored.scores, restored.current_player_idx),
+                             (game.turns, game.seed, game.scores, game.current_player_idx))
+    
+    def test_restored_game_plays_on(self):
+        """Test that a restored game plays deterministically to the end"""
+        data = self.play(game_logic.Game(6, human_player_idx=None, headless=True, seed=2), 30).to_bytes()
+        first = self.play(game_logic.Game.from_bytes(data), 5000)
+        second = self.play(game_logic.Game.from_bytes(data), 5000)
+        
+        self.assertTrue(first.is_over)
+        self.assertEqual(first.to_bytes(), second.to_bytes())
+    
+    def test_human_seat(self):
+        """Test that the human seat survives, and bad data is rejected"""
+        game = game_logic.Game(6, human_player_idx=2, headless=True, seed=4)
+        restored = game_logic.Game.from_bytes(game.to_bytes())
+        
+        self.assertEqual(restored.human_player_idx, 2)
+        self.assertFalse(restored.human_player.is_bot)
+        with self.assertRaises(ValueError):
+            game_logic.Game.from_bytes(b"\x02" + game.to_bytes()[1:])
+        with self.assertRaises(ValueError):
+            game_logic.Game.from_bytes(game.to_bytes()[:-1])
+    
+    def test_seed_is_validated(self):
+        """Test that a game can only be made with a seed its snapshot can hold"""
+        for seed in (-1, 1 << 64, 1.5, "seed"):
+            with self.assertRaises(ValueError):
+                game_logic.Game(6, headless=True, seed=seed)
+        game = game_logic.Game(6, headless=True, seed=(1 << 64) - 1)
+        self.assertEqual(game_logic.Game.from_bytes(game.to_bytes()).seed, (1 << 64) - 1)
+
+class EngineLogTest(unittest.TestCase):
+    """Unit tests for the engine's structured logging"""
+    
+    def setUp(self):
+        self.logger = engine_log.get_logger('test')
+        self.logger.propagate = False
+        self.records = []
+        handler = logging.Handler()
+        handler.emit = self.records.append
+        self.logger.addHandler(handler)
+    
+    def tearDown(self):
+        self.logger.handlers.clear()
+        self.logger.filters.clear()
+    
+    def test_disabled_events_are_not_formatted(self):
+        """Test that events below the subsystem level never format their fields"""
+        formatted = []
+        
+        class Probe:
+            def __format__(self, spec):
+                formatted.append(spec)
+                return "probe"
+        
+        self.logger.setLevel(logging.WARNING)
+        engine_log.log_event(self.logger, logging.INFO, 'probe', "{field}", field=Probe())
+        self.assertEqual((self.records, formatted), ([], []))
+        
+        engine_log.log_event(self.logger, logging.WARNING, 'probe', "{field}", field=Probe())
+        self.assertEqual(formatted, [])
+        self.assertEqual(self.records[0].getMessage(), "probe")
+    
+    def test_structured_records(self):
+        """Test that records carry the event and fields, formatted on demand"""
+        self.logger.setLevel(logging.INFO)
+        engine_log.log_event(self.logger, logging.INFO, 'bot_request', "{bot} asks for {card}",
+                             bot="Bot 2", card="5 of Spades")
+        
+        record = self.records[0]
+        self.assertEqual(record.event, 'bot_request')
+        self.assertEqual(record.getMessage(), "Bot 2 asks for 5 of Spades")
+        entry = json.loads(engine_log.StructuredFormatter().format(record))
+        self.assertEqual((entry['event'], entry['card']), ('bot_request', "5 of Spades"))
+    
+    def test_sampling(self):
+        """Test that sampling keeps about the configured fraction of records"""
+        self.logger.setLevel(logging.INFO)
+        self.logger.addFilter(engine_log.SamplingFilter(0.25, seed=0))
+        for i in range(4000):
+            engine_log.log_event(self.logger, logging.INFO, 'turn', "{i}", i=i)
+        engine_log.log_event(self.logger, logging.WARNING, 'problem', "always kept")
+        
+        self.assertAlmostEqual(len(self.records) / 4000, 0.25, delta=0.03)
+        self.assertEqual(self.records[-1].event, 'problem')
+
+class BenchmarkSuiteTest(unittest.TestCase):
+    """Unit tests for the benchmark suite's run and compare modes"""
+    
+    def test_run_and_compare(self):
+        """Test that results are recorded and slowdowns past the threshold are flagged"""
+        report = bench_suite.run_suite(['request_card'], repeat=2, min_time=0.001)
+        self.assertEqual(set(report['results']), {'request_card'})
+        self.assertGreater(report['results']['request_card']['median'], 0)
+        
+        baseline = {'results': {'request_card': {'median': report['results']['request_card']['median'] / 2}}}
+        rows = bench_suite.compare(baseline, report, threshold=0.10)
+        self.assertEqual(len(rows), 1)
+        self.assertTrue(rows[0][4])
+        self.assertFalse(bench_suite.compare(report, report)[0][4])
+
+class EventLogTest(unittest.TestCase):
+    """Unit tests for the columnar game log in models.game_state"""
+    
+    def setUp(self):
+        self.state = ServerGameState([ServerPlayer(f"P{i}", i) for i in range(6)])
+        self.state.deal_cards()
+    
+    def test_logged_events_keep_dict_format(self):
+        """Test that stored rows convert back to the original log entries"""
+        target = self.state.players[1]
+        card = target.hand[0]
+        self.state.request_card(0, 1, card.rank, card.suit)
+        
+        self.assertEqual(len(self.state.game_log), 2)
+        self.assertEqual(self.state.game_log[0],
+                         {"action": "GAME_START", "details": {"player_count": 6, "first_player": 0}, "turn": 0})
+        self.assertEqual(self.state.game_log[-1]["details"], {
+            "requester": 0,
+            "target": 1,
+            "card": {"rank": card.rank, "suit": card.suit},
+            "success": True
+        })
+    
+    def test_declaration_and_game_over(self):
+        """Test that declarations and the final score round-trip through the log"""
+        self.state.team1_sets = 7
+        self.state.declare_set(0, "High Spades", {})
+        
+        declaration, game_over = self.state.get_log()[-2:]
+        self.assertEqual(declaration["details"], {"player": 0, "set": "High Spades", "success": False})
+        self.assertEqual(game_over["details"], {"team1_sets": 7, "team2_sets": 1, "winning_team": 1})
+    
+    def test_pagination(self):
+        """Test that pages and slices cover the log without overlap"""
+        for _ in range(11):
+            self.state.request_card(0, 1, "2", "Hearts")
+            self.state.current_turn = 0
+        
+        log = self.state.get_log()
+        self.assertEqual(len(log), 12)
+        self.assertEqual(self.state.get_log(page=0, page_size=5) + self.state.get_log(page=1, page_size=5)
+                         + self.state.get_log(page=2, page_size=5), log)
+        self.assertEqual(self.state.game_log[3:6], log[3:6])
+        self.assertEqual(self.state.game_log[::2], log[::2])
+        self.assertEqual(self.state.game_log[10:1:-3], log[10:1:-3])
+        self.assertEqual(self.state.game_log.slice(3, 6).to_dicts(), log[3:6])
+        self.assertEqual(len(self.state.game_log.actors.tobytes()), 12)
+
+def create_server_game(client, player_count=6):
+    """Create a game through a Socket.IO test client, returning the
+    game_created payload (the new game's state, with its game_id)"""
+    client.emit('create_game', {'player_count': player_count})
+    return next(msg['args'][0] for msg in client.get_received() if msg['name'] == 'game_created')
+
+class TurnSchedulerTest(unittest.TestCase):
+    """Unit tests for the timer heap that runs bot turns"""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.scheduler = TurnScheduler(MagicMock(), clock=lambda: self.now)
+    
+    def test_runs_in_due_order(self):
+        """Test that callbacks run once due, earliest first"""
+        ran = []
+        self.scheduler.schedule('a', 2, lambda: ran.append('a'))
+        self.scheduler.schedule('b', 1, lambda: ran.append('b'))
+        self.assertEqual(self.scheduler.run_due(0.5), (0, 0.5))
+        self.assertEqual(self.scheduler.run_due(3), (2, None))
+        self.assertEqual(ran, ['b', 'a'])
+        self.assertEqual(len(self.scheduler), 0)
+    
+    def test_one_pending_action_per_game(self):
+        """Test that rescheduling a game replaces its pending callback"""
+        ran = []
+        self.scheduler.schedule('a', 1, lambda: ran.append(1))
+        self.scheduler.schedule('a', 2, lambda: ran.append(2))
+        self.assertEqual(len(self.scheduler), 1)
+        self.scheduler.run_due(5)
+        self.assertEqual(ran, [2])
+    
+    def test_cancel(self):
+        ran = []
+        self.scheduler.schedule('a', 1, lambda: ran.append('a'))
+        self.scheduler.cancel('a')
+        self.assertNotIn('a', self.scheduler)
+        self.assertEqual(self.scheduler.run_due(5), (0, None))
+        self.assertEqual(ran, [])
+    
+    def test_failing_callback_does_not_stop_others(self):
+        """Test that an exception in one game's action is logged and skipped"""
+        ran = []
+        self.scheduler.schedule('a', 1, lambda: 1 / 0)
+        self.scheduler.schedule('b', 2, lambda: ran.append('b'))
+        with self.assertLogs('turn_scheduler', level='ERROR'):
+            self.scheduler.run_due(5)
+        self.assertEqual(ran, ['b'])
+    
+    def test_background_task_started_once(self):
+        self.scheduler.schedule('a', 1, lambda: None)
+        self.scheduler.schedule('b', 1, lambda: None)
+        self.scheduler.socketio.start_background_task.assert_called_once()
+    
+    def test_server_bot_turns(self):
+        """Test that the server queues one turn per game and chains bot turns"""
+        import server
+        client = server.socketio.test_client(server.app)
+        self.addCleanup(client.disconnect)
+        game_id = create_server_game(client)['game_id']
+        self.addCleanup(server.active_games.pop, game_id, None)
+        game = server.active_games[game_id]
+        game.current_player_idx = 1
+        game.auto_play = True
+        
+        with patch.object(server, 'scheduler', self.scheduler):
+            client.emit('next_player', {'game_id': game_id})
+            client.emit('next_player', {'game_id': game_id})
+            self.assertEqual(len(self.scheduler), 1)
+            client.get_received()
+            self.now = 1
+            self.scheduler.run_due()
+            self.assertEqual([msg['name'] for msg in client.get_received()], ['game_message'])
+            self.now += server.THINK_SECONDS
+            self.scheduler.run_due()
+        names = [msg['name'] for msg in client.get_received()]
+        self.assertIn('game_patch', names)
+        self.assertEqual(game_id in self.scheduler, game.current_player.is_bot and not game.is_over)
+
+class StatePatchTest(unittest.TestCase):
+    """Unit tests for versioned game state patches"""
+    
+    @classmethod
+    def setUpClass(cls):
+        import server
+        cls.server = server
+    
+    def create_game(self):
+        client = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(client.disconnect)
+        state = create_server_game(client)
+        self.addCleanup(self.server.active_games.pop, state['game_id'], None)
+        self.addCleanup(self.server.state_versions.pop, state['game_id'], None)
+        return client, state
+    
+    def apply_patch(self, state, patch):
+        """Apply a patch the way the web client does"""
+        self.assertEqual(patch['version'], state['version'] + 1)
+        for key, value in patch['changes'].items():
+            if key == 'card_counts':
+                for index, count in enumerate(value):
+                    state['players'][index]['card_count'] = count
+            elif key == 'can_request':
+                for player in state['players']:
+                    player['can_request'] = player['index'] in value
+            elif key == 'declared_sets':
+                state['declared_sets'].update(value)
+            elif key == 'cards_removed':
+                state['human_cards'] = [card for card in state['human_cards']
+                                        if f"{card['rank']}_{card['suit']}" not in value]
+            elif key == 'cards_added':
+                for card in value:
+                    rank, suit = card.split('_')
+                    state['human_cards'].append({'suit': suit, 'rank': rank, 'is_new': False})
+            elif key != 'new_card':
+                state[key] = value
+        if 'new_card' in patch['changes']:
+            for card in state['human_cards']:
+                card['is_new'] = f"{card['rank']}_{card['suit']}" == patch['changes']['new_card']
+        for player in state['players']:
+            player['is_current'] = player['index'] == state['current_player_idx']
+        state['version'] = patch['version']
+    
+    def test_patches_reproduce_the_full_state(self):
+        """Test that a joined client applying every patch ends with the full state"""
+        client, state = self.create_game()
+        game_id = state['game_id']
+        game = self.server.active_games[game_id]
+        game.current_player_idx = 1
+        for _ in range(30):
+            if game.is_over:
+                break
+            if game.current_player.is_bot:
+                self.server.handle_bot_turn(game_id)
+            else:
+                target, card = game.legal_moves(game.current_player_idx)[0]
+                client.emit('request_card', {'game_id': game_id, 'target_player_idx': target,
+                                             'suit': card.suit, 'rank': card.rank})
+            for msg in client.get_received():
+                self.assertNotEqual(msg['name'], 'game_updated')
+                if msg['name'] == 'game_patch':
+                    self.apply_patch(state, msg['args'][0])
+        self.assertEqual(state, self.server.get_game_state(game, game_id))
+    
+    def test_patches_are_small(self):
+        """Test that every bot move's patch is a fraction of the full state,
+        and that they average well under a tenth of it (sizes as sent)"""
+        client, state = self.create_game()
+        game = self.server.active_games[state['game_id']]
+        sizes, fulls = [], []
+        for _ in range(20):
+            if game.is_over:
+                break
+            if not game.current_player.is_bot:
+                game.current_player_idx = 1
+            self.server.handle_bot_turn(state['game_id'])
+            full = len(json.dumps(self.server.get_game_state(game, state['game_id']), separators=(',', ':')))
+            for msg in client.get_received():
+                if msg['name'] == 'game_patch':
+                    sizes.append(len(json.dumps(msg['args'][0], separators=(',', ':'))))
+                    fulls.append(full)
+                    self.assertLess(sizes[-1] * 4, full)
+        self.assertLess(sum(sizes) * 8, sum(fulls))
+    
+    def test_next_player_sends_a_patch(self):
+        """Test that next_player sends what changed rather than the full state"""
+        client, state = self.create_game()
+        game = self.server.active_games[state['game_id']]
+        game.current_player_idx = 2
+        client.emit('next_player', {'game_id': state['game_id']})
+        received = client.get_received()
+        self.assertEqual([msg['name'] for msg in received], ['game_patch'])
+        self.assertEqual(received[0]['args'][0]['changes']['current_player_idx'], 2)
+    
+    def test_no_change_no_patch(self):
+        _, state = self.create_game()
+        game = self.server.active_games[state['game_id']]
+        self.assertIsNone(self.server.get_state_patch(game, state['game_id']))
+    
+    def test_resync_sends_full_state(self):
+        """Test that a client reporting a gap gets the current full state"""
+        client, state = self.create_game()
+        game_id = state['game_id']
+        game = self.server.active_games[game_id]
+        game.current_player_idx = 1
+        self.server.handle_bot_turn(game_id)
+        client.get_received()
+        client.emit('resync_game', {'game_id': game_id, 'version': 0})
+        received = client.get_received()
+        self.assertEqual([msg['name'] for msg in received], ['game_updated'])
+        self.assertEqual(received[0]['args'][0]['version'], 1)
+
+class ServerRoomsTest(unittest.TestCase):
+    """Unit tests for routing each game's events to its own Socket.IO room"""
+    
+    @classmethod
+    def setUpClass(cls):
+        import server
+        cls.server = server
+    
+    def create_game(self):
+        client = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(client.disconnect)
+        game_id = create_server_game(client)['game_id']
+        self.addCleanup(self.server.active_games.pop, game_id, None)
+        return client, game_id
+    
+    def test_bot_turn_reaches_only_its_game(self):
+        """Test that a bot move is sent to its game's clients and no others"""
+        first, first_id = self.create_game()
+        second, _ = self.create_game()
+        game = self.server.active_games[first_id]
+        game.current_player_idx = 1
+        self.server.handle_bot_turn(first_id)
+        names = {msg['name'] for msg in first.get_received()}
+        self.assertIn('game_patch', names)
+        self.assertEqual(second.get_received(), [])
+    
+    def test_rejoin_joins_the_room(self):
+        """Test that a client rejoining a game gets its state and later events"""
+        _, game_id = self.create_game()
+        other = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(other.disconnect)
+        other.emit('rejoin_game', {'game_id': game_id})
+        self.assertEqual([msg['name'] for msg in other.get_received()], ['game_updated'])
+        
+        self.server.active_games[game_id].current_player_idx = 1
+        self.server.handle_bot_turn(game_id)
+        self.assertIn('game_patch', {msg['name'] for msg in other.get_received()})
+    
+    def test_rejected_declaration_reaches_only_the_declarer(self):
+        """Test that a declaration out of turn is an error for the declarer
+        and isn't announced to the room"""
+        client, game_id = self.create_game()
+        other = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(other.disconnect)
+        other.emit('rejoin_game', {'game_id': game_id})
+        other.get_received()
+        game = self.server.active_games[game_id]
+        game.current_player_idx = 1
+        family = game.players[0].hand[0].family
+        
+        client.emit('declare_set', {'game_id': game_id, 'set_name': family, 'card_assignments': {}})
+        self.assertEqual([msg['name'] for msg in client.get_received()], ['error'])
+        self.assertEqual(other.get_received(), [])
+        self.assertIsNone(game.family_winners[game_logic.FAMILY_IDS[family]])
+    
+    def test_resync_joins_the_room(self):
+        """Test that a client resyncing from a new session gets later events"""
+        _, game_id = self.create_game()
+        other = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(other.disconnect)
+        other.emit('resync_game', {'game_id': game_id, 'version': 0})
+        self.assertEqual([msg['name'] for msg in other.get_received()], ['game_updated'])
+        
+        self.server.active_games[game_id].current_player_idx = 1
+        self.server.handle_bot_turn(game_id)
+        self.assertIn('game_patch', {msg['name'] for msg in other.get_received()})
+    
+    def test_new_game_leaves_the_old_room(self):
+        """Test that a client starting another game stops getting the first one's patches"""
+        client, first_id = self.create_game()
+        second_id = create_server_game(client)['game_id']
+        self.addCleanup(self.server.active_games.pop, second_id, None)
+        self.server.active_games[first_id].current_player_idx = 1
+        self.server.handle_bot_turn(first_id)
+        self.assertEqual(client.get_received(), [])
+    
+    def test_create_game_rejects_player_count(self):
+        client = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(client.disconnect)
+        client.emit('create_game', {'player_count': 10})
+        self.assertEqual([msg['name'] for msg in client.get_received()], ['error'])
+    
+    def test_rejoin_unknown_game(self):
+        client = self.server.socketio.test_client(self.server.app)
+        self.addCleanup(client.disconnect)
+        client.emit('rejoin_game', {'game_id': 'missing'})
+        self.assertEqual([msg['name'] for msg in client.get_received()], ['error'])
+
+class GameStoreTest(unittest.TestCase):
+    """Unit tests for the bounded, spilling store of live games"""
+    
+    def setUp(self):
+        import tempfile
+        self.now = 0
+        spill = tempfile.TemporaryDirectory()
+        self.addCleanup(spill.cleanup)
+        self.spill_dir = spill.name
+        self.evicted = []
+    
+    def make_store(self, **kwargs):
+        kwargs.setdefault('on_evict', self.evicted.append)
+        return GameStore(clock=lambda: self.now, **kwargs)
+    
+    def test_least_recently_used_evicted(self):
+        store = self.make_store(max_games=2)
+        store['a'] = game_logic.Game(6, headless=True)
+        store['b'] = game_logic.Game(6, headless=True)
+        store['a']
+        store['c'] = game_logic.Game(6, headless=True)
+        self.assertEqual(list(store), ['a', 'c'])
+        self.assertNotIn('b', store)
+        self.assertEqual(self.evicted, ['b'])
+        self.assertEqual(store.stats()['lru_evictions'], 1)
+    
+    def test_idle_games_expire(self):
+        store = self.make_store(ttl_seconds=10)
+        store['a'] = game_logic.Game(6, headless=True)
+        self.now = 5
+        store['b'] = game_logic.Game(6, headless=True)
+        self.now = 12
+        self.assertIsNone(store.get('a'))
+        self.assertIsNotNone(store.get('b'))
+        self.now = 21
+        store.evict_expired()
+        self.assertEqual(len(store), 1)
+        self.now = 30
+        store.evict_expired()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.stats()['expired'], 2)
+    
+    def test_spilled_game_comes_back(self):
+        store = self.make_store(max_games=1, spill_dir=self.spill_dir)
+        game = game_logic.Game(6, headless=True, seed=3)
+        for _ in range(5):
+            game.handle_bot_turn()
+        store['a'] = game
+        store['b'] = game_logic.Game(6, headless=True)
+        self.assertIn('a', store)
+        self.assertEqual(list(store), ['b'])
+        
+        restored = store['a']
+        self.assertEqual(restored.to_bytes(), game.to_bytes())
+        self.assertEqual(list(store), ['a'])
+        self.assertEqual(os.listdir(self.spill_dir), ['b.game'])
+        stats = store.stats()
+        self.assertEqual((stats['evictions'], stats['spills'], stats['rehydrations']), (2, 2, 1))
+    
+    def test_spill_path_stays_in_directory(self):
+        store = self.make_store(spill_dir=self.spill_dir)
+        self.assertEqual(os.path.dirname(store.spill_path('../../etc/passwd')), self.spill_dir)
+    
+    def test_delete_removes_spilled_game(self):
+        store = self.make_store(max_games=1, spill_dir=self.spill_dir)
+        store['a'] = game_logic.Game(6, headless=True)
+        store['b'] = game_logic.Game(6, headless=True)
+        del store['a']
+        self.assertNotIn('a', store)
+        with self.assertRaises(KeyError):
+            del store['a']
+    
+    def test_server_game_rehydrated_on_rejoin(self):
+        """Test that an evicted server game is restored for a returning client
+        and its patches carry on from the version the client last saw"""
+        import server
+        store = GameStore(max_games=1, spill_dir=self.spill_dir, dump=server.dump_game,
+                          load=server.load_game, on_evict=server.forget_game)
+        with patch.object(server, 'active_games', store):
+            client = server.socketio.test_client(server.app)
+            self.addCleanup(client.disconnect)
+            game_id = create_server_game(client)['game_id']
+            self.addCleanup(server.state_versions.pop, game_id, None)
+            store[game_id].current_player_idx = 1
+            server.handle_bot_turn(game_id)
+            version = server.state_versions[game_id][0]
+            snapshot = store[game_id].to_bytes()
+            
+            other = server.socketio.test_client(server.app)
+            self.addCleanup(other.disconnect)
+            other_id = create_server_game(other)['game_id']
+            self.addCleanup(server.state_versions.pop, other_id, None)
+            self.assertNotIn(game_id, server.state_versions)
+            
+            client.get_received()
+            client.emit('rejoin_game', {'game_id': game_id})
+            state = next(msg['args'][0] for msg in client.get_received() if msg['name'] == 'game_updated')
+            self.assertEqual(state['version'], version)
+            self.assertEqual(store[game_id].to_bytes(), snapshot)
+            self.assertEqual(store.stats()['rehydrations'], 1)
+
+class GameDatabaseTest(unittest.TestCase):
+    """Unit tests for the SQLite game database and its write-behind writer"""
+    
+    def setUp(self):
+        import tempfile
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'games.db')
+    
+    def open_db(self, flush_ms=5):
+        db = GameDatabase(self.path, flush_ms=flush_ms)
+        self.addCleanup(db.close)
+        return db
+    
+    def test_snapshots_and_moves_survive_reopening(self):
+        db = self.open_db()
+        db.save_game('a', b'first')
+        db.save_game('a', b'second')
+        db.log_move('a', 'ask', 0, 3, 17, True)
+        db.log_move('a', 'declare', 0, None, 2, False)
+        self.assertEqual(db.load_game('a'), b'second')
+        db.close()
+        
+        db = self.open_db()
+        self.assertEqual(db.load_game('a'), b'second')
+        self.assertIsNone(db.load_game('b'))
+        self.assertEqual(db.moves('a'), [('ask', 0, 3, 17, True), ('declare', 0, None, 2, False)])
+    
+    def test_writes_are_batched(self):
+        """Test that writes queued within the flush window share commits and
+        repeated snapshots of a game are written once per commit"""
+        db = self.open_db(flush_ms=200)
+        for i in range(50):
+            db.log_move('a', 'ask', 0, 1, i, False)
+            db.save_game('a', bytes([i]))
+        db.flush()
+        stats = db.stats()
+        self.assertLessEqual(stats['batches'], 2)
+        self.assertEqual(stats['moves_written'], 50)
+        self.assertEqual(stats['snapshots_written'] + stats['snapshots_coalesced'], 50)
+        self.assertLessEqual(stats['snapshots_written'], 2)
+        self.assertEqual(db.load_game('a'), bytes([49]))
+        self.assertEqual(db.pending, {})
+    
+    def test_queued_moves_are_read_before_commit(self):
+        """Test that moves reads queued moves without waiting for the writer,
+        each once, before and after they are committed"""
+        db = self.open_db(flush_ms=500)
+        db.log_move('a', 'ask', 0, 3, 17, True)
+        db.log_move('b', 'ask', 1, 4, 20, False)
+        db.log_move('a', 'declare', 0, None, 2, False)
+        expected = [('ask', 0, 3, 17, True), ('declare', 0, None, 2, False)]
+        self.assertEqual(db.moves('a'), expected)
+        db.flush()
+        self.assertEqual(db.moves('a'), expected)
+        self.assertEqual(db.moves('b'), [('ask', 1, 4, 20, False)])
+        self.assertEqual(db.pending_moves, {})
+    
+    def test_failed_batches_are_dropped(self):
+        """Test that writes in a batch that fails to commit are logged and
+        dropped rather than left pending, and later writes still go through"""
+        import sqlite3
+        db = self.open_db()
+        with patch.object(db, '_write', side_effect=sqlite3.OperationalError("disk I/O error")), \
+                self.assertLogs('game_db', logging.ERROR):
+            db.save_game('a', b'lost')
+            db.log_move('a', 'ask', 0, 3, 17, True)
+            db.flush()
+        self.assertEqual(db.pending, {})
+        self.assertEqual(db.pending_moves, {})
+        self.assertIsNone(db.load_game('a'))
+        self.assertEqual(db.moves('a'), [])
+        stats = db.stats()
+        self.assertEqual((stats['errors'], stats['snapshots_dropped'], stats['moves_dropped']), (1, 1, 1))
+        
+        db.save_game('a', b'kept')
+        db.flush()
+        self.assertEqual(db.pending, {})
+        self.assertEqual(db.load_game('a'), b'kept')
+    
+    def test_only_settled_declarations_are_stored(self):
+        """Test that a declaration the game rejected isn't logged as a move"""
+        import server
+        db = self.open_db()
+        store = GameStore(dump=server.dump_game, load=server.load_game, on_evict=server.forget_game,
+                          restore=db.load_game)
+        with patch.object(server, 'game_db', db), patch.object(server, 'active_games', store):
+            client = server.socketio.test_client(server.app)
+            self.addCleanup(client.disconnect)
+            game_id = create_server_game(client)['game_id']
+            self.addCleanup(server.state_versions.pop, game_id, None)
+            game = store[game_id]
+            family = game.players[0].hand[0].family
+            game.current_player_idx = 1
+            client.emit('declare_set', {'game_id': game_id, 'set_name': family, 'card_assignments': {}})
+            game.current_player_idx = 0
+            client.emit('declare_set', {'game_id': game_id, 'set_name': family, 'card_assignments': {}})
+        db.flush()
+        self.assertEqual(db.moves(game_id), [('declare', 0, None, game_logic.FAMILY_IDS[family], False)])
+    
+    def test_server_games_restored_after_restart(self):
+        """Test that a server game comes back from the database on first
+        access, at the version its clients last saw, with its moves logged"""
+        import server
+        db = self.open_db()
+        store = GameStore(dump=server.dump_game, load=server.load_game, on_evict=server.forget_game,
+                          restore=db.load_game)
+        with patch.object(server, 'game_db', db), patch.object(server, 'active_games', store):
+            client = server.socketio.test_client(server.app)
+            self.addCleanup(client.disconnect)
+            game_id = create_server_game(client)['game_id']
+            self.addCleanup(server.state_versions.pop, game_id, None)
+            store[game_id].current_player_idx = 1
+            server.handle_bot_turn(game_id)
+            version = server.state_versions[game_id][0]
+            snapshot = store[game_id].to_bytes()
+            asks = list(store[game_id].ask_history)
+        db.close()
+        server.state_versions.pop(game_id)
+        
+        db = self.open_db()
+        store = GameStore(dump=server.dump_game, load=server.load_game, on_evict=server.forget_game,
+                          restore=db.load_game)
+        self.assertEqual(len(store), 0)
+        with patch.object(server, 'game_db', db), patch.object(server, 'active_games', store):
+            client.emit('rejoin_game', {'game_id': game_id})
+            state = next(msg['args'][0] for msg in client.get_received() if msg['name'] == 'game_updated')
+        self.assertEqual(state['version'], version)
+        self.assertEqual(store[game_id].to_bytes(), snapshot)
+        self.assertEqual(store.stats()['restores'], 1)
+        self.assertEqual([move[:4] for move in db.moves(game_id) if move[0] == 'ask'],
+                         [('ask', asker, target, ordinal) for asker, target, ordinal, _ in asks])
+    
+    def test_restored_game_keeps_bot_knowledge(self):
+        """Test that a game restored from the database gets its ask history
+        back from the logged moves, so KnowledgeBot reaches the same
+        inferences as before the restart"""
+        import server
+        db = self.open_db()
+        store = GameStore(dump=server.dump_game, load=server.load_game, on_evict=server.forget_game,
+                          restore=db.load_game)
+        bot_classes = (game_logic.KnowledgeBot, game_logic.KnowledgeBot)
+        with patch.object(server, 'game_db', db), patch.object(server, 'active_games', store), \
+                patch.object(server, 'BOT_CLASSES', bot_classes):
+            client = server.socketio.test_client(server.app)
+            self.addCleanup(client.disconnect)
+            game_id = create_server_game(client)['game_id']
+            self.addCleanup(server.state_versions.pop, game_id, None)
+            game = store[game_id]
+            game.auto_play = False
+            game.current_player_idx = 1
+            for _ in range(20):
+                if game.is_over or not game.current_player.is_bot:
+                    break
+                server.handle_bot_turn(game_id)
+            asks = list(game.ask_history)
+            self.assertTrue(asks)
+        db.close()
+        server.state_versions.pop(game_id)
+        
+        db = self.open_db()
+        store = GameStore(dump=server.dump_game, load=server.load_game, on_evict=server.forget_game,
+                          restore=db.load_game)
+        with patch.object(server, 'game_db', db), patch.object(server, 'BOT_CLASSES', bot_classes):
+            restored = store[game_id]
+        self.assertEqual(restored.ask_history, asks)
+        live = [card.ordinal for card in game_logic.ORDINAL_CARDS if card.bit & game.in_play_mask]
+        for seat, player in enumerate(game.players):
+            if not player.is_bot:
+                continue
+            player.observe(game, seat)
+            restored.players[seat].observe(restored, seat)
+            self.assertEqual([restored.players[seat].possible[i] for i in live],
+                             [player.possible[i] for i in live])
+
 # UI Tests require Kivy's GraphicUnitTest which runs in the Kivy event loop
 class MenuScreenUITest(GraphicUnitTest):
     """UI tests for the MenuScreen"""
@@ -0,0 +1,127 @@
+"""
+Literature Card Game - Bot Tournament
+Plays every pairing of bot strategies over many seeds across a process pool
+
+Run from the repository root:
+    python tournament.py --games 2000 --workers 8
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import Bot, KnowledgeBot, NO_TEAM
+from simulator import Simulator
+
+# Strategy name -> Bot class
+STRATEGIES = {
+    'random': Bot,
+    'knowledge': KnowledgeBot,
+}
+
+# Per-worker state, built once by _init_worker and reused for every chunk
+_worker_simulators = {}
+_worker_settings = {}
+
+def _init_worker(num_players, max_moves):
+    _worker_settings['num_players'] = num_players
+    _worker_settings['max_moves'] = max_moves
+    _worker_simulators.clear()
+
+def _get_simulator(team_a, team_b):
+    key = (team_a, team_b)
+    simulator = _worker_simulators.get(key)
+    if simulator is None:
+        simulator = Simulator(_worker_settings['num_players'], _worker_settings['max_moves'],
+                              bot_classes=(STRATEGIES[team_a], STRATEGIES[team_b]))
+        _worker_simulators[key] = simulator
+    return simulator
+
+def play_chunk(team_a, team_b, seeds):
+    """Play one game per seed with team_a as Team A, returning merged stats"""
+    simulator = _get_simulator(team_a, team_b)
+    stats = new_stats()
+    for seed in seeds:
+        winner, moves = simulator.play_game(seed=seed)
+        add_result(stats, winner, moves)
+    return (team_a, team_b), stats
+
+def new_stats():
+    return {'games': 0, 'wins_a': 0, 'wins_b': 0, 'draws': 0, 'unfinished': 0, 'moves': 0}
+
+def add_result(stats, winner, moves):
+    stats['games'] += 1
+    stats['moves'] += moves
+    if winner is None:
+        stats['unfinished'] += 1
+    elif winner == NO_TEAM:
+        stats['draws'] += 1
+    elif winner == 0:
+        stats['wins_a'] += 1
+    else:
+        stats['wins_b'] += 1
+
+def merge_stats(total, part):
+    for key, value in part.items():
+        total[key] += value
+
+def run_tournament(strategies, games_per_pairing, num_players=6, max_moves=5000,
+                   workers=None, chunk_size=50, base_seed=0):
+    """Play every ordered pairing of strategies and return {(a, b): stats}
+    
+    Seeds are base_seed .. base_seed + games_per_pairing - 1 for every
+    pairing, so each pairing sees the same deals.
+    """
+    pairings = list(itertools.product(strategies, repeat=2))
+    results = {pairing: new_stats() for pairing in pairings}
+    
+    seeds = range(base_seed, base_seed + games_per_pairing)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(num_players, max_moves)) as executor:
+        futures = [executor.submit(play_chunk, team_a, team_b, chunk)
+                   for team_a, team_b in pairings for chunk in chunks]
+        for future in futures:
+            pairing, stats = future.result()
+            merge_stats(results[pairing], stats)
+    return results
+
+def format_table(results):
+    """Render tournament results as a text table"""
+    header = (f"{'Team A':<12}{'Team B':<12}{'Games':>8}{'A wins':>8}{'B wins':>8}{'Draws':>8}"
+              f"{'Unfinished':>12}{'Avg moves':>11}")
+    lines = [header, "-" * len(header)]
+    for (team_a, team_b), stats in sorted(results.items()):
+        games = stats['games']
+        avg_moves = stats['moves'] / games if games else 0.0
+        lines.append(f"{team_a:<12}{team_b:<12}{games:>8}{stats['wins_a']:>8}{stats['wins_b']:>8}"
+                     f"{stats['draws']:>8}{stats['unfinished']:>12}{avg_moves:>11.1f}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a bot strategy tournament")
+    parser.add_argument('--strategies', nargs='+', default=sorted(STRATEGIES),
+                        choices=sorted(STRATEGIES), help="strategies to pit against each other")
+    parser.add_argument('--games', type=int, default=1000, help="games per pairing")
+    parser.add_argument('--players', type=int, default=6, choices=[6, 8], help="players per game")
+    parser.add_argument('--max-moves', type=int, default=5000, help="move cap per game")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=50, help="games per batch sent to a worker")
+    parser.add_argument('--seed', type=int, default=0, help="first seed")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    results = run_tournament(args.strategies, args.games, num_players=args.players,
+                             max_moves=args.max_moves, workers=args.workers,
+                             chunk_size=args.chunk_size, base_seed=args.seed)
+    elapsed = time.perf_counter() - start
+    
+    total_games = sum(stats['games'] for stats in results.values())
+    print(format_table(results))
+    print(f"\n{total_games} games on {args.workers} workers in {elapsed:.2f}s "
+          f"({total_games / elapsed:.1f} games/s)")
+
+if __name__ == '__main__':
+    main()
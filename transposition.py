@@ -0,0 +1,76 @@
+"""
+Literature Card Game - Transposition Table
+A bounded LRU cache for evaluations keyed by Game.position_hash
+"""
+from collections import OrderedDict
+
+class TranspositionTable:
+    """Least-recently-used map from position hashes to evaluations
+    
+    Holds at most max_entries; storing into a full table evicts the entry
+    used longest ago. get() counts hits and misses so callers can see
+    whether caching pays off. Any hashable key works, but it is meant for
+    Game.position_hash (optionally combined with whatever else the stored
+    value depends on, such as the seat it was evaluated for).
+    """
+    def __init__(self, max_entries=100_000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key, default=None):
+        """The stored value for key (marking it recently used), or default"""
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        return default
+    
+    def store(self, key, value):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+    
+    def get_or_compute(self, key, compute):
+        """The stored value for key, computing and storing it on a miss"""
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        value = compute()
+        self.store(key, value)
+        return value
+    
+    def __contains__(self, key):
+        return key in self.entries
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def clear(self):
+        """Drop every entry and reset the statistics"""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
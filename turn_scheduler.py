@@ -0,0 +1,96 @@
+"""
+Literature Card Game - Turn Scheduler
+Runs timed per-game actions (bot turns) from one background task
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+class TurnScheduler:
+    """A timer heap of per-game callbacks, drained by one background task
+    
+    Each game has at most one pending callback: scheduling another replaces
+    it, so two events arriving for the same game can't queue two bot turns.
+    Replaced and cancelled entries stay in the heap and are skipped when
+    they come up. Callbacks run one at a time on the scheduler's task, so
+    no socket handler is held while bots take their turns.
+    
+    The background task is started through socketio (so it is a green
+    thread under eventlet) the first time something is scheduled.
+    """
+    # Longest the loop sleeps before checking for newly scheduled work
+    POLL_SECONDS = 0.05
+    
+    def __init__(self, socketio, clock=time.monotonic):
+        self.socketio = socketio
+        self.clock = clock
+        self.heap = []
+        self.pending = {}
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.task = None
+        self.running = False
+    
+    def schedule(self, game_id, delay, callback):
+        """Run callback() delay seconds from now, replacing game_id's pending one"""
+        with self.lock:
+            seq = next(self.counter)
+            self.pending[game_id] = seq
+            heapq.heappush(self.heap, (self.clock() + delay, seq, game_id, callback))
+        self.start()
+    
+    def cancel(self, game_id):
+        """Drop game_id's pending callback, if any"""
+        with self.lock:
+            self.pending.pop(game_id, None)
+    
+    def __contains__(self, game_id):
+        return game_id in self.pending
+    
+    def __len__(self):
+        return len(self.pending)
+    
+    def run_due(self, now=None):
+        """Run every callback due by now (default: the clock); returns how
+        many ran and the seconds until the next one (None if nothing is left)"""
+        if now is None:
+            now = self.clock()
+        ran = 0
+        while True:
+            with self.lock:
+                heap = self.heap
+                # Skip entries that were replaced or cancelled
+                while heap and self.pending.get(heap[0][2]) != heap[0][1]:
+                    heapq.heappop(heap)
+                if not heap:
+                    return ran, None
+                if heap[0][0] > now:
+                    return ran, heap[0][0] - now
+                _, _, game_id, callback = heapq.heappop(heap)
+                del self.pending[game_id]
+            try:
+                callback()
+            except Exception:
+                log.exception(f"Scheduled action for game {game_id} failed")
+            ran += 1
+    
+    def start(self):
+        """Start the background task if it isn't running"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        self.task = self.socketio.start_background_task(self._loop)
+    
+    def stop(self):
+        """Stop the background task after its current pass"""
+        self.running = False
+    
+    def _loop(self):
+        while self.running:
+            _, wait = self.run_due()
+            self.socketio.sleep(self.POLL_SECONDS if wait is None else min(wait, self.POLL_SECONDS))